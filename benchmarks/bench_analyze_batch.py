@@ -0,0 +1,34 @@
+"""Throughput of NLPProcessor.analyze_batch for increasing process counts.
+
+Needs the NLTK data and spaCy model installed. Run from the project root:
+    python -m benchmarks.bench_analyze_batch [path/to/conversation_history.json]
+"""
+import os
+import sys
+
+from benchmarks.common import load_utterances
+from components.batch_analyzer import BatchReport
+from components.nlp_processor import NLPProcessor
+
+REPEAT = 200
+
+
+def main():
+    if len(sys.argv) > 1:
+        source = sys.argv[1]
+    else:
+        source = load_utterances() * REPEAT
+
+    nlp_processor = NLPProcessor()
+    baseline = None
+    process_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    for processes in process_counts:
+        report = BatchReport()
+        for _ in nlp_processor.analyze_batch(source, processes=processes, report=report):
+            pass
+        baseline = baseline or report.throughput
+        print(f"{report} - {report.throughput / baseline:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
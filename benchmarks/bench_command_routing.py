@@ -0,0 +1,97 @@
+"""Routing check: spoken commands through process_command to the UI controller.
+
+Each line of fixtures/routing.txt is a command and the UIController method
+it should call ('-' for none). The commands are said after the wake word
+to a CommandProcessor whose UI controller, app launcher, audio, reminders,
+summarizer and browser are recorders, with an empty conversation history
+that is never saved. Every command that reaches the wrong place is
+listed, with the intent it was classified as.
+
+Run from the project root:
+    python -m benchmarks.bench_command_routing
+"""
+import time
+
+import components.command_processor as command_processor
+from benchmarks.common import FIXTURES_DIR, format_us
+from components.data_manager import DataManager
+from components.nlp_processor import NLPProcessor
+
+ROUTING_FILE = FIXTURES_DIR / "routing.txt"
+WAKE_WORD = command_processor.WAKE_WORD or "nexus"
+
+
+class Recorder:
+    """Stands in for a device-facing class; every method call is recorded
+    and answers with a short message, as UIController methods do"""
+
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append(name)
+            return f"{name} done"
+        return record
+
+
+class ScratchDataManager(DataManager):
+    """Starts with no history and saves nothing"""
+
+    def __init__(self):
+        self.conversation_history = []
+        self.user_preferences = {}
+        self.context_memory = {}
+
+    def save_conversation_history(self):
+        pass
+
+    def save_user_preferences(self):
+        pass
+
+    def save_context_memory(self):
+        pass
+
+
+def load_routes(path=ROUTING_FILE):
+    routes = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip() and not line.startswith('#'):
+                command, method = (part.strip() for part in line.split('|'))
+                routes.append((command, None if method == '-' else method))
+    return routes
+
+
+def main():
+    for name in ('UIController', 'WindowsAppLauncher', 'AudioHandler', 'ReminderSystem',
+                 'GeminiSummarizer'):
+        setattr(command_processor, name, Recorder)
+    command_processor.webbrowser = Recorder()
+    command_processor.WAKE_WORD = WAKE_WORD
+
+    processor = command_processor.CommandProcessor(NLPProcessor(), ScratchDataManager())
+    routes = load_routes()
+    wrong = []
+    try:
+        start = time.perf_counter()
+        for command, method in routes:
+            processor.ui_controller.calls.clear()
+            processor.process_command(f"{WAKE_WORD} {command}")
+            calls = processor.ui_controller.calls
+            if (calls[:1] != [method]) if method else calls:
+                intent = processor.nlp_processor.classify_intent(processor.last_utterance)
+                wrong.append((command, method, calls, intent))
+        per_command = (time.perf_counter() - start) / len(routes)
+    finally:
+        processor.cleanup()
+
+    print(f"{len(routes)} commands, {len(routes) - len(wrong)} routed as expected, "
+          f"{format_us(per_command)} per command")
+    for command, method, calls, intent in wrong:
+        print(f"  - {command!r}: expected {method or 'no UI call'}, "
+              f"got {', '.join(calls) or 'no UI call'} (intent {intent})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Early intent detection fed word by word from the utterance fixtures.
+
+For every utterance the words are fed to IntentTracker one at a time, as a
+streaming recognizer would deliver them, and the LikelyIntent events are
+compared with the intent classified from the full transcript.
+
+Run from the project root:
+    python -m benchmarks.bench_early_intent
+"""
+from benchmarks.common import format_us, load_utterances, simple_tokens, time_per_call
+from components.config import INTENT_PATTERNS, PREFETCH_INTENTS
+from components.intent_index import IntentIndex
+from components.intent_tracker import IntentTracker
+from components.intent_vectorizer import IntentVectorizer
+
+
+def final_intent(index, text):
+    # Keyword classification of the whole transcript, as classify_intent does
+    scores = index.score(text.lower(), simple_tokens(text))
+    best = max(scores, key=scores.get)
+    return best if scores[best] > 0 else 'unknown'
+
+
+def main():
+    utterances = load_utterances()
+    index = IntentIndex(INTENT_PATTERNS)
+    tracker = IntentTracker(IntentVectorizer(INTENT_PATTERNS))
+
+    signalled = correct = first_correct = 0
+    prefetchable = prefetched = 0
+    words_ahead = []
+    wrong = []
+    for text in utterances:
+        words = text.lower().split()
+        expected = final_intent(index, text)
+        events = tracker.feed_words(words)
+        if expected in PREFETCH_INTENTS:
+            prefetchable += 1
+        if not events:
+            continue
+
+        signalled += 1
+        if events[0].intent == expected:
+            first_correct += 1
+        match = next((event for event in events if event.intent == expected), None)
+        if match is None:
+            wrong.append((text, expected, events))
+            continue
+        correct += 1
+        words_ahead.append(1 - match.words / len(words))
+        if expected in PREFETCH_INTENTS:
+            prefetched += 1
+
+    partials = [' '.join(text.lower().split()[:i])
+                for text in utterances for i in range(1, len(text.split()) + 1)]
+
+    def update(partial):
+        tracker.reset()
+        tracker.update(partial)
+    update_time = time_per_call(update, partials)
+
+    print(f"Utterances:                 {len(utterances)}")
+    print(f"With a likely intent:       {signalled}")
+    print(f"Final intent signalled:     {correct} ({correct / len(utterances):.0%})")
+    print(f"First event correct:        {first_correct} of {signalled}")
+    print(f"Prefetchable intents:       {prefetchable}, signalled early: {prefetched}")
+    if words_ahead:
+        print(f"Utterance left when signalled: {sum(words_ahead) / len(words_ahead):.0%} on average")
+    print(f"Update latency:             {format_us(update_time)} per partial")
+    print("Signalled but never the final intent:")
+    for text, expected, events in wrong:
+        print(f"  - {text!r}: final {expected}, events {[event.intent for event in events]}")
+
+
+if __name__ == "__main__":
+    main()
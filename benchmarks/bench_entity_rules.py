@@ -0,0 +1,248 @@
+"""Per-utterance cost of rule-based entity detection: inline regex tables vs EntityRuleEngine.
+
+Run from the project root:
+    python -m benchmarks.bench_entity_rules
+"""
+import re
+
+from benchmarks.common import format_us, load_utterances, time_per_call
+from components.entity_rules import EntityRuleEngine
+from components.numbers import CARDINAL_WORDS
+
+
+def count_passes(engine, text):
+    """Number of regex scans the engine runs over text"""
+    passes = 1 + 1 + 1 + len(engine.ui_scans) + 1 + 1  # gates, math, time, ui, direction
+    if engine.weather_gate.search(text):
+        passes += len(engine.weather_patterns)
+    if engine.type_gate.search(text):
+        passes += len(engine.type_patterns)
+    return passes
+
+
+def legacy_rules(text):
+    # The inline tables NLPProcessor.extract_entities rebuilt on every call
+    entities = {}
+    # Post-processing: Add manual entity detection for common patterns
+    text_lower = text.lower()
+
+    # Detect city names from common weather patterns
+    weather_city_patterns = [
+        r'(?:tell\s+me\s+the\s+)?weather\s+(?:in|for|of)\s+([a-zA-Z\s]+)',
+        r'(?:tell\s+me\s+the\s+)?temperature\s+(?:in|for|of)\s+([a-zA-Z\s]+)',
+        r'(?:what\s+is\s+the\s+)?weather\s+(?:in|for|of)\s+([a-zA-Z\s]+)',
+        r'(?:what\s+is\s+the\s+)?temperature\s+(?:in|for|of)\s+([a-zA-Z\s]+)',
+        r'(?:in|at)\s+([a-zA-Z\s]+)\s+weather',
+        r'weather\s+in\s+([a-zA-Z\s]+)',
+        r'weather\s+for\s+([a-zA-Z\s]+)',
+        r'weather\s+of\s+([a-zA-Z\s]+)',
+        r'([a-zA-Z\s]+)\s+weather'
+    ]
+
+    for pattern in weather_city_patterns:
+        import re
+        matches = re.findall(pattern, text, re.IGNORECASE)
+        for match in matches:
+            city = match.strip().title()
+            # Filter out common non-city words
+            non_cities = ['he', 'weather', 'today', 'tell me' 'tomorrow',
+                          'now', 'current', 'is', 'what', 'how', 'the', 'and']
+            if city and city not in non_cities and len(city) > 1:
+                if 'GPE' not in entities:
+                    entities['GPE'] = []
+                if city not in entities['GPE']:
+                    entities['GPE'].append(city)
+
+    # Detect mathematical expressions for calculation
+    math_patterns = [
+        r'\b\d+(?:\.\d+)?\b',  # Numbers
+        r'\b(?:plus|minus|times|divide|multiply|add|subtract)\b',  # Math words
+        # Number words; every cardinal word since the number normalizer, so the
+        # comparison checks the engine against the current rules
+        r'\b(?:' + '|'.join(CARDINAL_WORDS) + r')\b'
+    ]
+
+    math_found = False
+    for pattern in math_patterns:
+        if re.search(pattern, text_lower):
+            math_found = True
+            break
+
+    if math_found:
+        if 'MATH' not in entities:
+            entities['MATH'] = []
+        entities['MATH'].append('mathematical_expression')
+
+    # Detect time expressions for reminders
+    time_patterns = [
+        r'\b(?:at|in) (\d{1,2}(?::\d{2})?\s*(?:am|pm|AM|PM)?)\b',
+        r'\b(?:after|in) (\d+)\s*(?:minutes?|hours?|days?)\b',
+        r'\b(?:tomorrow|today|tonight|morning|afternoon|evening)\b'
+    ]
+
+    for pattern in time_patterns:
+        matches = re.findall(pattern, text, re.IGNORECASE)
+        if matches:
+            if 'TIME' not in entities:
+                entities['TIME'] = []
+            for match in matches:
+                time_expr = match if isinstance(
+                    match, str) else ' '.join(match)
+                if time_expr not in entities['TIME']:
+                    entities['TIME'].append(time_expr.strip())
+
+    # Enhanced UI control actions and directions detection
+    ui_action_patterns = {
+        # Tab controls
+        'switch_tab': [
+            r'\b(?:switch|change|move|go)\s+(?:to\s+)?(?:the\s+)?(?:next|previous|left|right)\s+tab\b',
+            r'\b(?:next|previous|left|right)\s+tab\b'
+        ],
+        'close_tab': [r'\bclose\s+(?:this\s+|current\s+)?tab\b'],
+        'new_tab': [r'\b(?:new|open)\s+tab\b', r'\bopen\s+(?:a\s+)?new\s+tab\b'],
+
+        # Window controls
+        'close_window': [r'\bclose\s+(?:this\s+|current\s+)?window\b'],
+        'minimize_window': [r'\bminimize\s+(?:this\s+|current\s+)?window\b'],
+        'maximize_window': [r'\bmaximize\s+(?:this\s+|current\s+)?window\b'],
+
+        # Volume controls
+        'volume_up': [
+            r'\b(?:increase|turn\s+up|raise)\s+(?:the\s+)?volume\b',
+            r'\bvolume\s+up\b'
+        ],
+        'volume_down': [
+            r'\b(?:decrease|turn\s+down|lower)\s+(?:the\s+)?volume\b',
+            r'\bvolume\s+down\b'
+        ],
+        'mute': [r'\bmute\s+(?:the\s+)?(?:volume|sound|audio)\b', r'\bmute\b'],
+
+        # Media controls
+        'pause': [
+            r'\bpause\b(?!\s+play)',  # pause but not "pause play"
+            r'\bpause\s+(?:music|video|media|audio)\b'
+        ],
+        'play': [
+            r'\bplay\b(?!\s+pause)',  # play but not "play pause"
+            r'\bplay\s+(?:music|video|media|audio)\b',
+            r'\bresume\b'
+        ],
+        'pause_play': [
+            r'\bpause\s+play\b', r'\bplay\s+pause\b',
+            r'\btoggle\s+(?:play|pause)\b'
+        ],
+        'next_track': [
+            r'\b(?:next|skip)\s+(?:track|song|music)\b',
+            r'\bskip\b(?!\s+(?:to|forward))',
+            r'\bnext\s+(?:song|track)\b'
+        ],
+        'previous_track': [
+            r'\b(?:previous|back)\s+(?:track|song|music)\b',
+            r'\bprevious\s+(?:song|track)\b',
+            r'\bback\s+(?:song|track)\b'
+        ],
+
+        # Screenshot
+        'screenshot': [
+            r'\btake\s+(?:a\s+)?screenshot\b',
+            r'\bscreenshot\b',
+            r'\bcapture\s+screen\b'
+        ],
+
+        # Text input and editing
+        'type_text': [r'\btype\s+(.+)', r'\bwrite\s+(.+)', r'\binput\s+(.+)'],
+        'copy': [r'\bcopy\b', r'\bctrl\s*c\b'],
+        'paste': [r'\bpaste\b', r'\bctrl\s*v\b'],
+        'select_all': [r'\bselect\s+all\b', r'\bctrl\s*a\b'],
+        'undo': [r'\bundo\b', r'\bctrl\s*z\b'],
+        'redo': [r'\bredo\b', r'\bctrl\s*y\b'],
+
+        # Application and navigation
+        'alt_tab': [r'\balt\s+tab\b', r'\bswitch\s+(?:app|application)\b'],
+        'refresh': [r'\brefresh\b', r'\breload\b', r'\bf5\b'],
+        'go_back': [r'\bgo\s+back\b', r'\bback\b', r'\bprevious\s+page\b'],
+        'go_forward': [r'\bgo\s+forward\b', r'\bforward\b', r'\bnext\s+page\b']
+    }
+
+    direction_patterns = {
+        'next': [r'\bnext\b', r'\bright\b'],
+        'previous': [r'\bprevious\b', r'\bprev\b', r'\bleft\b', r'\bback\b']
+    }
+
+    # Check for UI actions
+    for action, patterns in ui_action_patterns.items():
+        for pattern in patterns:
+            if re.search(pattern, text_lower):
+                if 'UI_ACTION' not in entities:
+                    entities['UI_ACTION'] = []
+                if action not in entities['UI_ACTION']:
+                    entities['UI_ACTION'].append(action)
+
+    # Check for directions (for tab switching)
+    for direction, patterns in direction_patterns.items():
+        for pattern in patterns:
+            if re.search(pattern, text_lower):
+                if 'DIRECTION' not in entities:
+                    entities['DIRECTION'] = []
+                if direction not in entities['DIRECTION']:
+                    entities['DIRECTION'].append(direction)
+
+    # Extract text to type for type_text action
+    type_patterns = [
+        r'\btype\s+["\'](.+?)["\']',  # "type 'hello world'"
+        r'\btype\s+(.+)',             # "type hello world"
+        r'\bwrite\s+["\'](.+?)["\']',  # "write 'hello world'"
+        r'\bwrite\s+(.+)',            # "write hello world"
+        r'\binput\s+["\'](.+?)["\']',  # "input 'hello world'"
+        r'\binput\s+(.+)'             # "input hello world"
+    ]
+
+    for pattern in type_patterns:
+        matches = re.findall(pattern, text, re.IGNORECASE)
+        if matches:
+            if 'TEXT_TO_TYPE' not in entities:
+                entities['TEXT_TO_TYPE'] = []
+            for match in matches:
+                text_content = match.strip()
+                # Remove common ending words that might be captured
+                ending_words = ['please', 'now', 'here']
+                for word in ending_words:
+                    if text_content.endswith(' ' + word):
+                        text_content = text_content[:-len(' ' + word)]
+                if text_content and text_content not in entities['TEXT_TO_TYPE']:
+                    entities['TEXT_TO_TYPE'].append(text_content)
+
+    # Clean up empty entity lists
+    entities = {k: v for k, v in entities.items() if v}
+
+    return entities
+
+
+def main():
+    utterances = load_utterances()
+    engine = EntityRuleEngine()
+
+    # 9 weather, up to 3 math, 3 time, 55 UI action, 6 direction and 6 type-text patterns
+    legacy_passes = 9 + 3 + 3 + 55 + 6 + 6
+    engine_passes = sum(count_passes(engine, text) for text in utterances) / len(utterances)
+
+    def engine_rules(text):
+        entities = engine.apply(text, {})
+        return {k: v for k, v in entities.items() if v}
+
+    mismatches = [text for text in utterances if engine_rules(text) != legacy_rules(text)]
+
+    legacy = time_per_call(legacy_rules, utterances)
+    fused = time_per_call(lambda text: engine.apply(text, {}), utterances)
+
+    print(f"Utterances:             {len(utterances)}")
+    print(f"Entity mismatches:      {len(mismatches)}")
+    print(f"Regex passes (legacy):  up to {legacy_passes} per utterance")
+    print(f"Regex passes (engine):  {engine_passes:.1f} per utterance on average")
+    print(f"Legacy tables:          {format_us(legacy)} per utterance")
+    print(f"EntityRuleEngine:       {format_us(fused)} per utterance")
+    print(f"Speed-up:               {legacy / fused:,.1f}x")
+
+
+if __name__ == "__main__":
+    main()
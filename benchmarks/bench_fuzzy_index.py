@@ -0,0 +1,52 @@
+"""Latency of "did you mean" suggestions: difflib.get_close_matches vs FuzzyIndex.
+
+Run from the project root:
+    python -m benchmarks.bench_fuzzy_index
+"""
+import difflib
+
+from benchmarks.common import format_us, load_utterances, time_per_call
+from components.config import INTENT_PATTERNS, FUZZY_MATCH_CUTOFF
+from components.fuzzy_index import FuzzyIndex
+
+
+def legacy_matches(command, n):
+    # What NLPProcessor.get_fuzzy_matches did before the index
+    all_patterns = []
+    for intent_patterns in INTENT_PATTERNS.values():
+        all_patterns.extend(intent_patterns)
+    return difflib.get_close_matches(command, all_patterns, n=n, cutoff=FUZZY_MATCH_CUTOFF)
+
+
+def main():
+    commands = [text.lower() for text in load_utterances()]
+    # Misspelt variants are what actually reaches the unknown-intent fallback
+    commands += [command[:-1] for command in commands] + \
+        [command.replace('e', 'a') for command in commands]
+
+    index = FuzzyIndex(pattern for patterns in INTENT_PATTERNS.values() for pattern in patterns)
+
+    def indexed(command, n):
+        index._cache.clear()
+        return [phrase for phrase, _ in index.search(command, n, FUZZY_MATCH_CUTOFF)]
+
+    mismatches = [(command, n) for command in commands for n in (1, 3)
+                  if indexed(command, n) != legacy_matches(command, n)]
+
+    legacy = time_per_call(lambda command: legacy_matches(command, 3), commands, repeat=3)
+    cold = time_per_call(lambda command: indexed(command, 3), commands)
+    warm = time_per_call(lambda command: index.search(command, 3, FUZZY_MATCH_CUTOFF), commands)
+
+    print(f"Commands:              {len(commands)}")
+    print(f"Indexed phrases:       {len(index)}")
+    print(f"Result mismatches:     {len(mismatches)}")
+    for command, n in mismatches:
+        print(f"  - n={n}: {command}")
+    print(f"get_close_matches:     {format_us(legacy)} per command")
+    print(f"FuzzyIndex:            {format_us(cold)} per command")
+    print(f"FuzzyIndex (memoized): {format_us(warm)} per command")
+    print(f"Speed-up:              {legacy / cold:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""HttpClient against a local stand-in HTTP server.
+
+Compares bare requests.get (a new connection per call) with the pooled
+keep-alive client, and exercises retries of a 5xx and the per-host read
+timeout, which is not retried.
+
+Run from the project root:
+    python -m benchmarks.bench_http_client
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from benchmarks.common import format_us
+from components.http_client import HttpClient
+
+REQUESTS = 200
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so connections are kept alive between requests
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; do not let Nagle delay them
+    disable_nagle_algorithm = True
+    connections = set()
+    flaky_calls = 0
+    slow_calls = 0
+
+    def setup(self):
+        super().setup()
+        StandInHandler.connections.add(self.client_address)
+
+    def do_GET(self):
+        if self.path.startswith('/slow'):
+            StandInHandler.slow_calls += 1
+            time.sleep(1.0)
+        if self.path.startswith('/flaky'):
+            StandInHandler.flaky_calls += 1
+            if StandInHandler.flaky_calls % 2:
+                return self._reply(503, {'error': 'try again'})
+        self._reply(200, {'temp': 293.15, 'path': self.path})
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client already gave up, e.g. in the timeout check
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def timed_requests(get, url):
+    StandInHandler.connections.clear()
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        get(url).json()
+    return (time.perf_counter() - start) / REQUESTS, len(StandInHandler.connections)
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    client = HttpClient(timeouts={'127.0.0.1': (0.5, 0.3)}, backoff=0.05)
+    try:
+        bare, bare_connections = timed_requests(requests.get, f"{base}/weather")
+        pooled, pooled_connections = timed_requests(client.get, f"{base}/weather")
+
+        flaky = client.get(f"{base}/flaky")
+
+        start = time.perf_counter()
+        try:
+            client.get(f"{base}/slow")
+            timed_out = False
+        except requests.Timeout:
+            timed_out = True
+        timeout_time = time.perf_counter() - start
+
+        print(f"requests.get:            {format_us(bare)} per request, {bare_connections} connections")
+        print(f"HttpClient (keep-alive): {format_us(pooled)} per request, {pooled_connections} connections")
+        print(f"Speed-up:                {bare / pooled:.1f}x")
+        # Attempts as counted by the server, not the configured retry limit
+        print(f"Flaky endpoint:          status {flaky.status_code} after "
+              f"{StandInHandler.flaky_calls} attempts")
+        print(f"Slow endpoint:           {'timed out' if timed_out else 'answered'} "
+              f"after {timeout_time:.2f}s and {StandInHandler.slow_calls} attempt(s) "
+              f"(read timeouts are not retried)")
+        for host, stats in client.stats().items():
+            print(f"{host}: {stats}")
+    finally:
+        client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
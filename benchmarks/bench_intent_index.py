@@ -0,0 +1,66 @@
+"""Per-utterance latency of intent scoring: legacy difflib scan vs IntentIndex.
+
+Run from the project root:
+    python -m benchmarks.bench_intent_index
+"""
+import difflib
+import re
+
+from benchmarks.common import format_us, load_utterances, simple_tokens, time_per_call
+from components.config import INTENT_PATTERNS, LEADING_INTENTS
+from components.intent_index import IntentIndex
+
+
+def legacy_scores(text_lower, tokens):
+    # The scoring loop NLPProcessor.classify_intent used before the index,
+    # with greetings only counted as whole words opening the text
+    intent_scores = {}
+    for intent, patterns in INTENT_PATTERNS.items():
+        score = 0
+        for pattern in patterns:
+            if intent in LEADING_INTENTS:
+                found = re.match(re.escape(pattern) + r'\b', text_lower)
+            else:
+                found = pattern in text_lower
+            if found:
+                score += 2
+            for token in tokens:
+                if difflib.SequenceMatcher(None, token, pattern).ratio() > 0.8:
+                    score += 1
+        intent_scores[intent] = score
+    return intent_scores
+
+
+def main():
+    utterances = load_utterances()
+    inputs = [(text.lower(), simple_tokens(text)) for text in utterances]
+
+    index = IntentIndex(INTENT_PATTERNS, leading_intents=LEADING_INTENTS)
+
+    mismatches = [text for text, tokens in inputs
+                  if index.score(text, tokens) != legacy_scores(text, tokens)]
+
+    legacy = time_per_call(lambda item: legacy_scores(*item), inputs, repeat=3)
+    cold = time_per_call(
+        lambda item: IntentIndex(INTENT_PATTERNS, leading_intents=LEADING_INTENTS).score(*item),
+        inputs[:10], repeat=1)
+    indexed = time_per_call(lambda item: index.score(*item), inputs)
+
+    def uncached(item):
+        index._token_hits.clear()
+        return index.score(*item)
+    no_memo = time_per_call(uncached, inputs)
+
+    print(f"Utterances:            {len(inputs)}")
+    print(f"Score mismatches:      {len(mismatches)}")
+    for text in mismatches:
+        print(f"  - {text}")
+    print(f"Legacy difflib scan:   {format_us(legacy)} per utterance")
+    print(f"Index (incl. build):   {format_us(cold)} per utterance")
+    print(f"Index (no token memo): {format_us(no_memo)} per utterance")
+    print(f"Index (warm):          {format_us(indexed)} per utterance")
+    print(f"Speed-up (warm):       {legacy / indexed:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""How often spoken maths still needs the LLM fallback.
+
+Replays the spoken expressions in fixtures/math.txt through the previous
+replace-and-eval chain of calculate_expression and through MathEngine,
+counting answers computed locally, correct answers and expressions that
+would have been sent to the summarizer. Also times cold (parse and
+compile) and cached evaluation.
+
+Run from the project root:
+    python -m benchmarks.bench_math_engine
+"""
+import math
+import re
+
+from benchmarks.common import FIXTURES_DIR, format_us, time_per_call
+from components.math_engine import MathDomainError, MathEngine, MathSyntaxError, format_number
+
+MATH_FILE = FIXTURES_DIR / "math.txt"
+
+
+def load_cases(path=MATH_FILE):
+    """(spoken expression, expected answer) pairs, skipping comments"""
+    cases = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip() and not line.startswith('#'):
+                text, expected = line.rsplit('|', 1)
+                cases.append((text.strip(), float(expected)))
+    return cases
+
+
+def legacy_calculate(expression):
+    """The previous calculate_expression, minus the summarizer; raises where it fell back"""
+    word_to_symbol = {
+        'plus': '+', 'add': '+', 'added to': '+', 'and': '+',
+        'minus': '-', 'subtract': '-', 'subtracted from': '-', 'take away': '-',
+        'times': '*', 'multiply': '*', 'multiplied by': '*', 'into': '*',
+        'divide': '/', 'divided by': '/', 'over': '/',
+        'power': '**', 'to the power of': '**', 'raised to': '**', 'squared': '**2',
+        'cubed': '**3', 'square root': 'sqrt', 'percent': '/100',
+        'point': '.', 'decimal': '.', 'factorial': '!', 'factorial of': '!'
+    }
+    number_words = {
+        'zero': '0', 'one': '1', 'two': '2', 'three': '3', 'four': '4',
+        'five': '5', 'six': '6', 'seven': '7', 'eight': '8', 'nine': '9',
+        'ten': '10', 'eleven': '11', 'twelve': '12', 'thirteen': '13',
+        'fourteen': '14', 'fifteen': '15', 'sixteen': '16', 'seventeen': '17',
+        'eighteen': '18', 'nineteen': '19', 'twenty': '20', 'thirty': '30',
+        'forty': '40', 'fifty': '50', 'sixty': '60', 'seventy': '70',
+        'eighty': '80', 'ninety': '90', 'hundred': '100', 'thousand': '1000'
+    }
+    expression = expression.lower().strip()
+    for word, digit in number_words.items():
+        expression = expression.replace(word, digit)
+    for word, symbol in word_to_symbol.items():
+        expression = expression.replace(word, symbol)
+    expression = expression.replace('x', '*').replace('÷', '/')
+    for word in ['what', 'is', 'equals', 'equal', 'to', 'the', 'result', 'of', 'calculate']:
+        expression = expression.replace(word, '')
+    expression = ' '.join(expression.split())
+
+    if '!' in expression:
+        expression = re.sub(r'(\d+)!', lambda match: str(math.factorial(int(match.group(1)))),
+                            expression)
+    safe_expr = re.sub(r'[^0-9+\-*/().\s]', '', expression).strip()
+    if not safe_expr or not any(char.isdigit() for char in safe_expr):
+        raise ValueError("No valid mathematical expression found")
+    parts = safe_expr.split()
+    if len(parts) == 2 and all(part.replace('.', '').isdigit() for part in parts):
+        safe_expr = f"{parts[0]} * {parts[1]}"
+    if 'sqrt' in expression:
+        safe_expr = re.sub(r'sqrt\((\d+(?:\.\d+)?)\)',
+                           lambda match: str(math.sqrt(float(match.group(1)))), safe_expr)
+    return eval(safe_expr)
+
+
+def score(calculate, cases):
+    local = correct = 0
+    fallbacks = []
+    for text, expected in cases:
+        try:
+            result = calculate(text)
+        except Exception:
+            fallbacks.append(text)
+            continue
+        local += 1
+        if isinstance(result, (int, float)) and math.isclose(
+                format_number(result), expected, rel_tol=1e-6, abs_tol=1e-6):
+            correct += 1
+    return local, correct, fallbacks
+
+
+def main():
+    cases = load_cases()
+    engine = MathEngine()
+
+    def engine_calculate(text):
+        try:
+            return engine.evaluate(text)
+        except MathDomainError as e:
+            return str(e)  # answered locally with an error message
+
+    print(f"{len(cases)} spoken expressions")
+    fallbacks = None
+    for name, calculate in (('replace + eval', legacy_calculate), ('MathEngine', engine_calculate)):
+        local, correct, fallbacks = score(calculate, cases)
+        print(f"{name:<15} local {local:>3}  correct {correct:>3}  "
+              f"LLM fallbacks {len(fallbacks):>3} ({len(fallbacks) / len(cases):.0%})")
+    print("Still sent to the LLM:", '; '.join(fallbacks) or 'none')
+
+    texts = [text for text, _ in cases]
+
+    def cold(text):
+        try:
+            MathEngine().evaluate(text)
+        except (MathSyntaxError, MathDomainError):
+            pass
+
+    def cached(text):
+        try:
+            engine.evaluate(text)
+        except (MathSyntaxError, MathDomainError):
+            pass
+
+    print(f"Parse and evaluate: {format_us(time_per_call(cold, texts))} per expression")
+    print(f"Cached evaluate:    {format_us(time_per_call(cached, texts))} per expression")
+
+
+if __name__ == "__main__":
+    main()
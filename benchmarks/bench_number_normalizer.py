@@ -0,0 +1,130 @@
+"""Accuracy and throughput of spoken number normalization.
+
+Renders random numbers as words ("two thousand and twenty four",
+"forty-two", "the twenty first", "three point one four") inside short
+utterances, then reads them back with the previous word-by-word table
+lookup and with components.numbers, counting exact round trips and timing
+both.
+
+Run from the project root:
+    python -m benchmarks.bench_number_normalizer
+"""
+import random
+
+from benchmarks.common import format_us, time_per_call
+from components.numbers import ORDINALS, find_numbers
+
+SEED = 22
+SAMPLES = 2000
+TEMPLATES = ['what is {} plus seven', 'remind me in {} minutes', 'set a timer for {} seconds',
+             'cancel reminder {}', 'the {} of march', '{}']
+
+ONES = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine',
+        'ten', 'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen',
+        'seventeen', 'eighteen', 'nineteen']
+TENS = ['', '', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety']
+CARDINAL_TO_ORDINAL = {cardinal: ordinal for ordinal, cardinal in ORDINALS.items()}
+
+
+def _below_thousand(n, rng):
+    words = []
+    if n >= 100:
+        words += [ONES[n // 100], 'hundred']
+        n %= 100
+        if n and rng.random() < 0.5:
+            words.append('and')
+    if n >= 20:
+        tens, ones = TENS[n // 10], ONES[n % 10]
+        if n % 10 == 0:
+            words.append(tens)
+        elif rng.random() < 0.3:
+            words.append(f"{tens}-{ones}")
+        else:
+            words += [tens, ones]
+    elif n or not words:
+        words.append(ONES[n])
+    return words
+
+
+def to_words(n, rng):
+    """Spell out 0 <= n < 10**9, with the optional "and"s and hyphens people use"""
+    if n == 0:
+        return 'zero'
+    words = []
+    for scale, name in ((10 ** 6, 'million'), (10 ** 3, 'thousand')):
+        if n >= scale:
+            words += _below_thousand(n // scale, rng) + [name]
+            n %= scale
+            if n and n < 100 and rng.random() < 0.5:
+                words.append('and')
+    if n:
+        words += _below_thousand(n, rng)
+    return ' '.join(words)
+
+
+def to_ordinal_words(n, rng):
+    words = to_words(n, rng).split(' ')
+    last = words[-1].split('-')
+    last[-1] = CARDINAL_TO_ORDINAL[last[-1]]
+    words[-1] = '-'.join(last)
+    return ' '.join(words)
+
+
+def make_cases(rng):
+    """(utterance, expected values) pairs"""
+    cases = []
+    for _ in range(SAMPLES):
+        template = rng.choice(TEMPLATES)
+        kind = rng.random()
+        if template == 'the {} of march':
+            n = rng.randint(1, 31)
+            if n % 10 == 2 and n != 12:
+                n += 1  # "second" alone is not an ordinal
+            spoken, value = to_ordinal_words(n, rng), n
+        elif kind < 0.15:
+            whole, fraction = rng.randint(0, 99), str(rng.randint(1, 999))
+            digits = ' '.join(ONES[int(digit)] for digit in fraction)
+            spoken, value = f"{to_words(whole, rng)} point {digits}", float(f"{whole}.{fraction}")
+        else:
+            n = rng.choice([rng.randint(0, 99), rng.randint(100, 9999), rng.randint(10000, 10 ** 9 - 1)])
+            spoken, value = to_words(n, rng), n
+        if template == 'what is {} plus seven':
+            cases.append((template.format(spoken), [value, 7]))
+        else:
+            cases.append((template.format(spoken), [value]))
+    return cases
+
+
+LEGACY_WORDS = {word: value for value, word in enumerate(ONES)}
+LEGACY_WORDS.update({word: 10 * i for i, word in enumerate(TENS) if word})
+LEGACY_WORDS.update({'hundred': 100, 'thousand': 1000})
+
+
+def legacy_numbers(text):
+    """The previous approach: each number word replaced on its own"""
+    return [LEGACY_WORDS[word] if word in LEGACY_WORDS else int(word)
+            for word in text.lower().split() if word in LEGACY_WORDS or word.isdigit()]
+
+
+def normalizer_numbers(text):
+    return [span.value for span in find_numbers(text)]
+
+
+def main():
+    cases = make_cases(random.Random(SEED))
+    texts = [text for text, _ in cases]
+    words = sum(len(text.split()) for text in texts)
+
+    print(f"{len(cases)} utterances, {words / len(cases):.1f} words on average")
+    for name, read in (('word table', legacy_numbers), ('numbers.py', normalizer_numbers)):
+        correct = sum(read(text) == expected for text, expected in cases)
+        per_call = time_per_call(read, texts)
+        print(f"{name:<11} exact {correct:>5} ({correct / len(cases):.0%})  "
+              f"{format_us(per_call)} per utterance  "
+              f"{1 / per_call:,.0f} utterances/s  {words / len(cases) / per_call:,.0f} words/s")
+    misses = [text for text, expected in cases if normalizer_numbers(text) != expected]
+    print("Misread by numbers.py:", '; '.join(misses[:5]) or 'none')
+
+
+if __name__ == "__main__":
+    main()
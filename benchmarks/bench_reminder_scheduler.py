@@ -0,0 +1,176 @@
+"""Load test: a thread per reminder versus one heap-based scheduler thread.
+
+The previous ReminderSystem started a thread per reminder that polled
+with time.sleep(1). That is replayed with a few thousand reminders (a
+hundred thousand threads would not start), then Scheduler takes 100k
+reminders, a tenth of which are cancelled. Both report thread count,
+resident memory and firing jitter (how late each callback ran). Last, a
+few reminders fall due together with a callback that blocks as the real
+one does (beeps, then speech), run on the scheduler thread and through
+ReminderSystem, which hands callbacks to its trigger pool.
+
+Run from the project root:
+    python -m benchmarks.bench_reminder_scheduler
+"""
+import logging
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from components.scheduler import Scheduler
+from features.reminder_sys import ReminderSystem
+
+LEGACY_REMINDERS = 2000
+SCHEDULER_REMINDERS = 100000
+CANCEL_EVERY = 10
+SPREAD = 3.0  # Deadlines fall within this many seconds after scheduling
+LEAD = 1.0  # ...starting this long after the last one is scheduled
+SEED = 23
+BLOCKING_REMINDERS = 8
+BLOCKING_SECONDS = 0.5  # Stands in for three 1 s beeps and the spoken reminder
+
+
+def rss_mb():
+    """Resident set size in MB, or None where it cannot be read"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2 ** 20
+    except ImportError:
+        pass
+    try:
+        for line in Path('/proc/self/status').read_text().splitlines():
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def format_mb(value):
+    return f"{value:,.1f} MB" if value is not None else "n/a"
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def deadlines(count, start, rng):
+    return [start + rng.uniform(0, SPREAD) for _ in range(count)]
+
+
+def wait_for(late, count, timeout):
+    end = time.time() + timeout
+    while len(late) < count and time.time() < end:
+        time.sleep(0.05)
+
+
+def report(name, count, threads, rss_before, rss_after, seconds, late):
+    print(f"{name}: {count:,} reminders scheduled in {seconds:.2f}s")
+    print(f"  threads running:   {threads:,}")
+    print(f"  RSS:               {format_mb(rss_before)} -> {format_mb(rss_after)}")
+    late_ms = [value * 1000 for value in late]
+    print(f"  fired:             {len(late):,}")
+    print(f"  jitter:            p50 {percentile(late_ms, 0.5):.1f} ms  "
+          f"p99 {percentile(late_ms, 0.99):.1f} ms  max {max(late_ms):.1f} ms")
+
+
+def run_legacy(rng):
+    late = []
+    lock = threading.Lock()
+
+    def reminder_job(remind_time):
+        # The previous ReminderSystem.schedule_reminder loop
+        while time.time() < remind_time:
+            time.sleep(1)
+        with lock:
+            late.append(time.time() - remind_time)
+
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    whens = deadlines(LEGACY_REMINDERS, time.time() + LEAD, rng)
+    for when in whens:
+        threading.Thread(target=reminder_job, args=(when,), daemon=True).start()
+    seconds = time.perf_counter() - start
+    threads, rss_after = threading.active_count(), rss_mb()
+    wait_for(late, LEGACY_REMINDERS, LEAD + SPREAD + 5)
+    report("Thread per reminder", LEGACY_REMINDERS, threads, rss_before, rss_after, seconds, late)
+
+
+def run_scheduler(rng):
+    late = []
+    scheduler = Scheduler()
+
+    def make_job(remind_time):
+        return lambda: late.append(time.time() - remind_time)
+
+    rss_before = rss_mb()
+    # Place deadlines after scheduling all 100k finishes, so none is due early
+    start = time.perf_counter()
+    whens = deadlines(SCHEDULER_REMINDERS, time.time() + LEAD + 2.0, rng)
+    for key, when in enumerate(whens):
+        scheduler.schedule(key, when, make_job(when))
+    seconds = time.perf_counter() - start
+
+    cancel_start = time.perf_counter()
+    cancelled = range(0, SCHEDULER_REMINDERS, CANCEL_EVERY)
+    for key in cancelled:
+        scheduler.cancel(key)
+    cancel_seconds = time.perf_counter() - cancel_start
+
+    threads, rss_after = threading.active_count(), rss_mb()
+    expected = SCHEDULER_REMINDERS - len(cancelled)
+    wait_for(late, expected, LEAD + 2.0 + SPREAD + 10)
+    scheduler.shutdown()
+    report("Scheduler", SCHEDULER_REMINDERS, threads, rss_before, rss_after, seconds, late)
+    print(f"  schedule:          {seconds / SCHEDULER_REMINDERS * 1e6:.1f} us each")
+    print(f"  cancel:            {cancel_seconds / len(cancelled) * 1e6:.1f} us each "
+          f"({len(cancelled):,} cancelled, {expected:,} expected to fire)")
+
+
+def run_blocking():
+    def blocking_job(remind_time, late):
+        def job(*args):
+            late.append(time.time() - remind_time)
+            time.sleep(BLOCKING_SECONDS)
+        return job
+
+    # Straight on the scheduler thread: each waits for the ones before it
+    inline_late = []
+    scheduler = Scheduler()
+    when = time.time() + LEAD
+    for key in range(BLOCKING_REMINDERS):
+        scheduler.schedule(key, when, blocking_job(when, inline_late))
+    wait_for(inline_late, BLOCKING_REMINDERS, LEAD + BLOCKING_REMINDERS * BLOCKING_SECONDS + 5)
+    scheduler.shutdown(wait=False)
+
+    pooled_late = []
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as directory:
+        system = ReminderSystem(str(Path(directory) / "reminders.db"))
+        when = time.time() + LEAD
+        system.set_reminder_callback(blocking_job(when, pooled_late))
+        for key in range(BLOCKING_REMINDERS):
+            system.schedule_reminder(key, f"reminder {key}", datetime.fromtimestamp(when))
+        wait_for(pooled_late, BLOCKING_REMINDERS, LEAD + BLOCKING_REMINDERS * BLOCKING_SECONDS + 5)
+        system.trigger_pool.shutdown(wait=True)  # Let the last callbacks finish
+        system.cleanup()
+
+    print(f"{BLOCKING_REMINDERS} reminders due together, callbacks blocking {BLOCKING_SECONDS}s:")
+    for name, late in (("scheduler thread", inline_late),
+                       (f"ReminderSystem ({ReminderSystem.TRIGGER_WORKERS} workers)", pooled_late)):
+        print(f"  {name + ':':<28} last started {max(late) * 1000:,.0f} ms late")
+
+
+def main():
+    rng = random.Random(SEED)
+    run_legacy(rng)
+    run_scheduler(rng)
+    run_blocking()
+
+
+if __name__ == "__main__":
+    main()
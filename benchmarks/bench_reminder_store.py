@@ -0,0 +1,146 @@
+"""Reminder storage: a connection per call versus the pooled WAL ReminderStore.
+
+Fills a reminders table with 10k rows, then times adding reminders,
+listing them and the startup load (read every row, delete the expired
+tenth). The previous ReminderSystem queries are replayed as they were,
+opening a fresh sqlite3 connection for each call on an unindexed table in
+the default rollback-journal mode.
+
+Run from the project root:
+    python -m benchmarks.bench_reminder_store
+"""
+import logging
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from features.reminder_store import CREATE_TABLE, ReminderStore
+from features.reminder_sys import ReminderSystem
+
+ROWS = 10000
+SINGLE_ADDS = 500
+LIST_REPEAT = 20
+EXPIRED_FRACTION = 0.1
+SEED = 24
+
+
+def make_rows(rng, now):
+    rows = []
+    for i in range(ROWS):
+        if rng.random() < EXPIRED_FRACTION:
+            when = now - timedelta(minutes=rng.randint(1, 600))
+        else:
+            when = now + timedelta(minutes=rng.randint(1, 60 * 24 * 30))
+        rows.append((f"reminder {i}", when.isoformat()))
+    return rows
+
+
+# The previous ReminderSystem storage code, one connection per call
+
+def legacy_init(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute(CREATE_TABLE)
+    conn.commit()
+    conn.close()
+
+
+def legacy_add(db_path, text, time_str):
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    c.execute("INSERT INTO reminders (text, time) VALUES (?, ?)", (text, time_str))
+    conn.commit()
+    reminder_id = c.lastrowid
+    conn.close()
+    return reminder_id
+
+
+def legacy_list(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT id, text, time FROM reminders ORDER BY time").fetchall()
+    conn.close()
+    return rows
+
+
+def legacy_load(db_path, now):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT id, text, time FROM reminders").fetchall()
+    conn.close()
+    for reminder_id, _, time_str in rows:
+        if datetime.fromisoformat(time_str) <= now:
+            conn = sqlite3.connect(db_path)
+            conn.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
+            conn.commit()
+            conn.close()
+    return rows
+
+
+def store_load(store, now):
+    rows = store.active()
+    store.remove_many([reminder_id for reminder_id, _, time_str in rows
+                       if datetime.fromisoformat(time_str) <= now])
+    return rows
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def best_of(repeat, func, *args):
+    return min(timed(func, *args)[0] for _ in range(repeat))
+
+
+def main():
+    logging.disable(logging.INFO)
+    rng = random.Random(SEED)
+    now = datetime.now()
+    rows = make_rows(rng, now)
+    extra = make_rows(rng, now)[:SINGLE_ADDS]
+
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_db = str(Path(directory) / "legacy.db")
+        store_db = str(Path(directory) / "store.db")
+
+        legacy_init(legacy_db)
+        legacy_fill, _ = timed(lambda: [legacy_add(legacy_db, *row) for row in rows])
+        store = ReminderStore(store_db)
+        store_fill, _ = timed(store.add_many, rows)
+
+        legacy_single, _ = timed(lambda: [legacy_add(legacy_db, *row) for row in extra])
+        store_single, _ = timed(lambda: [store.add(*row) for row in extra])
+
+        legacy_listing = best_of(LIST_REPEAT, legacy_list, legacy_db)
+        store_listing = best_of(LIST_REPEAT, store.active)
+
+        legacy_startup, legacy_rows = timed(legacy_load, legacy_db, now)
+        store_startup, _ = timed(store_load, store, now)
+        store.close()
+        expired = sum(datetime.fromisoformat(row[2]) <= now for row in legacy_rows)
+
+        # The whole ReminderSystem start-up on a fresh copy of the 10k rows
+        system_db = str(Path(directory) / "system.db")
+        seed_store = ReminderStore(system_db)
+        seed_store.add_many(rows)
+        seed_store.close()
+        system_startup, system = timed(ReminderSystem, system_db)
+        scheduled = len(system.active_reminders)
+        system.cleanup()
+
+    print(f"{ROWS:,} reminders ({expired:,} expired at start-up), "
+          f"{SINGLE_ADDS} single adds on top")
+    print(f"{'':<22}{'per call':>12}{'ReminderStore':>16}")
+    print(f"{'fill 10k rows':<22}{legacy_fill:>11.3f}s{store_fill:>15.3f}s  (one transaction)")
+    print(f"{'add one reminder':<22}{legacy_single / SINGLE_ADDS * 1000:>10.2f}ms"
+          f"{store_single / SINGLE_ADDS * 1000:>14.2f}ms")
+    print(f"{'list reminders':<22}{legacy_listing * 1000:>10.2f}ms{store_listing * 1000:>14.2f}ms")
+    print(f"{'start-up load':<22}{legacy_startup:>11.3f}s{store_startup:>15.3f}s")
+    print(f"ReminderSystem start-up with {len(rows):,} rows: {system_startup:.3f}s, "
+          f"{scheduled:,} reminders scheduled")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Reminder time parsing: dateparser.parse versus ReminderTimeParser.
+
+Parses the phrases in fixtures/reminder_times.txt against a fixed
+reference time (a Friday afternoon) with dateparser alone and with
+ReminderTimeParser, reporting how many take the fast path, how many of
+those agree with dateparser (and where they deliberately do not), and the
+latency of each: dateparser's first call, dateparser once warm, the fast
+path compiling a phrase, the memoized fast path as the reference time
+moves on, and the fallback phrases, which go to dateparser on every call:
+relative to now, as add_reminder asks, and to an explicit reference.
+
+Run from the project root:
+    python -m benchmarks.bench_reminder_time
+"""
+import time
+from datetime import datetime, timedelta
+
+from dateparser import parse
+
+from benchmarks.common import FIXTURES_DIR, format_us, time_per_call
+from features.reminder_time import ReminderTimeParser
+
+TIMES_FILE = FIXTURES_DIR / "reminder_times.txt"
+REFERENCE = datetime(2026, 10, 16, 14, 30, 15, 123456)  # Friday, 2:30 pm
+
+
+def load_phrases(path=TIMES_FILE):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def dateparser_parse(phrase, reference=REFERENCE):
+    return parse(phrase, settings={'RELATIVE_BASE': reference})
+
+
+def main():
+    phrases = load_phrases()
+
+    start = time.perf_counter()
+    dateparser_parse(phrases[0])
+    first_call = time.perf_counter() - start
+
+    parser = ReminderTimeParser()
+    agree, differ, fallback = [], [], []
+    for phrase in phrases:
+        expected = dateparser_parse(phrase)
+        fast = parser._compile(parser.normalize(phrase)) is not None
+        result = parser.parse(phrase, REFERENCE)
+        if not fast:
+            fallback.append(phrase)
+        elif result == expected:
+            agree.append(phrase)
+        else:
+            differ.append((phrase, result, expected))
+
+    fast_phrases = [phrase for phrase in phrases if phrase not in fallback]
+    warm = time_per_call(dateparser_parse, fast_phrases, repeat=3)
+    warm_all = time_per_call(dateparser_parse, phrases, repeat=3)
+    cold = time_per_call(lambda phrase: ReminderTimeParser().parse(phrase, REFERENCE), fast_phrases)
+    references = iter([REFERENCE + timedelta(seconds=i) for i in range(10 ** 6)])
+    memoized = time_per_call(lambda phrase: parser.parse(phrase, next(references)), fast_phrases)
+    fallback_now = time_per_call(parser.parse, fallback)
+    fallback_explicit = time_per_call(lambda phrase: parser.parse(phrase, next(references)),
+                                      fallback, repeat=1)
+    mixed = time_per_call(parser.parse, phrases)
+
+    print(f"{len(phrases)} phrases, reference {REFERENCE:%A %Y-%m-%d %H:%M}")
+    print(f"Fast path:  {len(fast_phrases)} ({len(fast_phrases) / len(phrases):.0%}); "
+          f"{len(agree)} agree with dateparser, {len(differ)} deliberately differ")
+    print(f"Fallback:   {len(fallback)} ({', '.join(fallback)})")
+    print("Differences (fast path | dateparser):")
+    for phrase, result, expected in differ:
+        print(f"  {phrase:<22} {str(result):<28} | {expected}")
+    print(f"dateparser first call:          {first_call * 1000:,.1f} ms")
+    print(f"dateparser warm, fast phrases:  {format_us(warm)} per phrase")
+    print(f"Fast path, compiling:           {format_us(cold)} per phrase")
+    print(f"Fast path, memoized:            {format_us(memoized)} per phrase "
+          f"(reference time changing each call)")
+    print(f"Fallback, relative to now:      {format_us(fallback_now)} per phrase "
+          f"(dateparser every call)")
+    print(f"Fallback, explicit reference:   {format_us(fallback_explicit)} per phrase "
+          f"(dateparser with a settings dict)")
+    print(f"All phrases, dateparser:        {format_us(warm_all)} per phrase")
+    print(f"All phrases, ReminderTimeParser: {format_us(mixed)} per phrase (relative to now)")
+
+
+if __name__ == "__main__":
+    main()
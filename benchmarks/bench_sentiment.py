@@ -0,0 +1,67 @@
+"""Sentiment agreement and latency: TextBlob per command vs the compiled lexicon.
+
+Run from the project root:
+    python -m benchmarks.bench_sentiment
+"""
+from nltk.tokenize import NLTKWordTokenizer
+from textblob import TextBlob
+from textblob.en import sentiment as textblob_sentiment
+
+from benchmarks.common import FIXTURES_DIR, format_us, load_utterances, time_per_call
+from components.sentiment import SentimentLexicon
+
+SENTIMENT_FILE = FIXTURES_DIR / "sentiment.txt"
+
+
+def label(polarity):
+    # Same buckets as NLPProcessor._polarity_label
+    if polarity > 0.1:
+        return 'positive'
+    elif polarity < -0.1:
+        return 'negative'
+    return 'neutral'
+
+
+def main():
+    texts = load_utterances(SENTIMENT_FILE)
+    # word_tokenize without the punkt sentence splitter, which commands do not need
+    tokenizer = NLTKWordTokenizer()
+    token_lists = [tokenizer.tokenize(text.lower()) for text in texts]
+
+    lexicon = SentimentLexicon.from_textblob()
+
+    # Given the same tokens the lexicon must reproduce TextBlob's scoring exactly
+    rule_mismatches = [tokens for tokens in token_lists
+                       if abs(lexicon.polarity(tokens) - textblob_sentiment(tokens)[0]) > 1e-9]
+
+    # Against TextBlob on raw text, differences come from tokenization only
+    disagreements = []
+    for text, tokens in zip(texts, token_lists):
+        expected = TextBlob(text).sentiment.polarity
+        actual = lexicon.polarity(tokens)
+        if label(expected) != label(actual):
+            disagreements.append((text, expected, actual))
+    agreement = 1 - len(disagreements) / len(texts)
+
+    textblob_time = time_per_call(lambda text: TextBlob(text).sentiment, texts)
+    pipeline_time = time_per_call(
+        lambda text: lexicon.polarity(tokenizer.tokenize(text.lower())), texts)
+    lexicon_time = time_per_call(lexicon.polarity, token_lists)
+    batch_time = time_per_call(lexicon.polarity_batch, [token_lists]) / len(token_lists)
+
+    print(f"Texts:                    {len(texts)}")
+    print(f"Rule mismatches:          {len(rule_mismatches)}")
+    for tokens in rule_mismatches:
+        print(f"  - {' '.join(tokens)}")
+    print(f"Label agreement:          {agreement:.1%}")
+    for text, expected, actual in disagreements:
+        print(f"  - {text!r}: TextBlob {expected:+.2f}, lexicon {actual:+.2f}")
+    print(f"TextBlob:                 {format_us(textblob_time)} per text")
+    print(f"Lexicon (incl. tokenize): {format_us(pipeline_time)} per text")
+    print(f"Lexicon (shared tokens):  {format_us(lexicon_time)} per text")
+    print(f"Lexicon batch:            {format_us(batch_time)} per text")
+    print(f"Speed-up (shared tokens): {textblob_time / lexicon_time:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
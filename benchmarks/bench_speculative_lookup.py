@@ -0,0 +1,134 @@
+"""Sequential, hedged and speculative knowledge lookups against stub backends.
+
+The stub Wikipedia and summarizer sleep for log-normally distributed
+latencies (scaled down by SCALE so the run is quick) and fail at fixed
+rates; a share of Wikipedia queries are ambiguous and need a second page
+fetch. All modes replay the same scenarios and report time-to-answer
+percentiles, where each answer came from and how many summarizer calls
+were made.
+
+Run from the project root:
+    python -m benchmarks.bench_speculative_lookup
+"""
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from components.config import LOOKUP_DEADLINE, LOOKUP_HEDGE_DELAY, LOOKUP_WORKERS
+from components.speculative import race
+
+TRIALS = 300
+SCALE = 0.05  # Stub latencies are 1/20 of real ones
+WIKI_MEDIAN = 0.35  # Seconds per Wikipedia page fetch
+SUMMARIZER_MEDIAN = 1.2  # Seconds per summarizer call
+SPREAD = 0.5  # Sigma of the log-normal latencies
+WIKI_AMBIGUOUS = 0.15
+WIKI_MISSING = 0.10
+SUMMARIZER_FAILING = 0.03
+
+
+class Scenario:
+    """Pre-drawn latencies and outcomes, so both modes see the same ones"""
+
+    def __init__(self, rng):
+        draw = lambda median: rng.lognormvariate(0, SPREAD) * median * SCALE
+        self.wiki_times = [draw(WIKI_MEDIAN), draw(WIKI_MEDIAN)]
+        self.summarizer_time = draw(SUMMARIZER_MEDIAN)
+        roll = rng.random()
+        self.ambiguous = roll < WIKI_AMBIGUOUS
+        self.missing = WIKI_AMBIGUOUS <= roll < WIKI_AMBIGUOUS + WIKI_MISSING
+        self.summarizer_fails = rng.random() < SUMMARIZER_FAILING
+
+
+class StubBackends:
+    def __init__(self):
+        self.summarizer_calls = 0
+        self.active = 0
+        self.idle = threading.Condition()
+
+    def _call(self, seconds, answer):
+        with self.idle:
+            self.active += 1
+        time.sleep(seconds)
+        with self.idle:
+            self.active -= 1
+            self.idle.notify_all()
+        return answer
+
+    def wait_idle(self):
+        # Commands arrive seconds apart, so lookups left running by the
+        # last one have finished before the next starts
+        with self.idle:
+            self.idle.wait_for(lambda: self.active == 0)
+
+    def wikipedia(self, scenario):
+        seconds = scenario.wiki_times[0]
+        if scenario.ambiguous:
+            # Then fetch the first disambiguation option
+            seconds += scenario.wiki_times[1]
+        return self._call(seconds, None if scenario.missing else "wikipedia answer")
+
+    def summarizer(self, scenario):
+        self.summarizer_calls += 1
+        return self._call(scenario.summarizer_time,
+                          None if scenario.summarizer_fails else "summarizer answer")
+
+
+def sequential(backends, scenario, pool):
+    # search_for with LOOKUP_MODE = 'sequential'
+    answer = backends.wikipedia(scenario)
+    if answer is not None:
+        return 'wikipedia', answer
+    answer = backends.summarizer(scenario)
+    return ('summarizer', answer) if answer is not None else (None, None)
+
+
+def speculative(backends, scenario, pool):
+    return race(pool, [
+        ('wikipedia', lambda: backends.wikipedia(scenario)),
+        ('summarizer', lambda: backends.summarizer(scenario))
+    ], LOOKUP_DEADLINE * SCALE)
+
+
+def hedged(backends, scenario, pool):
+    return race(pool, [
+        ('wikipedia', lambda: backends.wikipedia(scenario)),
+        ('summarizer', lambda: backends.summarizer(scenario), LOOKUP_HEDGE_DELAY * SCALE)
+    ], LOOKUP_DEADLINE * SCALE)
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def replay(lookup, scenarios):
+    backends = StubBackends()
+    sources = Counter()
+    times = []
+    with ThreadPoolExecutor(max_workers=LOOKUP_WORKERS) as pool:
+        for scenario in scenarios:
+            start = time.perf_counter()
+            source, _ = lookup(backends, scenario, pool)
+            times.append((time.perf_counter() - start) / SCALE)
+            sources[source or 'none'] += 1
+            backends.wait_idle()
+    times.sort()
+    return times, sources, backends.summarizer_calls
+
+
+def main():
+    rng = random.Random(18)
+    scenarios = [Scenario(rng) for _ in range(TRIALS)]
+
+    print(f"{TRIALS} lookups, times in real-world seconds (stub runs {1 / SCALE:.0f}x faster)")
+    for name, lookup in (('sequential', sequential), ('hedged', hedged), ('speculative', speculative)):
+        times, sources, summarizer_calls = replay(lookup, scenarios)
+        print(f"{name:<12} p50 {percentile(times, 0.5):.2f}s  p90 {percentile(times, 0.9):.2f}s  "
+              f"p99 {percentile(times, 0.99):.2f}s  max {times[-1]:.2f}s  "
+              f"summarizer calls {summarizer_calls}  answers {dict(sources)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Per-intent cost of the analysis stages INTENT_STAGE_PLAN lets process_command skip.
+
+Every utterance of a replay corpus is classified, then each optional stage
+is run and timed on its own; stages the intent's plan leaves out are
+counted as saved. Pass a conversation_history.json (or any utterance file
+read_utterances accepts) to replay real traffic.
+
+Run from the project root:
+    python -m benchmarks.bench_stage_plan [corpus]
+"""
+import sys
+from collections import defaultdict
+
+from benchmarks.common import UTTERANCES_FILE
+from components.batch_analyzer import read_utterances
+
+# Utterance timings each stage of the plan accounts for
+STAGE_TIMINGS = {
+    'sentiment': ('sentiment',),
+    'entities': ('doc', 'entities'),
+    'rules': ('rule_entities',)
+}
+
+
+def replay(nlp_processor, utterances):
+    """Return {intent: [count, full_ms, planned_ms]} over the utterances"""
+    costs = defaultdict(lambda: [0, 0.0, 0.0])
+    for text in utterances:
+        utterance = nlp_processor.analyze(text.lower())
+        intent = nlp_processor.classify_intent(utterance)
+        planned = nlp_processor.stage_plan(intent)
+
+        # Run every stage so both plans can be priced from the same timings
+        nlp_processor.analyze_sentiment(utterance)
+        nlp_processor.extract_entities(utterance)
+        nlp_processor.extract_rule_entities(utterance)
+
+        def cost(stages):
+            return sum(utterance.timings.get(name, 0.0)
+                       for stage in stages for name in STAGE_TIMINGS[stage]) * 1000
+
+        entry = costs[intent]
+        entry[0] += 1
+        entry[1] += cost(('sentiment', 'entities'))
+        entry[2] += cost(planned)
+    return costs
+
+
+def format_report(costs):
+    lines = [f"{'intent':<12}{'count':>7}{'full ms':>11}{'planned ms':>12}{'saved':>8}"]
+    total_full = total_planned = 0.0
+    for intent, (count, full, planned) in sorted(costs.items(), key=lambda item: -item[1][1]):
+        saved = 1 - planned / full if full else 0.0
+        lines.append(f"{intent:<12}{count:>7}{full / count:>11.3f}{planned / count:>12.3f}{saved:>8.0%}")
+        total_full += full
+        total_planned += planned
+    if total_full:
+        lines.append(f"Stage time saved over the corpus: {total_full - total_planned:.1f} ms "
+                     f"({1 - total_planned / total_full:.0%})")
+    return "\n".join(lines)
+
+
+def main():
+    from components.nlp_processor import NLPProcessor
+
+    corpus = sys.argv[1] if len(sys.argv) > 1 else UTTERANCES_FILE
+    utterances = list(read_utterances(corpus))
+    nlp_processor = NLPProcessor()
+
+    # Load models up front so the first utterance is not charged for them
+    replay(nlp_processor, utterances[:1])
+    print(format_report(replay(nlp_processor, utterances)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Time to first audio: whole-response speech versus streamed sentences.
+
+A fake model emits a canned summary a few words at a time on a timer, as
+a streaming LLM would, and a fake text-to-speech engine takes a fixed
+time per word. The whole-response path waits for the complete summary
+before speaking; the streaming path speaks each sentence as soon as it is
+complete while the rest is still being generated.
+
+Run from the project root:
+    python -m benchmarks.bench_streaming_speech
+"""
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from components.audio_handler import AudioHandler
+from components.disk_cache import DiskCache
+from features.summarizer import GeminiSummarizer
+
+SUMMARY = ("Python is a high-level, general-purpose programming language. "
+           "Its design philosophy emphasizes code readability with the use of significant indentation. "
+           "Python is dynamically typed and garbage-collected. "
+           "It supports multiple programming paradigms, including structured, object-oriented "
+           "and functional programming.")
+WORDS_PER_CHUNK = 4
+CHUNK_INTERVAL = 0.08  # Seconds between streamed chunks
+SECONDS_PER_WORD = 0.02  # Fake speech time
+
+
+def fake_response(text):
+    part = SimpleNamespace(text=text)
+    return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+
+class FakeStreamingModel:
+    """Stands in for genai.GenerativeModel, emitting chunks on a timer"""
+
+    def __init__(self, text):
+        words = text.split(' ')
+        self.chunks = [' '.join(words[i:i + WORDS_PER_CHUNK]) + ' '
+                       for i in range(0, len(words), WORDS_PER_CHUNK)]
+
+    def _stream(self):
+        for chunk in self.chunks:
+            time.sleep(CHUNK_INTERVAL)
+            yield fake_response(chunk)
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        if stream:
+            return self._stream()
+        time.sleep(CHUNK_INTERVAL * len(self.chunks))
+        return fake_response(''.join(self.chunks))
+
+
+class FakeEngine:
+    """Stands in for the pyttsx3 engine and records when speech starts"""
+
+    def __init__(self):
+        self.queued = []
+        self.first_audio = None
+
+    def say(self, text):
+        self.queued.append(text)
+
+    def runAndWait(self):
+        if self.first_audio is None:
+            self.first_audio = time.perf_counter()
+        for text in self.queued:
+            time.sleep(SECONDS_PER_WORD * len(text.split()))
+        self.queued = []
+
+
+def run(speak):
+    engine = FakeEngine()
+    # No microphone or real voice: only the speaking methods are used
+    handler = AudioHandler.__new__(AudioHandler)
+    handler.tts_engine = engine
+    start = time.perf_counter()
+    speak(handler)
+    return engine.first_audio - start, time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        summarizer = GeminiSummarizer(disk_cache=DiskCache(Path(directory) / "cache.sqlite3"))
+        summarizer.model = FakeStreamingModel(SUMMARY)
+
+        whole = run(lambda handler: handler.speak(
+            summarizer.summarize("python", use_cache=False)))
+        streamed = run(lambda handler: handler.speak_stream(
+            summarizer.summarize_stream("python", use_cache=False)))
+        summarizer.cache.disk_cache.close()
+
+    print(f"Generation: {len(summarizer.model.chunks)} chunks, {CHUNK_INTERVAL * 1000:.0f} ms apart")
+    print(f"Whole response:     first audio after {whole[0]:.2f}s, done after {whole[1]:.2f}s")
+    print(f"Streamed sentences: first audio after {streamed[0]:.2f}s, done after {streamed[1]:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import re
+import time
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+UTTERANCES_FILE = FIXTURES_DIR / "utterances.txt"
+
+
+def load_utterances(path=UTTERANCES_FILE):
+    """Load one utterance per line, skipping blanks"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def simple_tokens(text):
+    """Lowercase alphabetic tokens, used where NLTK data may be unavailable"""
+    return re.findall(r'[a-z]+', text.lower())
+
+
+def time_per_call(func, inputs, repeat=5):
+    """Return the best mean seconds per input over several runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in inputs:
+            func(item)
+        elapsed = (time.perf_counter() - start) / len(inputs)
+        best = min(best, elapsed)
+    return best
+
+
+def format_us(seconds):
+    return f"{seconds * 1e6:,.1f} us"
@@ -1,6 +1,9 @@
+import threading
+from queue import Queue
 import speech_recognition as sr
 import pyttsx3
 from components.config import SPEECH_RATE, SPEECH_VOLUME
+from components.text_splitter import SentenceStream
 
 class AudioHandler:
     def __init__(self):
@@ -25,10 +28,40 @@ class AudioHandler:
         self.tts_engine.setProperty('volume', SPEECH_VOLUME)
     
     def speak(self, text):
+        # Streamed responses (e.g. a summary still being generated) are spoken as they arrive
+        if isinstance(text, SentenceStream):
+            return self.speak_stream(text)
         print(f"NexusAI: {text}")
         self.tts_engine.say(text)
         self.tts_engine.runAndWait()
     
+    def speak_stream(self, sentences):
+        """Speak sentences as they arrive; returns everything that was said.
+
+        The source (e.g. a streaming summary) is read on a background thread,
+        so later sentences keep generating while earlier ones are spoken.
+        """
+        queue = Queue()
+
+        def produce():
+            try:
+                for sentence in sentences:
+                    queue.put(sentence)
+            except Exception as e:
+                print(f"Error while streaming speech: {e}")
+            finally:
+                queue.put(None)
+
+        threading.Thread(target=produce, daemon=True).start()
+        spoken = []
+        while True:
+            sentence = queue.get()
+            if sentence is None:
+                break
+            self.speak(sentence)
+            spoken.append(sentence)
+        return ' '.join(spoken)
+
     def listen(self):
         try:
             with self.microphone as source:
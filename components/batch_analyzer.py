@@ -0,0 +1,147 @@
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from components.config import ANALYSIS_STAGES
+
+# NLPProcessor used by each pool worker
+_worker_processor = None
+
+
+def _init_worker(nlp_processor=None):
+    global _worker_processor
+    if nlp_processor is None:
+        from components.nlp_processor import NLPProcessor
+        nlp_processor = NLPProcessor()
+    _worker_processor = nlp_processor
+
+
+def _analyze_chunk(texts, wake_word):
+    return [analyze_one(_worker_processor, text, wake_word) for text in texts]
+
+
+def analyze_one(nlp_processor, text, wake_word=None):
+    """Run intent, entity and sentiment analysis the way process_command does"""
+    command = text.lower()
+    if wake_word and wake_word in command:
+        command = command.replace(wake_word, "").strip()
+
+    utterance = nlp_processor.analyze(command)
+    intent = nlp_processor.classify_intent(utterance)
+    # Every stage, whatever the intent: the batch is an audit, not a reply
+    params = nlp_processor.extract_parameters(utterance, intent, ANALYSIS_STAGES)
+    return {
+        'text': text,
+        'intent': intent,
+        'params': params,
+        'sentiment': nlp_processor.analyze_sentiment(utterance)
+    }
+
+
+def read_utterances(source):
+    """Yield utterances from an iterable or a file.
+
+    Files may be a conversation_history.json dump, JSON lines, or plain
+    text with one utterance per line. Records are dicts with 'user_input'
+    or plain strings.
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.suffix == '.json':
+                records = json.load(f)
+            elif path.suffix == '.jsonl':
+                records = (json.loads(line) for line in f if line.strip())
+            else:
+                records = (line.rstrip('\n') for line in f)
+            yield from _texts(records)
+    else:
+        yield from _texts(source)
+
+
+def _texts(records):
+    for record in records:
+        text = record.get('user_input', '') if isinstance(record, dict) else record
+        if text and text.strip():
+            yield text
+
+
+class BatchReport:
+    """Progress and throughput of an analyze_batch run"""
+
+    def __init__(self):
+        self.utterances = 0
+        self.chunks = 0
+        self.processes = 0
+        self.started = None
+        self.finished = None
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def throughput(self):
+        """Utterances per second"""
+        return self.utterances / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f"Analyzed {self.utterances} utterances in {self.elapsed:.2f}s "
+                f"({self.throughput:.1f} utterances/sec, {self.processes} process(es))")
+
+
+def analyze_batch(nlp_processor, source, chunk_size, processes=None, wake_word=None, report=None):
+    """Yield analysis results for every utterance in source, in input order.
+
+    Chunks of chunk_size utterances run on a pool of processes (all cores
+    by default); at most two chunks per worker are in flight, so large logs
+    are streamed rather than loaded up front.
+    """
+    report = report if report is not None else BatchReport()
+    processes = processes or os.cpu_count() or 1
+    report.processes = processes
+    report.started = time.perf_counter()
+    utterances = read_utterances(source)
+
+    try:
+        if processes == 1:
+            for text in utterances:
+                yield analyze_one(nlp_processor, text, wake_word)
+                report.utterances += 1
+            return
+
+        # Forked workers can share the parent's models once they are loaded;
+        # other start methods build their own processor in each worker
+        context = multiprocessing.get_context()
+        if context.get_start_method() == 'fork':
+            analyze_one(nlp_processor, "warm up", wake_word)
+            initargs = (nlp_processor,)
+        else:
+            initargs = ()
+
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context,
+                                 initializer=_init_worker, initargs=initargs) as pool:
+            pending = deque()
+            chunks = iter(lambda: list(islice(utterances, chunk_size)), [])
+            for chunk in islice(chunks, processes * 2):
+                pending.append(pool.submit(_analyze_chunk, chunk, wake_word))
+
+            while pending:
+                results = pending.popleft().result()
+                next_chunk = next(chunks, None)
+                if next_chunk:
+                    pending.append(pool.submit(_analyze_chunk, next_chunk, wake_word))
+
+                report.chunks += 1
+                for result in results:
+                    yield result
+                    report.utterances += 1
+    finally:
+        report.finished = time.perf_counter()
@@ -0,0 +1,99 @@
+import copy
+import threading
+from collections import Counter, OrderedDict
+from components.config import COMMAND_CACHE_SIZE
+
+
+class CommandCache:
+    """Exact-match cache from normalized commands to their resolved analysis.
+
+    Entries hold the intent, parameters, sentiment and lemmas the NLP
+    pipeline produced, so a repeated command can skip it entirely. When
+    full, the least frequently used command is evicted (least recently used
+    among equals); use counts can be seeded from past conversations so the
+    usual commands are not pushed out by one-offs. Entries are tied to the
+    intent patterns version they were resolved with and dropped when it
+    changes. Safe to fill from a background thread.
+    """
+
+    def __init__(self, capacity=COMMAND_CACHE_SIZE):
+        self.capacity = capacity
+        self.entries = OrderedDict()  # least recently used first
+        self.uses = Counter()
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, command):
+        return self.key(command) in self.entries
+
+    @staticmethod
+    def key(command):
+        # Punctuation is kept: "5!" is a factorial and "!" changes sentiment
+        return ' '.join(command.lower().split())
+
+    def seed(self, commands):
+        """Count commands seen before, e.g. from conversation history"""
+        with self._lock:
+            for command in commands:
+                key = self.key(command)
+                if key:
+                    self.uses[key] += 1
+            self._trim_uses()
+
+    def most_used(self, n):
+        """The n commands used most often"""
+        with self._lock:
+            return [key for key, count in self.uses.most_common(n)]
+
+    def _check_version(self, version):
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+
+    def _trim_uses(self):
+        # Keep counts for a few times more commands than are cached
+        if len(self.uses) > self.capacity * 8:
+            self.uses = Counter(dict(self.uses.most_common(self.capacity * 4)))
+
+    def get(self, command, version):
+        """Return a copy of the cached entry for command, or None"""
+        with self._lock:
+            self._check_version(version)
+            key = self.key(command)
+            self.uses[key] += 1
+            self._trim_uses()
+
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return copy.deepcopy(entry)
+
+    def put(self, command, entry, version):
+        with self._lock:
+            self._check_version(version)
+            key = self.key(command)
+            if key not in self.entries and len(self.entries) >= self.capacity:
+                # min() keeps the first of equal counts, i.e. the least recently used
+                victim = min(self.entries, key=lambda cached: self.uses[cached])
+                del self.entries[victim]
+            self.entries[key] = copy.deepcopy(entry)
+            self.entries.move_to_end(key)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -1,32 +1,108 @@
 import datetime
 import wikipedia
 import webbrowser
-import requests
 import random
-import re
-import math
+import threading
+import time
 import winsound
-from components.config import WEBSITES, JOKES, APPS
+from concurrent.futures import ThreadPoolExecutor
+from components.config import (WEBSITES, JOKES, APPS, INTENT_DESCRIPTIONS, INTENT_CLARIFY_MARGIN,
+                               PREFETCH_INTENTS, PREFETCH_WORKERS, PREFETCH_DEBOUNCE, UI_FALLBACK_ACTIONS,
+                               WEATHER_GEOCODE_URL, WEATHER_URL, GEOCODE_CACHE_TTL,
+                               WEATHER_CACHE_TTL, WEATHER_WORKERS, WIKI_FOLLOW_UP_SENTENCES,
+                               LOOKUP_MODE, LOOKUP_HEDGE_DELAY, LOOKUP_DEADLINE, LOOKUP_WORKERS,
+                               COMMAND_CACHE_PRELOAD)
 from features.appLauncher import WindowsAppLauncher
 from features.reminder_sys import ReminderSystem
 from features.summarizer import GeminiSummarizer
 from components.audio_handler import AudioHandler
 from features.ui_controller import UIController
+from components.command_cache import CommandCache
+from components.handler_registry import HandlerRegistry
+from components.http_client import HttpClient
+from components.disk_cache import DiskCache
+from components.wiki_cache import WikiCache
+from components.speculative import race
+from components.scheduler import Scheduler
+from components.math_engine import MathEngine, MathSyntaxError, MathDomainError, format_number
+from components.numbers import normalize_numbers
+from components.text_splitter import SentenceStream
 import os
 from dotenv import load_dotenv
 load_dotenv()
 WAKE_WORD = os.getenv("WAKE_WORD")
 WEATHER_API_KEY = os.getenv("WEATHER_API_KEY")
 
+# UI actions that map straight onto a UIController call: action -> (method, response)
+UI_ACTION_CALLS = {
+    'close_tab': ('close_tab', "Closed the current tab."),
+    'new_tab': ('new_tab', "Opened a new tab."),
+    'close_window': ('close_window', "Closed the window."),
+    'minimize_window': ('minimize_window', "Minimized the window."),
+    'maximize_window': ('maximize_window', "Maximized the window."),
+    'volume_up': ('volume_up', "Increasing volume."),
+    'volume_down': ('volume_down', "Decreasing volume."),
+    'mute': ('mute_volume', "Muted volume."),
+    'pause_play': ('pause_play', "Toggled pause/play."),
+    'play': ('play_media', "Playing media."),
+    'pause': ('pause_media', "Pausing media."),
+    'next_track': ('next_track', "Skipping to next track."),
+    'previous_track': ('previous_track', "Going to previous track."),
+    'copy': ('copy_to_clipboard', "Copied to clipboard."),
+    'paste': ('paste_from_clipboard', "Pasted from clipboard."),
+    'select_all': ('select_all', "Selected all text."),
+    'undo': ('undo', "Undone last action."),
+    'redo': ('redo', "Redone last action."),
+    'alt_tab': ('alt_tab', "Switching applications."),
+    'refresh': ('refresh_page', "Refreshed page."),
+    'go_back': ('go_back', "Going back."),
+    'go_forward': ('go_forward', "Going forward.")
+}
+
 class CommandProcessor:
     def __init__(self, nlp_processor, data_manager):
         self.nlp_processor = nlp_processor
         self.data_manager = data_manager
         self.app_launcher = WindowsAppLauncher()
         self.reminder_system = ReminderSystem()
-        self.summarizer = GeminiSummarizer()
         self.audio_handler = AudioHandler()
         self.ui_controller = UIController()
+        # Shared keep-alive HTTP client for every outbound call
+        self.http = HttpClient()
+        # The wikipedia package calls requests.get directly; route it through the client.
+        # Deliberate and process-wide: it replaces the module's requests reference, and
+        # only relies on HttpClient.get accepting requests.get's arguments
+        wikipedia.wikipedia.requests = self.http
+        # Geocoding, weather, Wikipedia and summarizer results, kept on disk between sessions
+        self.disk_cache = DiskCache()
+        self.summarizer = GeminiSummarizer(disk_cache=self.disk_cache)
+        # Wikipedia introductions, read out a sentence at a time
+        self.wiki = WikiCache(self.disk_cache)
+        # Local arithmetic; the summarizer is only asked about what it cannot parse
+        self.math_engine = MathEngine()
+        # Analysis of the most recent command, kept for per-stage timing
+        self.last_utterance = None
+        # Resolved analysis of repeated commands
+        self.command_cache = CommandCache()
+
+        # Lookups started from partial transcripts, keyed by what they fetch
+        self.prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS)
+        self.prefetches = {}
+        self.prefetch_keys = {}  # Latest prefetch key per intent
+        self.prefetch_lock = threading.Lock()
+        # Debounces partial transcripts, so only words that stand start a lookup
+        self.prefetch_timer = Scheduler(name="prefetch")
+        self.intent_tracker = self.nlp_processor.track_intent(self.on_likely_intent)
+        # Per-city lookups of multi-city weather questions
+        self.weather_pool = ThreadPoolExecutor(max_workers=WEATHER_WORKERS)
+        # Knowledge lookups raced against each other
+        self.lookup_pool = ThreadPoolExecutor(max_workers=LOOKUP_WORKERS)
+        # After the pools exist: the most used commands are resolved on the prefetch pool
+        self.seed_from_history()
+
+        # Handlers for each intent (and UI action), dispatched by dict lookup
+        self.handlers = HandlerRegistry()
+        self.register_handlers()
 
         if self.audio_handler:
             self.reminder_system.set_reminder_callback(
@@ -41,6 +117,272 @@ class CommandProcessor:
             # Use your existing audio handler to speak the reminder
             self.audio_handler.speak(reminder_message)
 
+    def register_handlers(self):
+        register = self.handlers.register
+        register('time', lambda command, params: self.get_current_time())
+        register('date', lambda command, params: self.get_current_date())
+        register('search', self.handle_search, needs_network=True, blocking=True,
+                 expected_latency=1.5)
+        register('compose', self.handle_compose, expected_latency=0.5)
+        register('open', lambda command, params: self.open_app_or_site(params.get('target', 'google')),
+                 expected_latency=0.5)
+        register('weather', self.handle_weather, needs_network=True, blocking=True,
+                 expected_latency=1.0)
+        register('joke', lambda command, params: self.tell_joke())
+        register('math', self.handle_math, expected_latency=0.05)
+        register('reminder', self.process_reminder_command, expected_latency=0.05)
+
+        # UI actions; anything without its own handler goes to handle_ui_fallback
+        register('ui_control', self.handle_ui_fallback, expected_latency=0.1)
+        register('ui_control', self.handle_switch_tab, action='switch_tab', expected_latency=0.1)
+        register('ui_control', lambda command, params: self.ui_controller.screenshot(),
+                 action='screenshot', blocking=True, expected_latency=0.5)
+        register('ui_control', self.handle_type_text, action='type_text', expected_latency=0.2)
+        for action, (method, response) in UI_ACTION_CALLS.items():
+            register('ui_control', self._ui_call(method, response), action=action,
+                     expected_latency=0.1)
+
+    def get_handler_stats(self):
+        return self.handlers.stats()
+
+    def get_network_stats(self):
+        return self.http.stats()
+
+    def get_disk_cache_stats(self):
+        return self.disk_cache.stats()
+
+    def get_summarizer_cache_stats(self):
+        return self.summarizer.get_cache_stats()
+
+    def _ui_call(self, method, response):
+        def handle(command, params):
+            getattr(self.ui_controller, method)()
+            return response
+        return handle
+
+    def handle_search(self, command, params):
+        query = params.get('query', 'general information')
+        entities = params.get('entities', {})
+        print(f"Searching for {query}...")
+        return self.smart_search(query, entities)
+
+    def handle_compose(self, command, params):
+        webbrowser.open("https://mail.google.com/mail/?view=cm&fs=1&tf=1")
+        return "Opening browser to compose an email."
+
+    def handle_weather(self, command, params):
+        cities = self.weather_cities(params)
+        return self.use_prefetched(('weather', cities),
+                                   lambda: self.get_weather_for_cities(cities))
+
+    def handle_math(self, command, params):
+        if 'expression' in params:
+            return self.calculate_expression(params['expression'])
+        return "Please provide a mathematical expression to calculate."
+
+    def handle_switch_tab(self, command, params):
+        direction = params.get('direction', '')
+        if direction in ['previous', 'prev', 'left', 'back']:
+            self.ui_controller.switch_tab('previous')
+            return "Switching to the previous tab."
+        # Default to next if direction is unclear
+        self.ui_controller.switch_tab('next')
+        return "Switching to the next tab."
+
+    def handle_type_text(self, command, params):
+        text = params.get('text', '')
+        if text:
+            self.ui_controller.type_text(text)
+            return f"Typing: '{text}'"
+        return "Please specify what text you want me to type."
+
+    def handle_ui_fallback(self, command, params):
+        """Determine the UI action from the command when no UI_ACTION entity was found"""
+        command_lower = command.lower()
+        for action, phrases in UI_FALLBACK_ACTIONS:
+            if any(phrase in command_lower for phrase in phrases):
+                break
+        else:
+            return "I couldn't understand what UI action you want me to perform. Try commands like 'next tab', 'close window', 'volume up', 'pause', 'play', 'take screenshot', or 'type hello world'."
+
+        params = dict(params)
+        if action == 'switch_tab':
+            params['direction'] = 'next' if 'next' in command_lower or 'right' in command_lower else 'previous'
+        elif action == 'pause_play':
+            if 'pause' in command_lower and 'play' not in command_lower:
+                action = 'pause'
+            elif 'play' in command_lower and 'pause' not in command_lower:
+                action = 'play'
+        elif action == 'type_text':
+            # Extract text to type from the command
+            for phrase in ['type ', 'write ', 'input ']:
+                if phrase in command_lower:
+                    params['text'] = command_lower.split(phrase, 1)[1].strip()
+                    break
+        return self.handlers.find('ui_control', action)(command, params)
+
+    def normalize_command(self, command):
+        command = command.lower()
+        # Remove wake word if present
+        if WAKE_WORD and WAKE_WORD.lower() in command:
+            command = command.replace(WAKE_WORD.lower(), "").strip()
+        return command
+
+    def seed_from_history(self):
+        """Feed recognised commands from past sessions into the fuzzy suggestions and command cache"""
+        commands = []
+        for item in self.data_manager.conversation_history:
+            command = self.normalize_command(item.get('user_input', ''))
+            # History saved before intents were recorded: score it with the intent index
+            intent = item.get('intent') or self.keyword_intent(command)
+            if command and intent != 'unknown':
+                commands.append(command)
+        for command in commands:
+            self.nlp_processor.learn_phrase(command)
+        self.command_cache.seed(commands)
+        self.prefetch_pool.submit(self.preload_commands,
+                                  self.command_cache.most_used(COMMAND_CACHE_PRELOAD))
+
+    def keyword_intent(self, command):
+        """Best intent by keyword score alone, without lemmatizing; 'unknown' if none"""
+        text = command.lower()
+        scores = self.nlp_processor.intent_index.score(text, text.split())
+        best = max(scores, key=scores.get, default=None)
+        return best if best is not None and scores[best] > 0 else 'unknown'
+
+    def preload_commands(self, commands):
+        """Resolve commands into the command cache before they are next said"""
+        for command in commands:
+            if command in self.command_cache:
+                continue
+            try:
+                self.analyze_command(command, self.nlp_processor.patterns_version)
+            except Exception as e:
+                print(f"Preloading '{command}' failed: {e}")
+
+    def reload_patterns(self):
+        """Pick up changes to INTENT_PATTERNS; cached commands are dropped"""
+        self.nlp_processor.reload_patterns()
+        self.intent_tracker = self.nlp_processor.track_intent(self.on_likely_intent)
+
+    def get_cache_stats(self):
+        return self.command_cache.stats()
+
+    def resolve_command(self, command):
+        """Return (utterance, intent, params, sentiment, clarification) for a command.
+
+        Repeated commands come from the command cache without running any
+        NLP stage; others go through the full pipeline and are cached.
+        """
+        version = self.nlp_processor.patterns_version
+        cached = self.command_cache.get(command, version)
+        if cached is not None:
+            utterance = self.nlp_processor.analyze(command)
+            utterance.prime('lemmas', cached['lemmas'])
+            return utterance, cached['intent'], cached['params'], cached['sentiment'], None
+        return self.analyze_command(command, version)
+
+    def analyze_command(self, command, version):
+        """Run the NLP pipeline on command and cache what it resolves to"""
+        # Analyze the command once and share it across every stage
+        utterance = self.nlp_processor.analyze(command)
+
+        # Classify intent
+        intent = self.nlp_processor.classify_intent(utterance)
+
+        # Ask instead of guessing when intents tie and neither is clearly better
+        intent, clarification = self.resolve_intent_tie(utterance, intent)
+        if clarification:
+            return utterance, intent, {}, 'neutral', clarification
+
+        # Analyze sentiment only when this intent's response uses it
+        if 'sentiment' in self.nlp_processor.stage_plan(intent):
+            sentiment = self.nlp_processor.analyze_sentiment(utterance)
+        else:
+            sentiment = 'neutral'
+
+        params = self.nlp_processor.extract_parameters(utterance, intent)
+
+        if intent != 'unknown':
+            self.command_cache.put(command, {
+                'intent': intent,
+                'params': params,
+                'sentiment': sentiment,
+                'lemmas': utterance.lemmas
+            }, version)
+        return utterance, intent, params, sentiment, None
+
+    def feed_partial(self, partial):
+        """Follow a partial transcript while the user is still speaking"""
+        if not self.intent_tracker.text:
+            # First words of a new utterance; earlier lookups went unused
+            self.discard_prefetches()
+        command = self.normalize_command(partial)
+        self.intent_tracker.update(command)
+
+        # Keep the lookup in step with the words heard so far, once they have
+        # stood for PREFETCH_DEBOUNCE; each partial replaces the pending one
+        intent = self.intent_tracker.likely_intent
+        if intent in PREFETCH_INTENTS:
+            self.prefetch_timer.schedule(
+                'partial', time.time() + PREFETCH_DEBOUNCE,
+                lambda: self.prefetch_pool.submit(self._prefetch_for, intent, command))
+
+    def on_likely_intent(self, event):
+        """Warm up the summarizer as soon as partial transcripts settle on a lookup"""
+        if event.intent in ('search', 'question'):
+            self.prefetch_pool.submit(self.summarizer.warm_up)
+
+    def _prefetch_for(self, intent, command):
+        try:
+            params = self.nlp_processor.extract_parameters(command, intent)
+            if intent == 'weather':
+                cities = self.weather_cities(params)
+                if all(cities):
+                    self.prefetch(intent, ('weather', cities),
+                                  lambda: self.get_weather_for_cities(cities))
+            else:
+                query = self.search_query_for(intent, command, params)
+                if query:
+                    # Never race here: a guess at the query is not worth an LLM call
+                    self.prefetch(intent, ('search', query),
+                                  lambda: self.search_for(query, speculative=False))
+        except Exception as e:
+            print(f"Prefetch failed: {e}")
+
+    def prefetch(self, intent, key, compute):
+        """Start a lookup for intent, replacing its previous one if the key moved on"""
+        with self.prefetch_lock:
+            previous = self.prefetch_keys.get(intent)
+            if previous == key and key in self.prefetches:
+                return
+            if previous is not None:
+                # Superseded: cancel it if it has not started, and never use it
+                future = self.prefetches.pop(previous, None)
+                if future is not None:
+                    future.cancel()
+            self.prefetch_keys[intent] = key
+            self.prefetches[key] = self.prefetch_pool.submit(compute)
+
+    def use_prefetched(self, key, compute):
+        """Return the result of a matching prefetch, or compute it now"""
+        with self.prefetch_lock:
+            future = self.prefetches.pop(key, None)
+        if future is not None and not future.cancelled():
+            try:
+                return future.result()
+            except Exception as e:
+                print(f"Prefetch failed: {e}")
+        return compute()
+
+    def discard_prefetches(self):
+        self.prefetch_timer.cancel('partial')
+        with self.prefetch_lock:
+            for future in self.prefetches.values():
+                future.cancel()
+            self.prefetches.clear()
+            self.prefetch_keys.clear()
+
     def get_current_time(self):
         now = datetime.datetime.now()
         time_str = now.strftime("%I:%M %p")
@@ -51,25 +393,44 @@ class CommandProcessor:
         date_str = today.strftime("%B %d, %Y")
         return f"Today is {date_str}"
 
-    def search_for(self, query):
+    def search_for(self, query, speculative=True, stream=False):
+        cached = self.wiki.cached(query)
+        if cached is None and speculative and LOOKUP_MODE in ('hedged', 'speculative'):
+            return self.race_lookup(query)
         try:
-            # Get summary from Wikipedia
-            result = wikipedia.summary(query, sentences=1)
-            return result
-        except wikipedia.exceptions.DisambiguationError as e:
-            # If there are multiple results, pick the first one
-            try:
-                result = wikipedia.summary(e.options[0], sentences=1)
-                return result
-            except:
-                return "I am not able to find anything on wikepedia on that topic."
+            # First sentence of the Wikipedia introduction; the rest is kept for follow-ups
+            title, sentences = cached or self.wiki.lookup(query)
+            if sentences:
+                return sentences[0]
+            return "I am not able to find anything on wikepedia on that topic."
+        except wikipedia.exceptions.DisambiguationError:
+            return "I am not able to find anything on wikepedia on that topic."
         except Exception as e:
+            if stream:
+                # Speak the summary while it is still being generated
+                return SentenceStream(self.summarizer.summarize_stream(query),
+                                      "I couldn't find specific information about that topic.")
             result = self.summarizer.summarize(query)
             if result:
                 return result
             else:
                 return "I couldn't find specific information about that topic."
 
+    def wikipedia_answer(self, query):
+        title, sentences = self.wiki.lookup(query)
+        return sentences[0] if sentences else None
+
+    def race_lookup(self, query):
+        """Ask Wikipedia, and the summarizer as a hedge; Wikipedia wins if it answers in time"""
+        delay = LOOKUP_HEDGE_DELAY if LOOKUP_MODE == 'hedged' else 0
+        source, answer = race(self.lookup_pool, [
+            ('wikipedia', lambda: self.wikipedia_answer(query)),
+            ('summarizer', lambda: self.summarizer.summarize(query), delay)
+        ], LOOKUP_DEADLINE)
+        if answer is None:
+            return "I couldn't find specific information about that topic."
+        return answer
+
     def open_app_or_site(self, name):
         if name in WEBSITES:
             webbrowser.open(WEBSITES[name])
@@ -86,46 +447,75 @@ class CommandProcessor:
 
     def get_lat_lon(self, city):
         """Get latitude and longitude for a city"""
-        url = f"http://api.openweathermap.org/geo/1.0/direct?q={city}&appid={WEATHER_API_KEY}"
+        cached = self.disk_cache.get('geocode', city)
+        if cached is not None:
+            return tuple(cached)
         try:
-            response = requests.get(url)
+            response = self.http.get(
+                WEATHER_GEOCODE_URL, params={'q': city, 'appid': WEATHER_API_KEY})
             data = response.json()
             if data and len(data) > 0:
                 # Return the first match (most relevant)
-                return data[0]['lat'], data[0]['lon']
+                coords = data[0]['lat'], data[0]['lon']
+                self.disk_cache.set('geocode', city, coords, GEOCODE_CACHE_TTL)
+                return coords
             else:
                 return None, None
         except Exception as e:
             print("Error in get_lat_lon: ", e)
             return None, None
 
-    def get_weather(self, city=None):
-        """Get weather information for a city"""
-        if not city:
-            return "Please tell me which city you want the weather for."
+    def fetch_weather(self, city):
+        """Fetch the current weather data for a city; returns a message string on failure"""
+        # Get coordinates
+        coords = self.get_lat_lon(city)
 
-        try:
-            # Get coordinates
-            coords = self.get_lat_lon(city)
+        # Check if coordinates were successfully retrieved
+        if coords is None or coords == (None, None):
+            return f"I couldn't find the location '{city}'. Please check the city name and try again."
+
+        lat, lon = coords
+
+        # Check if lat and lon are valid
+        if lat is None or lon is None:
+            return f"I couldn't find the location '{city}'. Please check the city name and try again."
 
-            # Check if coordinates were successfully retrieved
-            if coords is None or coords == (None, None):
-                return f"I couldn't find the location '{city}'. Please check the city name and try again."
+        # Get weather data
+        res = self.http.get(
+            WEATHER_URL, params={'lat': lat, 'lon': lon, 'appid': WEATHER_API_KEY})
 
-            lat, lon = coords
+        if res.status_code != 200:
+            return "I had trouble retrieving the weather data. Please try again later."
 
-            # Check if lat and lon are valid
-            if lat is None or lon is None:
-                return f"I couldn't find the location '{city}'. Please check the city name and try again."
+        data = res.json()
+        self.disk_cache.set('weather', city, data, WEATHER_CACHE_TTL)
+        return data
 
-            # Get weather data
-            url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={WEATHER_API_KEY}"
-            res = requests.get(url)
+    def weather_cities(self, params):
+        """The cities a weather request asks about, as a tuple"""
+        if params.get('cities'):
+            return tuple(params['cities'])
+        return (params.get('city', params.get('location', None)),)
 
-            if res.status_code != 200:
-                return "I had trouble retrieving the weather data. Please try again later."
+    def get_weather_for_cities(self, cities):
+        """Weather for one or more cities, fetched concurrently and read out together"""
+        if len(cities) == 1:
+            return self.get_weather(cities[0])
+        # Takes about as long as the slowest city; reports keep the order asked in
+        return ' '.join(self.weather_pool.map(self.get_weather, cities))
 
-            data = res.json()
+    def get_weather(self, city=None):
+        """Get weather information for a city"""
+        if not city:
+            return "Please tell me which city you want the weather for."
+
+        try:
+            # A recent reading for the same city needs no network at all
+            data = self.disk_cache.get('weather', city)
+            if data is None:
+                data = self.fetch_weather(city)
+            if isinstance(data, str):
+                return data
 
             # Extract weather details
             temp = data["main"]["temp"]
@@ -152,151 +542,19 @@ class CommandProcessor:
 
     def calculate_expression(self, expression):
         try:
-            # Convert spoken words to mathematical symbols
-            word_to_symbol = {
-                'plus': '+', 'add': '+', 'added to': '+', 'and': '+',
-                'minus': '-', 'subtract': '-', 'subtracted from': '-', 'take away': '-',
-                'times': '*', 'multiply': '*', 'multiplied by': '*', 'into': '*',
-                'divide': '/', 'divided by': '/', 'over': '/',
-                'power': '**', 'to the power of': '**', 'raised to': '**', 'squared': '**2',
-                'cubed': '**3', 'square root': 'sqrt', 'percent': '/100',
-                'point': '.', 'decimal': '.', 'factorial': '!', 'factorial of': '!'
-            }
-
-            # Convert number words to digits
-            number_words = {
-                'zero': '0', 'one': '1', 'two': '2', 'three': '3', 'four': '4',
-                'five': '5', 'six': '6', 'seven': '7', 'eight': '8', 'nine': '9',
-                'ten': '10', 'eleven': '11', 'twelve': '12', 'thirteen': '13',
-                'fourteen': '14', 'fifteen': '15', 'sixteen': '16', 'seventeen': '17',
-                'eighteen': '18', 'nineteen': '19', 'twenty': '20', 'thirty': '30',
-                'forty': '40', 'fifty': '50', 'sixty': '60', 'seventy': '70',
-                'eighty': '80', 'ninety': '90', 'hundred': '100', 'thousand': '1000'
-            }
-
-            # Clean and normalize the expression
-            expression = expression.lower().strip()
-
-            # Replace word numbers with digits
-            for word, digit in number_words.items():
-                expression = expression.replace(word, digit)
-
-            # Replace mathematical word operators with symbols
-            for word, symbol in word_to_symbol.items():
-                expression = expression.replace(word, symbol)
-
-            # Handle special cases
-            # 'x' often used for multiplication
-            expression = expression.replace('x', '*')
-            expression = expression.replace('÷', '/')  # division symbol
-
-            # Remove common filler words
-            filler_words = ['what', 'is', 'equals', 'equal',
-                            'to', 'the', 'result', 'of', 'calculate']
-            for word in filler_words:
-                expression = expression.replace(word, '')
-
-            # Clean up extra spaces
-            expression = ' '.join(expression.split())
-
-            # Handle factorial expressions
-            if '!' in expression:
-                return self._calculate_factorial_expression(expression)
-
-            # Remove any remaining non-mathematical characters (but keep spaces, decimals, and basic operators)
-            import re
-            safe_expr = re.sub(r'[^0-9+\-*/().\s]', '', expression)
-            safe_expr = safe_expr.strip()
-
-            # Check if we have a valid expression
-            if not safe_expr or not any(char.isdigit() for char in safe_expr):
-                raise ValueError("No valid mathematical expression found")
-
-            # Handle simple cases where there might be missing operators
-            # e.g., "5 5" should be "5 * 5" or "5 + 5" - we'll assume multiplication
-            parts = safe_expr.split()
-            if len(parts) == 2 and all(part.replace('.', '').isdigit() for part in parts):
-                safe_expr = f"{parts[0]} * {parts[1]}"
-
-            # Handle square root
-            if 'sqrt' in expression:
-                safe_expr = self._handle_sqrt(safe_expr)
-
-            # Evaluate the expression
-            result = eval(safe_expr)
-
-            # Format the result nicely
-            if isinstance(result, float):
-                if result.is_integer():
-                    result = int(result)
-                else:
-                    result = round(result, 6)  # Round to 6 decimal places
-
-            return f"The answer is {result}"
-
-        except:
-            # If conversion fails, try the summarizer as fallback
-            return self.summarizer.calculate(expression)
-
-    def _calculate_factorial_expression(self, expression):
-        try:
-            # Find all factorial patterns like "5!" or "number!"
-            factorial_pattern = r'(\d+)!'
-
-            # Replace all factorials with their calculated values
-            def replace_factorial(match):
-                num = int(match.group(1))
-                if num < 0:
-                    raise ValueError(
-                        "Factorial is not defined for negative numbers")
-                if num > 170:  # Prevent overflow
-                    raise ValueError(
-                        "Number too large for factorial calculation")
-                return str(math.factorial(num))
-
-            # Replace factorials in the expression
-            processed_expr = re.sub(
-                factorial_pattern, replace_factorial, expression)
-
-            # Now evaluate the rest of the expression normally
-            safe_expr = re.sub(r'[^0-9+\-*/().\s]', '', processed_expr)
-            safe_expr = safe_expr.strip()
-
-            if safe_expr:
-                result = eval(safe_expr)
-            else:
-                # If it's just a single factorial
-                factorial_match = re.search(r'(\d+)!', expression)
-                if factorial_match:
-                    num = int(factorial_match.group(1))
-                    result = math.factorial(num)
-                else:
-                    raise ValueError("Invalid factorial expression")
-
-            # Format the result
-            if isinstance(result, float) and result.is_integer():
-                result = int(result)
-
-            return f"The answer is {result}"
-
-        except ValueError as e:
+            result = self.math_engine.evaluate(expression)
+        except MathDomainError as e:
             return f"Error: {str(e)}"
-        except Exception:
-            return "I couldn't calculate that factorial expression."
-
-    def _handle_sqrt(self, expression):
-        # This is a simple implementation - you can expand it
-        # For now, it handles basic sqrt cases
-        sqrt_pattern = r'sqrt\((\d+(?:\.\d+)?)\)'
-
-        def replace_sqrt(match):
-            num = float(match.group(1))
-            return str(math.sqrt(num))
-
-        return re.sub(sqrt_pattern, replace_sqrt, expression)
+        except MathSyntaxError:
+            # Not something the local engine understands; try the summarizer as fallback
+            return self.summarizer.calculate(expression)
+        return f"The answer is {format_number(result)}"
 
     def process_reminder_command(self, command, params):
         """Process reminder-related commands using the reminder system"""
+        # Handlers get the command as heard; the reminder system expects it to
+        # start with "remind me", not the wake word
+        command = self.normalize_command(command)
         command_lower = command.lower()
 
         # Handle different reminder command patterns
@@ -319,8 +577,8 @@ class CommandProcessor:
             return self.reminder_system.list_reminders()
 
         elif 'cancel reminder' in command_lower or 'delete reminder' in command_lower:
-            # Extract reminder ID if possible
-            words = command_lower.split()
+            # Extract reminder ID if possible ("cancel reminder five" too)
+            words = normalize_numbers(command_lower).split()
             try:
                 for word in words:
                     if word.isdigit():
@@ -342,8 +600,61 @@ class CommandProcessor:
         """Cleanup method to properly close reminder system"""
         if hasattr(self, 'reminder_system'):
             self.reminder_system.cleanup()
+        if hasattr(self, 'prefetch_timer'):
+            self.prefetch_timer.shutdown(wait=False)
+        if hasattr(self, 'prefetch_pool'):
+            self.prefetch_pool.shutdown(wait=False, cancel_futures=True)
+        if hasattr(self, 'weather_pool'):
+            self.weather_pool.shutdown(wait=False, cancel_futures=True)
+        if hasattr(self, 'lookup_pool'):
+            self.lookup_pool.shutdown(wait=False, cancel_futures=True)
+        if hasattr(self, 'http'):
+            self.http.close()
+        if hasattr(self, 'disk_cache'):
+            self.disk_cache.close()
+
+    def lookup(self, query):
+        # Remember what was looked up so "tell me more" can continue it
+        self.data_manager.context_memory['last_lookup'] = query
+        self.data_manager.context_memory['lookup_position'] = 1
+        return self.use_prefetched(('search', query), lambda: self.search_for(query, stream=True))
+
+    def continue_lookup(self):
+        """The next sentences of the last looked-up topic, served from the cache"""
+        query = self.data_manager.context_memory.get('last_lookup')
+        if not query:
+            return "I don't have the previous search query to continue."
+        if self.wiki.cached(query) is None:
+            # The answer did not come from Wikipedia (e.g. the summarizer's), so
+            # there is no page to read on from
+            return "I don't have more details about that."
+        position = self.data_manager.context_memory.get('lookup_position', 1)
+        try:
+            title, sentences = self.wiki.sentences(query, position, WIKI_FOLLOW_UP_SENTENCES)
+        except Exception as e:
+            print("Error in continue_lookup: ", e)
+            return "I couldn't find more details about that."
+        if not sentences:
+            return f"That's all I have about {title}."
+        self.data_manager.context_memory['lookup_position'] = position + len(sentences)
+        return ' '.join(sentences)
+
+    def search_query_for(self, intent, command, params):
+        """The query a search or question command ends up looking up"""
+        entities = params.get('entities', {})
+        if intent == 'search':
+            return self.build_search_query(params.get('query', 'general information'), entities)
+        if entities or len(command.split()) > 3:
+            # Complex question - try to search for it
+            query = command.replace('what is', '').replace(
+                'who is', '').replace('how', '').strip()
+            return self.build_search_query(query, entities)
+        return command
 
     def smart_search(self, query, entities):
+        return self.lookup(self.build_search_query(query, entities))
+
+    def build_search_query(self, query, entities):
         # If entities are detected, use them to improve search
         if entities:
             # Check if entities contain actual values (not just entity types)
@@ -392,15 +703,10 @@ class CommandProcessor:
                 seen.add(word_lower)
                 cleaned_query.append(word)
 
-        final_query = ' '.join(cleaned_query)
-
-        return self.search_for(final_query)
+        return ' '.join(cleaned_query)
 
     def handle_follow_up(self, text):
-        if 'last_intent' in self.data_manager.context_memory:
-            last_intent = self.data_manager.context_memory['last_intent']
-            last_params = self.data_manager.context_memory.get(
-                'last_params', {})
+        last_intent = self.data_manager.context_memory.get('last_intent')
 
         # Define follow-up trigger words
         follow_up_words = ['more', 'tell me more',
@@ -408,20 +714,38 @@ class CommandProcessor:
 
         # Check if input matches any follow-up pattern
         if any(word in text.lower() for word in follow_up_words):
-            # Handle follow-up for a search
-            if last_intent == 'search':
-                last_query = last_params.get('query', '')
-                if last_query:
-                    extra_info = self.search_for(last_query)
-                    return extra_info, True
-                else:
-                    return "I don't have the previous search query to continue.", True
+            # Handle follow-up for a search (or a question that was looked up)
+            if last_intent in ('search', 'question'):
+                return self.continue_lookup(), True
             else:
                 return "I'm not sure how to provide more details about that.", True
 
         # If no follow-up detected
         return "", False
 
+    def resolve_intent_tie(self, utterance, intent):
+        """Break a keyword-score tie with the vectorized intent confidences.
+
+        Returns the intent to use and, when the confidences are too close to
+        pick one, a question asking the user which they meant.
+        """
+        if intent == 'unknown':
+            return intent, None
+
+        scores = self.nlp_processor.intent_scores(utterance)
+        tied = [name for name, score in scores.items() if score == scores[intent]]
+        if len(tied) < 2:
+            return intent, None
+
+        confidences = dict(self.nlp_processor.rank_intents(utterance, k=len(scores)))
+        tied.sort(key=lambda name: -confidences.get(name, 0.0))
+        best, runner_up = tied[0], tied[1]
+        if confidences.get(best, 0.0) - confidences.get(runner_up, 0.0) < INTENT_CLARIFY_MARGIN:
+            question = (f"Did you mean {INTENT_DESCRIPTIONS.get(best, best)} or "
+                        f"{INTENT_DESCRIPTIONS.get(runner_up, runner_up)}? Please rephrase your request.")
+            return intent, question
+        return best, None
+
     def generate_contextual_response(self, intent, params, sentiment):
         # Adjust response tone based on sentiment
         if sentiment == 'negative':
@@ -440,291 +764,33 @@ class CommandProcessor:
 
     def process_command(self, command):
         original_command = command
-        command = command.lower()
-
-        # Remove wake word if present
-        if WAKE_WORD in command:
-            command = command.replace(WAKE_WORD, "").strip()
+        command = self.normalize_command(command)
+        # The final transcript is in; the next partial starts a new utterance
+        self.intent_tracker.reset()
+        self.prefetch_timer.cancel('partial')
 
         # Check for follow-up questions first
         follow_up_response, is_follow_up = self.handle_follow_up(command)
         if is_follow_up:
             return follow_up_response, False
 
-        # Analyze sentiment and classify intent
-        sentiment = self.nlp_processor.analyze_sentiment(command)
-        intent = self.nlp_processor.classify_intent(command)
-        params = self.nlp_processor.extract_parameters(command, intent)
+        utterance, intent, params, sentiment, clarification = self.resolve_command(command)
+        self.last_utterance = utterance
+        if clarification:
+            return clarification, False
+
+        if intent != 'unknown':
+            self.nlp_processor.learn_phrase(command)
 
         # Generate contextual response prefix
         tone_prefix = self.generate_contextual_response(
             intent, params, sentiment)
 
         # Process based on classified intent
-        if intent == 'time':
-            response = self.get_current_time()
-
-        elif intent == 'date':
-            response = self.get_current_date()
-
-        elif intent == 'search':
-            query = params.get('query', 'general information')
-            entities = params.get('entities', {})
-            print(f"Searching for {query}...")
-            response = self.smart_search(query, entities)
-
-        elif intent == 'compose':
-            webbrowser.open("https://mail.google.com/mail/?view=cm&fs=1&tf=1")
-            response = "Opening browser to compose an email."
-
-        elif intent == 'open':
-            target = params.get('target', 'google')
-            response = self.open_app_or_site(target)
-
-        elif intent == 'weather':
-            city = params.get('city', params.get('location', None))
+        handler = self.handlers.find(intent, params.get('action'))
+        if handler is not None:
+            response = handler(original_command, params)
 
-            response = self.get_weather(city)
-
-        elif intent == 'joke':
-            response = self.tell_joke()
-
-        elif intent == 'math':
-            if 'expression' in params:
-                response = self.calculate_expression(params['expression'])
-            else:
-                response = "Please provide a mathematical expression to calculate."
-
-        elif intent == 'ui_control':
-            action = params.get('action', '')
-            direction = params.get('direction', '')
-            
-            if action == 'switch_tab':
-                if direction in ['next', 'right']:
-                    self.ui_controller.switch_tab('next')
-                    response = "Switching to the next tab."
-                elif direction in ['previous', 'prev', 'left', 'back']:
-                    self.ui_controller.switch_tab('previous')
-                    response = "Switching to the previous tab."
-                else:
-                    # Default to next if direction is unclear
-                    self.ui_controller.switch_tab('next')
-                    response = "Switching to the next tab."
-                    
-            elif action == 'close_tab':
-                self.ui_controller.close_tab()
-                response = "Closed the current tab."
-                
-            elif action == 'new_tab':
-                self.ui_controller.new_tab()
-                response = "Opened a new tab."
-                
-            elif action == 'close_window':
-                self.ui_controller.close_window()
-                response = "Closed the window."
-                
-            elif action == 'minimise_window':
-                self.ui_controller.minimize_window()
-                response = "Minimized the window."
-                
-            elif action == 'maximise_window':
-                self.ui_controller.maximize_window()
-                response = "Maximized the window."
-                
-            elif action == 'volume_up':
-                self.ui_controller.volume_up()
-                response = "Increasing volume."
-                
-            elif action == 'volume_down':
-                self.ui_controller.volume_down()
-                response = "Decreasing volume."
-                
-            elif action == 'mute':
-                self.ui_controller.mute_volume()
-                response = "Muted volume."
-                
-            elif action == 'pause_play':
-                self.ui_controller.pause_play()
-                response = "Toggled pause/play."
-                
-            elif action == 'play':
-                self.ui_controller.play_media()
-                response = "Playing media."
-                
-            elif action == 'pause':
-                self.ui_controller.pause_media()
-                response = "Pausing media."
-                
-            elif action == 'next_track':
-                self.ui_controller.next_track()
-                response = "Skipping to next track."
-                
-            elif action == 'previous_track':
-                self.ui_controller.previous_track()
-                response = "Going to previous track."
-                
-            elif action == 'screenshot':
-                response = self.ui_controller.screenshot()
-                
-            elif action == 'type_text':
-                text = params.get('text', '')
-                if text:
-                    self.ui_controller.type_text(text)
-                    response = f"Typing: '{text}'"
-                else:
-                    response = "Please specify what text you want me to type."
-                    
-            elif action == 'copy':
-                self.ui_controller.copy_to_clipboard()
-                response = "Copied to clipboard."
-                
-            elif action == 'paste':
-                self.ui_controller.paste_from_clipboard()
-                response = "Pasted from clipboard."
-                
-            elif action == 'select_all':
-                self.ui_controller.select_all()
-                response = "Selected all text."
-                
-            elif action == 'undo':
-                self.ui_controller.undo()
-                response = "Undone last action."
-                
-            elif action == 'redo':
-                self.ui_controller.redo()
-                response = "Redone last action."
-                
-            elif action == 'alt_tab':
-                self.ui_controller.alt_tab()
-                response = "Switching applications."
-                
-            elif action == 'refresh':
-                self.ui_controller.refresh_page()
-                response = "Refreshed page."
-                
-            elif action == 'go_back':
-                self.ui_controller.go_back()
-                response = "Going back."
-                
-            elif action == 'go_forward':
-                self.ui_controller.go_forward()
-                response = "Going forward."
-                    
-            else:
-                # Fallback - try to determine action from the original command
-                command_lower = original_command.lower()
-                
-                if any(phrase in command_lower for phrase in ['next tab', 'switch tab', 'change tab']):
-                    direction = 'next' if 'next' in command_lower or 'right' in command_lower else 'previous'
-                    self.ui_controller.switch_tab(direction)
-                    response = f"Switching to the {direction} tab."
-                    
-                elif any(phrase in command_lower for phrase in ['new tab', 'open tab']):
-                    self.ui_controller.new_tab()
-                    response = "Opened a new tab."
-                    
-                elif 'close tab' in command_lower:
-                    self.ui_controller.close_tab()
-                    response = "Closed the current tab."
-                    
-                elif 'close window' in command_lower:
-                    self.ui_controller.close_window()
-                    response = "Closed the window."
-                    
-                elif 'minimise' in command_lower:
-                    self.ui_controller.minimize_window()
-                    response = "Minimized the window."
-                    
-                elif 'maximise' in command_lower:
-                    self.ui_controller.maximize_window()
-                    response = "Maximized the window."
-                    
-                elif any(phrase in command_lower for phrase in ['volume up', 'increase volume', 'turn up']):
-                    self.ui_controller.volume_up()
-                    response = "Increasing volume."
-                    
-                elif any(phrase in command_lower for phrase in ['volume down', 'decrease volume', 'turn down']):
-                    self.ui_controller.volume_down()
-                    response = "Decreasing volume."
-                    
-                elif 'mute' in command_lower:
-                    self.ui_controller.mute_volume()
-                    response = "Muted volume."
-                    
-                elif any(phrase in command_lower for phrase in ['pause', 'play', 'pause play', 'play pause']):
-                    if 'pause' in command_lower and 'play' not in command_lower:
-                        self.ui_controller.pause_media()
-                        response = "Pausing media."
-                    elif 'play' in command_lower and 'pause' not in command_lower:
-                        self.ui_controller.play_media()
-                        response = "Playing media."
-                    else:
-                        self.ui_controller.pause_play()
-                        response = "Toggled pause/play."
-                        
-                elif any(phrase in command_lower for phrase in ['next track', 'next song', 'skip']):
-                    self.ui_controller.next_track()
-                    response = "Skipping to next track."
-                    
-                elif any(phrase in command_lower for phrase in ['previous track', 'previous song', 'back track']):
-                    self.ui_controller.previous_track()
-                    response = "Going to previous track."
-                    
-                elif 'screenshot' in command_lower:
-                    response = self.ui_controller.screenshot()
-                    
-                elif any(phrase in command_lower for phrase in ['copy', 'ctrl c']):
-                    self.ui_controller.copy_to_clipboard()
-                    response = "Copied to clipboard."
-                    
-                elif any(phrase in command_lower for phrase in ['paste', 'ctrl v']):
-                    self.ui_controller.paste_from_clipboard()
-                    response = "Pasted from clipboard."
-                    
-                elif any(phrase in command_lower for phrase in ['select all', 'ctrl a']):
-                    self.ui_controller.select_all()
-                    response = "Selected all text."
-                    
-                elif any(phrase in command_lower for phrase in ['undo', 'ctrl z']):
-                    self.ui_controller.undo()
-                    response = "Undone last action."
-                    
-                elif any(phrase in command_lower for phrase in ['redo', 'ctrl y']):
-                    self.ui_controller.redo()
-                    response = "Redone last action."
-                    
-                elif any(phrase in command_lower for phrase in ['alt tab', 'switch app']):
-                    self.ui_controller.alt_tab()
-                    response = "Switching applications."
-                    
-                elif any(phrase in command_lower for phrase in ['refresh', 'reload', 'f5']):
-                    self.ui_controller.refresh_page()
-                    response = "Refreshed page."
-                    
-                elif any(phrase in command_lower for phrase in ['go back', 'back', 'previous page']):
-                    self.ui_controller.go_back()
-                    response = "Going back."
-                    
-                elif any(phrase in command_lower for phrase in ['go forward', 'forward', 'next page']):
-                    self.ui_controller.go_forward()
-                    response = "Going forward."
-                    
-                elif any(phrase in command_lower for phrase in ['type ', 'write ', 'input ']):
-                    # Extract text to type from the command
-                    for phrase in ['type ', 'write ', 'input ']:
-                        if phrase in command_lower:
-                            text_to_type = command_lower.split(phrase, 1)[1].strip()
-                            if text_to_type:
-                                self.ui_controller.type_text(text_to_type)
-                                response = f"Typing: '{text_to_type}'"
-                            else:
-                                response = "Please specify what text you want me to type."
-                            break
-                    else:
-                        response = "Please specify what text you want me to type."
-                        
-                else:
-                    response = "I couldn't understand what UI action you want me to perform. Try commands like 'next tab', 'close window', 'volume up', 'pause', 'play', 'take screenshot', or 'type hello world'."
         elif intent == 'greeting':
             # Personalized greeting based on time and sentiment
             hour = datetime.datetime.now().hour
@@ -743,9 +809,6 @@ class CommandProcessor:
                 response = f"{time_greeting}! How can I assist you today?"
             return response, False
 
-        elif intent == 'reminder':
-            response = self.process_reminder_command(original_command, params)
-
         elif intent == 'goodbye':
             # Personalized goodbye based on interaction history
             if len(self.data_manager.conversation_history) > 5:
@@ -757,13 +820,12 @@ class CommandProcessor:
         elif intent == 'question':
             # Handle general questions intelligently
             entities = params.get('entities', {})
+            query = self.search_query_for(intent, command, params)
             if entities or len(command.split()) > 3:
                 # Complex question - try to search for it
-                query = command.replace('what is', '').replace(
-                    'who is', '').replace('how', '').strip()
-                response = self.smart_search(query, entities)
+                response = self.lookup(query)
             else:
-                return self.search_for(command), False
+                return self.lookup(query), False
 
         elif intent == 'intro':
             response = "My name is Nexus, your personal voice assistant. I can help you with simple but time consuming tasks, provide information, seting reminders and much more to enhance your productivity."
@@ -783,9 +845,16 @@ class CommandProcessor:
                 ]
                 response = random.choice(responses)
 
+        if isinstance(response, SentenceStream):
+            # The text is only known once it has been spoken
+            response.prefix = tone_prefix
+            response.when_done(lambda text: self.data_manager.learn_from_interaction(
+                original_command, text, sentiment, self.nlp_processor, utterance, intent))
+            return response, False
+
         # Learn from this interaction
         final_response = tone_prefix + response
         self.data_manager.learn_from_interaction(
-            original_command, final_response, sentiment, self.nlp_processor)
+            original_command, final_response, sentiment, self.nlp_processor, utterance, intent)
 
         return final_response, False
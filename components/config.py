@@ -11,9 +11,68 @@ PREFERENCES_FILE = DATA_DIR / "user_preferences.json"
 MEMORY_FILE = DATA_DIR / "context_memory.pickle"
 
 # NLP Configuration
-NLTK_DOWNLOADS = ['punkt', 'punkt_tab', 'stopwords', 'wordnet',
-                  'averaged_perceptron_tagger', 'maxent_ne_chunker', 'words']
+# NLTK resources and the data path each one is found under
+NLTK_DOWNLOADS = {
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'maxent_ne_chunker': 'chunkers/maxent_ne_chunker',
+    'words': 'corpora/words'
+}
 SPACY_MODEL = "en_core_web_sm"
+# Only doc.ents is used, so skip every component NER does not depend on
+SPACY_EXCLUDE = ['tok2vec', 'tagger', 'parser', 'senter', 'attribute_ruler', 'lemmatizer']
+SPACY_BATCH_SIZE = 64  # Texts per nlp.pipe batch for bulk entity extraction
+SPACY_N_PROCESS = 1  # Worker processes for nlp.pipe (-1 uses every core)
+BATCH_CHUNK_SIZE = 256  # Utterances per worker task in NLPProcessor.analyze_batch
+NLP_MANIFEST_FILE = DATA_DIR / "nlp_manifest.json"
+NLTK_RETRY_INTERVAL = 24 * 60 * 60  # Seconds before retrying a failed download
+NLP_STARTUP_BUDGET = 2.0  # Seconds NLPProcessor setup may take before warning
+# 'lexicon' scores the command's tokens with TextBlob's compiled lexicon,
+# 'textblob' builds a TextBlob per command
+SENTIMENT_ENGINE = 'lexicon'
+EARLY_INTENT_THRESHOLD = 0.9  # Confidence a partial transcript needs to signal a likely intent
+EARLY_INTENT_STABLE_UPDATES = 2  # Consecutive partials the same intent must lead for
+EARLY_INTENT_MIN_WORDS = 2  # Words heard before any likely intent is signalled
+PREFETCH_INTENTS = ('weather', 'search', 'question')  # Intents whose lookups start early
+PREFETCH_WORKERS = 2
+PREFETCH_DEBOUNCE = 0.3  # Seconds a partial transcript must stand before its lookup starts
+COMMAND_CACHE_SIZE = 256  # Repeated commands whose analysis is kept in memory
+COMMAND_CACHE_PRELOAD = 20  # Most used past commands resolved in the background at startup
+FUZZY_MATCH_CUTOFF = 0.6  # Minimum difflib ratio for "did you mean" suggestions
+FUZZY_PHRASE_MIN_COUNT = 3  # Times a recognised command is seen before it is suggested
+
+# Network Configuration
+HTTP_POOL_SIZE = 10  # Keep-alive connections kept per host
+HTTP_RETRIES = 2  # Extra attempts for GET requests that fail to connect or get a 5xx
+HTTP_BACKOFF = 0.2  # Seconds before the first retry, doubled each time (with jitter)
+HTTP_DEFAULT_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+# Per-host (connect, read) timeouts
+HTTP_TIMEOUTS = {
+    'api.openweathermap.org': (3.05, 5),
+    'en.wikipedia.org': (3.05, 8)
+}
+WEATHER_GEOCODE_URL = "http://api.openweathermap.org/geo/1.0/direct"
+WEATHER_URL = "https://api.openweathermap.org/data/2.5/weather"
+CACHE_DB_FILE = DATA_DIR / "cache.sqlite3"  # Geocoding and weather lookups kept across restarts
+GEOCODE_CACHE_TTL = None  # Seconds; None keeps city coordinates forever
+WEATHER_CACHE_TTL = 10 * 60  # Seconds a weather reading is reused
+WIKI_CACHE_TTL = 24 * 60 * 60  # Seconds a Wikipedia introduction is reused
+WIKI_FOLLOW_UP_SENTENCES = 2  # Sentences read out per "tell me more"
+WIKI_DISAMBIGUATION_TRIES = 3  # Options of an ambiguous query tried before giving up
+# 'sequential' only asks the summarizer after Wikipedia has failed;
+# 'hedged' also asks it once Wikipedia has taken LOOKUP_HEDGE_DELAY;
+# 'speculative' asks both at once (a summarizer call per uncached lookup)
+LOOKUP_MODE = 'sequential'
+LOOKUP_HEDGE_DELAY = 1.0  # Seconds Wikipedia has before the summarizer is asked too
+LOOKUP_DEADLINE = 5.0  # Seconds to wait for a better answer before taking what is there
+LOOKUP_WORKERS = 4
+RESPONSE_CACHE_SIZE = 256  # Summarizer responses kept in memory
+RESPONSE_CACHE_TTL = 24 * 60 * 60  # Seconds a summarizer response is reused
+RESPONSE_CACHE_MAX_ENTRIES = 5000  # Summarizer responses kept on disk
+WEATHER_WORKERS = 4  # Cities looked up at once for multi-city weather questions
 
 # Intent patterns for command classification
 INTENT_PATTERNS = {
@@ -38,8 +97,10 @@ INTENT_PATTERNS = {
 
         # Window control
         'close window', 'close this window', 'close current window',
-        'minimize window', 'minimise this window', 'minimise current window',
-        'maximize window', 'maximise this window', 'maximise current window',
+        'minimize', 'minimise', 'minimize window', 'minimize this window', 'minimize current window',
+        'minimise this window', 'minimise current window',
+        'maximize', 'maximise', 'maximize window', 'maximize this window', 'maximize current window',
+        'maximise this window', 'maximise current window',
         # Volume control
         'volume up', 'increase volume', 'turn up volume', 'raise volume',
         'volume down', 'decrease volume', 'turn down volume', 'lower volume',
@@ -76,6 +137,81 @@ INTENT_PATTERNS = {
         'press key', 'hit key', 'click key'
     ]
 }
+# Intents whose patterns only count as whole words at the start of a
+# command: "hi nexus" is a greeting, "minimize this window" and "type hello
+# world" are not
+LEADING_INTENTS = ('greeting',)
+
+# How intents are described when asking the user to clarify
+INTENT_DESCRIPTIONS = {
+    'greeting': 'a greeting',
+    'time': 'the time',
+    'date': 'the date',
+    'search': 'a search',
+    'open': 'opening something',
+    'weather': 'the weather',
+    'joke': 'a joke',
+    'math': 'a calculation',
+    'reminder': 'a reminder',
+    'question': 'a question',
+    'goodbye': 'saying goodbye',
+    'intro': 'who I am',
+    'compose': 'composing an email',
+    'ui_control': 'controlling your screen'
+}
+# Ask for clarification when tied intents are closer than this in confidence
+INTENT_CLARIFY_MARGIN = 0.2
+
+# Analysis stages each intent's handler uses: 'sentiment' for the response
+# tone, 'entities' for spaCy/NLTK named entities plus the rule-based ones,
+# 'rules' for the rule-based entities alone. Unlisted intents run them all.
+# Sentiment stays in every plan: the tone prefix and the mood statistics
+# kept in the conversation history rely on it for every intent
+ANALYSIS_STAGES = ('sentiment', 'entities')
+INTENT_STAGE_PLAN = {
+    'greeting': ('sentiment',),
+    'time': ('sentiment',),
+    'date': ('sentiment',),
+    'search': ('sentiment', 'entities'),
+    'open': ('sentiment',),
+    'weather': ('sentiment', 'entities'),
+    'joke': ('sentiment',),
+    'math': ('sentiment',),
+    'reminder': ('sentiment',),
+    'question': ('sentiment', 'entities'),
+    'goodbye': ('sentiment',),
+    'intro': ('sentiment',),
+    'compose': ('sentiment',),
+    'ui_control': ('sentiment', 'rules')
+}
+
+# Phrases that identify a UI action when no UI_ACTION entity was found;
+# the first action with a phrase in the command wins
+UI_FALLBACK_ACTIONS = [
+    ('switch_tab', ['next tab', 'switch tab', 'change tab']),
+    ('new_tab', ['new tab', 'open tab']),
+    ('close_tab', ['close tab']),
+    ('close_window', ['close window']),
+    ('minimize_window', ['minimise', 'minimize']),
+    ('maximize_window', ['maximise', 'maximize']),
+    ('volume_up', ['volume up', 'increase volume', 'turn up']),
+    ('volume_down', ['volume down', 'decrease volume', 'turn down']),
+    ('mute', ['mute']),
+    ('pause_play', ['pause', 'play', 'pause play', 'play pause']),
+    ('next_track', ['next track', 'next song', 'skip']),
+    ('previous_track', ['previous track', 'previous song', 'back track']),
+    ('screenshot', ['screenshot']),
+    ('copy', ['copy', 'ctrl c']),
+    ('paste', ['paste', 'ctrl v']),
+    ('select_all', ['select all', 'ctrl a']),
+    ('undo', ['undo', 'ctrl z']),
+    ('redo', ['redo', 'ctrl y']),
+    ('alt_tab', ['alt tab', 'switch app']),
+    ('refresh', ['refresh', 'reload', 'f5']),
+    ('go_back', ['go back', 'back', 'previous page']),
+    ('go_forward', ['go forward', 'forward', 'next page']),
+    ('type_text', ['type ', 'write ', 'input '])
+]
 
 # Emotional context patterns
 EMOTION_PATTERNS = {
@@ -153,21 +153,27 @@ class DataManager:
         
         return stats.strip()
     
-    def learn_from_interaction(self, user_input, response, sentiment, nlp_processor):
+    def learn_from_interaction(self, user_input, response, sentiment, nlp_processor, utterance=None, intent=None):
         # Store conversation history
-        self.conversation_history.append({
+        entry = {
             'timestamp': datetime.datetime.now(),
             'user_input': user_input,
             'response': response,
             'sentiment': sentiment
-        })
+        }
+        if intent:
+            entry['intent'] = intent
+        self.conversation_history.append(entry)
         
         # Keep only last 100 interactions in memory (but save all to file)
         if len(self.conversation_history) > 100:
             self.conversation_history = self.conversation_history[-100:]
         
-        # Extract user preferences
-        tokens = nlp_processor.preprocess_text(user_input)
+        # Extract user preferences, reusing the command's analysis when available
+        if utterance is not None:
+            tokens = utterance.lemmas
+        else:
+            tokens = nlp_processor.preprocess_text(user_input)
         for token in tokens:
             if token in self.user_preferences:
                 self.user_preferences[token] += 1
@@ -0,0 +1,95 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from components.config import DATA_DIR, CACHE_DB_FILE
+
+
+class DiskCache:
+    """Small SQLite-backed key/value cache that survives restarts.
+
+    Values are stored as JSON under a namespace ('geocode', 'weather'...)
+    with an optional time-to-live; entries without one never expire.
+    Hits and misses are counted per namespace.
+    """
+
+    def __init__(self, path=CACHE_DB_FILE):
+        if path == CACHE_DB_FILE:
+            DATA_DIR.mkdir(exist_ok=True)
+        # Shared with the prefetch threads, so access is serialised by a lock
+        self.connection = sqlite3.connect(str(path), check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "expires_at REAL, PRIMARY KEY (namespace, key))")
+        self.connection.commit()
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(key):
+        return ' '.join(str(key).lower().split())
+
+    def get(self, namespace, key):
+        """Return the cached value, or None if missing or expired"""
+        key = self.normalize(key)
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (namespace, key)).fetchone()
+            if row is None or (row[1] is not None and row[1] < time.time()):
+                self.misses[namespace] += 1
+                return None
+            self.hits[namespace] += 1
+        return json.loads(row[0])
+
+    def set(self, namespace, key, value, ttl=None):
+        """Store value; ttl in seconds, None to keep it forever"""
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, self.normalize(key), json.dumps(value), expires_at))
+            self.connection.commit()
+
+    def purge_expired(self):
+        with self._lock:
+            self.connection.execute(
+                "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+            self.connection.commit()
+
+    def trim(self, namespace, max_entries):
+        """Drop the entries of a namespace that expire first, keeping max_entries"""
+        with self._lock:
+            self.connection.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key NOT IN ("
+                "SELECT key FROM cache WHERE namespace = ? "
+                "ORDER BY expires_at IS NULL DESC, expires_at DESC LIMIT ?)",
+                (namespace, namespace, max_entries))
+            self.connection.commit()
+
+    def clear(self, namespace=None):
+        with self._lock:
+            if namespace is None:
+                self.connection.execute("DELETE FROM cache")
+            else:
+                self.connection.execute("DELETE FROM cache WHERE namespace = ?", (namespace,))
+            self.connection.commit()
+
+    def stats(self):
+        """Hits, misses and hit rate per namespace"""
+        stats = {}
+        for namespace in set(self.hits) | set(self.misses):
+            hits, misses = self.hits[namespace], self.misses[namespace]
+            stats[namespace] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / (hits + misses) if hits + misses else 0.0
+            }
+        return stats
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
@@ -0,0 +1,254 @@
+import re
+
+from components.numbers import CARDINAL_WORDS
+
+# Weather city patterns, applied in order with findall semantics.
+# "what is the weather in" / "what is the temperature in" variants were
+# dropped: their optional prefix never changes the captured city, so they
+# only ever produced duplicates of the first two patterns.
+WEATHER_CITY_PATTERNS = [
+    r'(?:tell\s+me\s+the\s+)?weather\s+(?:in|for|of)\s+([a-zA-Z\s]+)',
+    r'(?:tell\s+me\s+the\s+)?temperature\s+(?:in|for|of)\s+([a-zA-Z\s]+)',
+    r'(?:in|at)\s+([a-zA-Z\s]+)\s+weather',
+    r'weather\s+in\s+([a-zA-Z\s]+)',
+    r'weather\s+for\s+([a-zA-Z\s]+)',
+    r'weather\s+of\s+([a-zA-Z\s]+)',
+    r'([a-zA-Z\s]+)\s+weather'
+]
+
+# Filter out common non-city words
+NON_CITIES = ['he', 'weather', 'today', 'tell me' 'tomorrow',
+              'now', 'current', 'is', 'what', 'how', 'the', 'and']
+
+# Numbers, math words and number words (any word of a spoken number,
+# so "twenty five" and "a thousand" count as well as "five")
+MATH_PATTERN = (r'\b\d+(?:\.\d+)?\b'
+                r'|\b(?:plus|minus|times|divide|multiply|add|subtract)\b'
+                r'|\b(?:' + '|'.join(CARDINAL_WORDS) + r')\b')
+
+# Clock times ("at 5 pm"), durations ("in 10 minutes") and day periods.
+# Clock times and durations can both start at "in", so they are optional
+# lookaheads tried together rather than competing alternatives.
+TIME_PATTERN = (r'\b(?:(?=(?:at|in|after) )'
+                r'(?=(?:at|in) (?P<clock>\d{1,2}(?::\d{2})?\s*(?:am|pm|AM|PM)?)\b)?'
+                r'(?=(?:after|in) (?P<duration>\d+)\s*(?:minutes?|hours?|days?)\b)?'
+                r'|(?P<period>tomorrow|today|tonight|morning|afternoon|evening)\b)')
+TIME_GROUPS = ['clock', 'duration', 'period']
+
+# UI actions matched on multi-word phrases. No two phrases of different
+# actions can match at the same position, so one alternation finds them all.
+UI_ACTION_PHRASES = {
+    # Tab controls
+    'switch_tab': [
+        r'\b(?:switch|change|move|go)\s+(?:to\s+)?(?:the\s+)?(?:next|previous|left|right)\s+tab\b',
+        r'\b(?:next|previous|left|right)\s+tab\b'
+    ],
+    'close_tab': [r'\bclose\s+(?:this\s+|current\s+)?tab\b'],
+    'new_tab': [r'\b(?:new|open)\s+tab\b', r'\bopen\s+(?:a\s+)?new\s+tab\b'],
+
+    # Window controls
+    'close_window': [r'\bclose\s+(?:this\s+|current\s+)?window\b'],
+    'minimize_window': [r'\bminimize\s+(?:this\s+|current\s+)?window\b'],
+    'maximize_window': [r'\bmaximize\s+(?:this\s+|current\s+)?window\b'],
+
+    # Volume controls
+    'volume_up': [
+        r'\b(?:increase|turn\s+up|raise)\s+(?:the\s+)?volume\b',
+        r'\bvolume\s+up\b'
+    ],
+    'volume_down': [
+        r'\b(?:decrease|turn\s+down|lower)\s+(?:the\s+)?volume\b',
+        r'\bvolume\s+down\b'
+    ],
+    'mute': [r'\bmute\s+(?:the\s+)?(?:volume|sound|audio)\b'],
+
+    # Media controls
+    'pause': [r'\bpause\s+(?:music|video|media|audio)\b'],
+    'play': [r'\bplay\s+(?:music|video|media|audio)\b'],
+    'pause_play': [
+        r'\bpause\s+play\b', r'\bplay\s+pause\b',
+        r'\btoggle\s+(?:play|pause)\b'
+    ],
+    'next_track': [
+        r'\b(?:next|skip)\s+(?:track|song|music)\b',
+        r'\bnext\s+(?:song|track)\b'
+    ],
+    'previous_track': [
+        r'\b(?:previous|back)\s+(?:track|song|music)\b',
+        r'\bprevious\s+(?:song|track)\b',
+        r'\bback\s+(?:song|track)\b'
+    ],
+
+    # Screenshot
+    'screenshot': [
+        r'\btake\s+(?:a\s+)?screenshot\b',
+        r'\bcapture\s+screen\b'
+    ],
+
+    # Text input and editing
+    'type_text': [r'\btype\s+.+', r'\bwrite\s+.+', r'\binput\s+.+'],
+    'copy': [r'\bctrl\s*c\b'],
+    'paste': [r'\bctrl\s*v\b'],
+    'select_all': [r'\bselect\s+all\b', r'\bctrl\s*a\b'],
+    'undo': [r'\bctrl\s*z\b'],
+    'redo': [r'\bctrl\s*y\b'],
+
+    # Application and navigation
+    'alt_tab': [r'\balt\s+tab\b', r'\bswitch\s+(?:app|application)\b'],
+    'go_back': [r'\bgo\s+back\b', r'\bprevious\s+page\b'],
+    'go_forward': [r'\bgo\s+forward\b', r'\bnext\s+page\b']
+}
+
+# UI actions matched on a single keyword. These can start at the same word
+# as a phrase above ("back song"), so they get their own alternation.
+UI_ACTION_KEYWORDS = {
+    'mute': [r'\bmute\b'],
+    'pause': [r'\bpause\b(?!\s+play)'],  # pause but not "pause play"
+    'play': [r'\bplay\b(?!\s+pause)', r'\bresume\b'],  # play but not "play pause"
+    'next_track': [r'\bskip\b(?!\s+(?:to|forward))'],
+    'screenshot': [r'\bscreenshot\b'],
+    'copy': [r'\bcopy\b'],
+    'paste': [r'\bpaste\b'],
+    'undo': [r'\bundo\b'],
+    'redo': [r'\bredo\b'],
+    'refresh': [r'\brefresh\b', r'\breload\b', r'\bf5\b'],
+    'go_back': [r'\bback\b'],
+    'go_forward': [r'\bforward\b']
+}
+
+# Order in which actions are reported
+UI_ACTIONS = ['switch_tab', 'close_tab', 'new_tab', 'close_window', 'minimize_window',
+              'maximize_window', 'volume_up', 'volume_down', 'mute', 'pause', 'play',
+              'pause_play', 'next_track', 'previous_track', 'screenshot', 'type_text',
+              'copy', 'paste', 'select_all', 'undo', 'redo', 'alt_tab', 'refresh',
+              'go_back', 'go_forward']
+
+DIRECTION_PATTERN = r'\b(?:(?P<next>next|right)|(?P<previous>previous|prev|left|back))\b'
+DIRECTIONS = ['next', 'previous']
+
+# Extract text to type for type_text action
+TYPE_TEXT_PATTERNS = [
+    r'\btype\s+["\'](.+?)["\']',  # "type 'hello world'"
+    r'\btype\s+(.+)',             # "type hello world"
+    r'\bwrite\s+["\'](.+?)["\']',  # "write 'hello world'"
+    r'\bwrite\s+(.+)',            # "write hello world"
+    r'\binput\s+["\'](.+?)["\']',  # "input 'hello world'"
+    r'\binput\s+(.+)'             # "input hello world"
+]
+TYPE_TEXT_ENDINGS = ['please', 'now', 'here']
+
+
+def _compile_alternation(table, prefix):
+    """Fuse {label: [patterns]} into one zero-width alternation.
+
+    Every pattern becomes a named lookahead, so matches never consume text
+    and a single finditer reports each position where any pattern matches.
+    Returns the compiled regex and a map from group name to label.
+    """
+    branches = []
+    labels = {}
+    for label, patterns in table.items():
+        for pattern in patterns:
+            name = f"{prefix}{len(branches)}"
+            labels[name] = label
+            branches.append(f"(?=(?P<{name}>{pattern}))")
+    return re.compile(r'\b(?:' + '|'.join(branches) + ')'), labels
+
+
+class EntityRuleEngine:
+    """Rule-based entity detection compiled once and run one scan per family"""
+
+    def __init__(self):
+        self.weather_gate = re.compile(r'weather|temperature', re.IGNORECASE)
+        self.weather_patterns = [re.compile(pattern, re.IGNORECASE)
+                                 for pattern in WEATHER_CITY_PATTERNS]
+        self.math_pattern = re.compile(MATH_PATTERN)
+        self.time_pattern = re.compile(TIME_PATTERN, re.IGNORECASE)
+        self.ui_scans = [_compile_alternation(UI_ACTION_PHRASES, 'phrase'),
+                         _compile_alternation(UI_ACTION_KEYWORDS, 'keyword')]
+        self.direction_pattern = re.compile(DIRECTION_PATTERN)
+        self.type_gate = re.compile(r'\b(?:type|write|input)\s', re.IGNORECASE)
+        self.type_patterns = [re.compile(pattern, re.IGNORECASE)
+                              for pattern in TYPE_TEXT_PATTERNS]
+
+    def apply(self, text, entities):
+        """Add rule-based entities for text to the entities dict"""
+        text_lower = text.lower()
+
+        self._add_weather_cities(text, entities)
+
+        # Detect mathematical expressions for calculation
+        if self.math_pattern.search(text_lower):
+            entities.setdefault('MATH', []).append('mathematical_expression')
+
+        self._add_times(text, entities)
+        self._add_ui_actions(text_lower, entities)
+
+        # Check for directions (for tab switching)
+        directions = set()
+        for match in self.direction_pattern.finditer(text_lower):
+            directions.add(match.lastgroup)
+        for direction in DIRECTIONS:
+            if direction in directions:
+                entities.setdefault('DIRECTION', [])
+                if direction not in entities['DIRECTION']:
+                    entities['DIRECTION'].append(direction)
+
+        self._add_text_to_type(text, entities)
+        return entities
+
+    def _add_weather_cities(self, text, entities):
+        # Detect city names from common weather patterns
+        if not self.weather_gate.search(text):
+            return
+        for pattern in self.weather_patterns:
+            for match in pattern.findall(text):
+                city = match.strip().title()
+                if city and city not in NON_CITIES and len(city) > 1:
+                    entities.setdefault('GPE', [])
+                    if city not in entities['GPE']:
+                        entities['GPE'].append(city)
+
+    def _add_times(self, text, entities):
+        # Detect time expressions for reminders
+        found = {group: [] for group in TIME_GROUPS}
+        for match in self.time_pattern.finditer(text):
+            for group in TIME_GROUPS:
+                value = match.group(group)
+                if value is not None:
+                    found[group].append(value)
+
+        for group in TIME_GROUPS:
+            if found[group]:
+                entities.setdefault('TIME', [])
+                for time_expr in found[group]:
+                    if time_expr not in entities['TIME']:
+                        entities['TIME'].append(time_expr.strip())
+
+    def _add_ui_actions(self, text_lower, entities):
+        # Enhanced UI control actions detection
+        actions = set()
+        for scan, labels in self.ui_scans:
+            for match in scan.finditer(text_lower):
+                actions.add(labels[match.lastgroup])
+        for action in UI_ACTIONS:
+            if action in actions:
+                entities.setdefault('UI_ACTION', [])
+                if action not in entities['UI_ACTION']:
+                    entities['UI_ACTION'].append(action)
+
+    def _add_text_to_type(self, text, entities):
+        if not self.type_gate.search(text):
+            return
+        for pattern in self.type_patterns:
+            matches = pattern.findall(text)
+            if matches:
+                entities.setdefault('TEXT_TO_TYPE', [])
+                for match in matches:
+                    text_content = match.strip()
+                    # Remove common ending words that might be captured
+                    for word in TYPE_TEXT_ENDINGS:
+                        if text_content.endswith(' ' + word):
+                            text_content = text_content[:-len(' ' + word)]
+                    if text_content and text_content not in entities['TEXT_TO_TYPE']:
+                        entities['TEXT_TO_TYPE'].append(text_content)
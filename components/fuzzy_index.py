@@ -0,0 +1,110 @@
+import difflib
+from collections import Counter
+import numpy as np
+
+
+class FuzzyIndex:
+    """Persistent top-n fuzzy lookup over intent patterns and frequent user phrases.
+
+    Every phrase is stored as a row of character counts, so the bound that
+    difflib's quick_ratio() computes one string at a time comes out of one
+    vectorised minimum for all phrases. Candidates are verified with
+    SequenceMatcher.ratio() in order of that bound, stopping once no bound
+    left can reach the current n-th best; the result (tie order included)
+    is the same as difflib.get_close_matches over the same phrases.
+    """
+
+    CACHE_SIZE = 1024
+
+    def __init__(self, phrases=()):
+        self.phrases = []
+        self.phrase_ids = {}
+        self.char_columns = {}
+        self._rows = []
+        self._matrix = None
+        self._lengths = None
+        self._cache = {}
+        self.add_phrases(phrases)
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def __contains__(self, phrase):
+        return phrase in self.phrase_ids
+
+    def add(self, phrase):
+        """Add a phrase; returns False if it was already indexed"""
+        if not phrase or phrase in self.phrase_ids:
+            return False
+        self.phrase_ids[phrase] = len(self.phrases)
+        self.phrases.append(phrase)
+        row = {}
+        for char, count in Counter(phrase).items():
+            column = self.char_columns.setdefault(char, len(self.char_columns))
+            row[column] = count
+        self._rows.append(row)
+        # Rebuilt on the next search
+        self._matrix = None
+        self._cache.clear()
+        return True
+
+    def add_phrases(self, phrases):
+        for phrase in phrases:
+            self.add(phrase)
+
+    def _build(self):
+        self._matrix = np.zeros((len(self.phrases), len(self.char_columns)), dtype=np.int32)
+        for row, counts in enumerate(self._rows):
+            for column, count in counts.items():
+                self._matrix[row, column] = count
+        self._lengths = np.array([len(phrase) for phrase in self.phrases], dtype=np.float64)
+
+    def bounds(self, word):
+        """Upper bound of SequenceMatcher.ratio() between word and every phrase"""
+        if self._matrix is None:
+            self._build()
+        columns = []
+        counts = []
+        for char, count in Counter(word).items():
+            column = self.char_columns.get(char)
+            if column is not None:
+                columns.append(column)
+                counts.append(count)
+        common = np.minimum(self._matrix[:, columns], counts).sum(axis=1)
+        return 2.0 * common / (len(word) + self._lengths)
+
+    def search(self, word, n=3, cutoff=0.6):
+        """Return up to n (phrase, score) pairs with score >= cutoff, best first"""
+        key = (word, n, cutoff)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        best = []
+        if self.phrases and n > 0:
+            bounds = self.bounds(word)
+            candidates = np.flatnonzero(bounds >= cutoff)
+            candidates = candidates[np.argsort(-bounds[candidates], kind='stable')]
+
+            matcher = difflib.SequenceMatcher()
+            matcher.set_seq2(word)
+            for phrase_id in candidates:
+                # Later candidates can at most tie the n-th best, and a tie
+                # still matters because equal scores are ordered by phrase
+                if len(best) == n and bounds[phrase_id] < best[-1][0]:
+                    break
+                phrase = self.phrases[phrase_id]
+                matcher.set_seq1(phrase)
+                if matcher.real_quick_ratio() < cutoff:
+                    continue
+                score = matcher.ratio()
+                if score >= cutoff:
+                    best.append((score, phrase))
+                    best.sort(reverse=True)
+                    del best[n:]
+
+        result = [(phrase, score) for score, phrase in best]
+        if len(self._cache) >= self.CACHE_SIZE:
+            self._cache.clear()
+        self._cache[key] = result
+        return result
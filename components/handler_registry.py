@@ -0,0 +1,74 @@
+import time
+
+
+class Handler:
+    """A command handler with its metadata and call statistics"""
+
+    def __init__(self, func, intent, action=None, needs_network=False, blocking=False,
+                 expected_latency=0.0):
+        self.func = func
+        self.intent = intent
+        self.action = action
+        self.needs_network = needs_network
+        self.blocking = blocking
+        self.expected_latency = expected_latency  # seconds
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    @property
+    def name(self):
+        return f"{self.intent}.{self.action}" if self.action else self.intent
+
+    @property
+    def mean_time(self):
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.func(*args, **kwargs)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.calls += 1
+            self.total_time += elapsed
+            self.max_time = max(self.max_time, elapsed)
+
+
+class HandlerRegistry:
+    """Maps (intent, action) to handlers so dispatch is a single dict lookup.
+
+    An intent-level handler is registered with action None and catches any
+    action of that intent without a handler of its own.
+    """
+
+    def __init__(self):
+        self.handlers = {}
+
+    def register(self, intent, func, action=None, **metadata):
+        handler = Handler(func, intent, action, **metadata)
+        self.handlers[(intent, action)] = handler
+        return handler
+
+    def find(self, intent, action=None):
+        handler = self.handlers.get((intent, action))
+        if handler is None and action is not None:
+            handler = self.handlers.get((intent, None))
+        return handler
+
+    def stats(self):
+        """Calls, errors and latency per handler, most time spent first"""
+        handlers = sorted(self.handlers.values(), key=lambda handler: -handler.total_time)
+        return {handler.name: {
+            'calls': handler.calls,
+            'errors': handler.errors,
+            'mean_ms': round(handler.mean_time * 1000, 3),
+            'max_ms': round(handler.max_time * 1000, 3),
+            'expected_ms': round(handler.expected_latency * 1000, 3),
+            'needs_network': handler.needs_network,
+            'blocking': handler.blocking
+        } for handler in handlers}
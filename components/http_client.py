@@ -0,0 +1,132 @@
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from components.config import (HTTP_POOL_SIZE, HTTP_RETRIES, HTTP_BACKOFF,
+                               HTTP_DEFAULT_TIMEOUT, HTTP_TIMEOUTS)
+
+# Statuses worth another attempt; anything else is returned to the caller
+RETRY_STATUSES = {500, 502, 503, 504}
+
+
+class HostMetrics:
+    """Request counts and recent latencies for one host"""
+
+    SAMPLES = 256
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_time = 0.0
+        self.latencies = deque(maxlen=self.SAMPLES)
+
+    def percentile(self, fraction):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'mean_ms': round(self.total_time / self.requests * 1000, 1) if self.requests else 0.0,
+            'p50_ms': round(self.percentile(0.5) * 1000, 1),
+            'p95_ms': round(self.percentile(0.95) * 1000, 1)
+        }
+
+
+class HttpClient:
+    """One pooled, keep-alive HTTP session shared by every outbound call.
+
+    Each host gets its own (connect, read) timeout from HTTP_TIMEOUTS.
+    Idempotent requests that fail to connect or get a 5xx status are
+    retried up to HTTP_RETRIES times with jittered exponential backoff. A
+    read timeout is raised at once: the server already had the whole read
+    timeout to answer, and waiting that long again would leave the user in
+    silence. Latency is recorded per host.
+    """
+
+    def __init__(self, timeouts=None, default_timeout=HTTP_DEFAULT_TIMEOUT, retries=HTTP_RETRIES,
+                 backoff=HTTP_BACKOFF, pool_size=HTTP_POOL_SIZE):
+        self.timeouts = dict(HTTP_TIMEOUTS if timeouts is None else timeouts)
+        self.default_timeout = default_timeout
+        self.retries = retries
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.metrics = defaultdict(HostMetrics)
+        self._lock = threading.Lock()
+
+    def timeout_for(self, url):
+        return self.timeouts.get(urlsplit(url).hostname, self.default_timeout)
+
+    def _sleep_before_retry(self, attempt):
+        # Full jitter keeps retries from several callers from lining up
+        time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    def request(self, method, url, retry=None, **kwargs):
+        """Send a request; retried by default only for GET and HEAD"""
+        if retry is None:
+            retry = method.upper() in ('GET', 'HEAD')
+        kwargs.setdefault('timeout', self.timeout_for(url))
+        host = urlsplit(url).hostname
+        attempts = self.retries + 1 if retry else 1
+
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.ReadTimeout:
+                self._record(host, start, error=True)
+                raise
+            except requests.ConnectionError:
+                # Includes connect timeouts and keep-alive connections the server closed
+                self._record(host, start, error=True, retried=not last_attempt)
+                if last_attempt:
+                    raise
+            else:
+                retryable = response.status_code in RETRY_STATUSES
+                self._record(host, start, error=retryable,
+                             retried=retryable and not last_attempt)
+                if not retryable or last_attempt:
+                    return response
+                response.close()
+            self._sleep_before_retry(attempt)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def _record(self, host, start, error=False, retried=False):
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            metrics = self.metrics[host]
+            metrics.requests += 1
+            metrics.total_time += elapsed
+            metrics.latencies.append(elapsed)
+            if error:
+                metrics.errors += 1
+            if retried:
+                metrics.retries += 1
+
+    def stats(self):
+        """Per-host request counts and latency percentiles"""
+        with self._lock:
+            return {host: metrics.summary() for host, metrics in self.metrics.items()}
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,151 @@
+import difflib
+import re
+from collections import Counter, defaultdict, deque
+
+
+class PhraseAutomaton:
+    """Aho-Corasick automaton that finds every phrase occurring in a text in one pass"""
+
+    def __init__(self, phrases):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for phrase_id, phrase in enumerate(phrases):
+            state = 0
+            for char in phrase:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append(phrase_id)
+
+        # Breadth-first pass to wire failure links and merge outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + \
+                    self.output[self.fail[next_state]]
+
+    def find_all(self, text):
+        """Return the ids of all phrases that occur as substrings of text"""
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            if self.output[state]:
+                found.update(self.output[state])
+        return found
+
+
+class CharIndex:
+    """Inverted index from characters to the strings containing them.
+
+    The shared-character count it produces is the same upper bound that
+    difflib's quick_ratio() uses, so a string it rejects can never pass
+    SequenceMatcher.ratio() for the same threshold.
+    """
+
+    def __init__(self, strings):
+        self.strings = list(strings)
+        self.lengths = [len(string) for string in self.strings]
+        self.postings = defaultdict(list)
+        for string_id, string in enumerate(self.strings):
+            for char, count in Counter(string).items():
+                self.postings[char].append((string_id, count))
+
+    def candidates(self, word, threshold):
+        """Yield ids of strings whose ratio bound against word exceeds threshold"""
+        overlap = defaultdict(int)
+        for char, count in Counter(word).items():
+            for string_id, indexed_count in self.postings.get(char, ()):
+                overlap[string_id] += min(count, indexed_count)
+
+        word_length = len(word)
+        for string_id, common in overlap.items():
+            if 2.0 * common / (word_length + self.lengths[string_id]) > threshold:
+                yield string_id
+
+
+class IntentIndex:
+    """Intent scorer built once from INTENT_PATTERNS.
+
+    Produces the same scores as matching every pattern against the text
+    (+2 per pattern found) and every token against every pattern with
+    difflib (+1 per ratio above the threshold), without the full scan.
+    Patterns of leading_intents only count as whole words opening the text.
+    """
+
+    TOKEN_CACHE_SIZE = 4096
+
+    def __init__(self, intent_patterns, fuzzy_threshold=0.8, leading_intents=()):
+        self.intents = list(intent_patterns)
+        self.fuzzy_threshold = fuzzy_threshold
+
+        # The same phrase may be listed under several intents (or twice in one)
+        self.phrases = []
+        self.phrase_intents = []
+        phrase_ids = {}
+        for intent, patterns in intent_patterns.items():
+            for pattern in patterns:
+                if pattern not in phrase_ids:
+                    phrase_ids[pattern] = len(self.phrases)
+                    self.phrases.append(pattern)
+                    self.phrase_intents.append(Counter())
+                self.phrase_intents[phrase_ids[pattern]][intent] += 1
+
+        # Leading phrases are matched with a regex instead of anywhere in the text
+        self.leading = {}
+        for intent in leading_intents:
+            for pattern in intent_patterns.get(intent, ()):
+                self.leading[phrase_ids[pattern]] = re.compile(re.escape(pattern) + r'\b')
+        self.automaton = PhraseAutomaton(self.phrases)
+        self.char_index = CharIndex(self.phrases)
+        self._token_hits = {}
+
+    def fuzzy_hits(self, token):
+        """Return (intent, count) pairs for patterns that fuzzily match token"""
+        hits = self._token_hits.get(token)
+        if hits is None:
+            counts = Counter()
+            for phrase_id in self.char_index.candidates(token, self.fuzzy_threshold):
+                ratio = difflib.SequenceMatcher(
+                    None, token, self.phrases[phrase_id]).ratio()
+                if ratio > self.fuzzy_threshold:
+                    counts.update(self.phrase_intents[phrase_id])
+            hits = tuple(counts.items())
+
+            if len(self._token_hits) >= self.TOKEN_CACHE_SIZE:
+                self._token_hits.clear()
+            self._token_hits[token] = hits
+        return hits
+
+    def score(self, text_lower, tokens):
+        """Score every intent for an already lowered text and its tokens"""
+        scores = dict.fromkeys(self.intents, 0)
+
+        # Exact phrase occurrences
+        for phrase_id in self.automaton.find_all(text_lower):
+            if phrase_id in self.leading and not self.leading[phrase_id].match(text_lower):
+                continue
+            for intent, count in self.phrase_intents[phrase_id].items():
+                scores[intent] += 2 * count
+
+        # Partial matches in tokens
+        for token in tokens:
+            for intent, count in self.fuzzy_hits(token):
+                scores[intent] += count
+
+        return scores
@@ -0,0 +1,86 @@
+from components.config import (EARLY_INTENT_THRESHOLD, EARLY_INTENT_STABLE_UPDATES,
+                               EARLY_INTENT_MIN_WORDS)
+
+
+class LikelyIntent:
+    """Event emitted once partial transcripts have settled on an intent"""
+
+    def __init__(self, intent, confidence, text, words):
+        self.intent = intent
+        self.confidence = confidence
+        self.text = text
+        self.words = words
+
+    def __repr__(self):
+        return f"LikelyIntent({self.intent!r}, {self.confidence:.2f}, after {self.words} words)"
+
+
+class IntentTracker:
+    """Updates intent hypotheses as a transcript grows word by word.
+
+    Every new partial transcript is ranked with the intent vectorizer. Once
+    the same intent has led for EARLY_INTENT_STABLE_UPDATES updates with at
+    least EARLY_INTENT_THRESHOLD confidence, a LikelyIntent event is passed
+    to on_likely_intent (once per intent and utterance) so slow work can
+    start before the speaker has finished.
+    """
+
+    def __init__(self, intent_vectorizer, on_likely_intent=None, threshold=EARLY_INTENT_THRESHOLD,
+                 stable_updates=EARLY_INTENT_STABLE_UPDATES, min_words=EARLY_INTENT_MIN_WORDS, k=3):
+        self.intent_vectorizer = intent_vectorizer
+        self.on_likely_intent = on_likely_intent
+        self.threshold = threshold
+        self.stable_updates = stable_updates
+        self.min_words = min_words
+        self.k = k
+        self.reset()
+
+    def reset(self):
+        """Forget the current utterance"""
+        self.text = ""
+        self.hypotheses = []
+        self.events = []
+        self._leader = None
+        self._streak = 0
+
+    @property
+    def likely_intent(self):
+        """The intent an event was emitted for, while it still leads"""
+        if self.events and self.events[-1].intent == self._leader:
+            return self._leader
+        return None
+
+    def update(self, partial):
+        """Rank a new partial transcript; returns a LikelyIntent if one was emitted"""
+        text = ' '.join(partial.lower().split())
+        if not text or text == self.text:
+            return None
+        self.text = text
+
+        self.hypotheses = self.intent_vectorizer.top_k(text, self.k)
+        intent, confidence = self.hypotheses[0]
+        if intent == self._leader:
+            self._streak += 1
+        else:
+            self._leader = intent
+            self._streak = 1
+
+        words = len(text.split())
+        if words < self.min_words or confidence < self.threshold or \
+                self._streak < self.stable_updates:
+            return None
+        if any(event.intent == intent for event in self.events):
+            return None
+
+        event = LikelyIntent(intent, confidence, text, words)
+        self.events.append(event)
+        if self.on_likely_intent:
+            self.on_likely_intent(event)
+        return event
+
+    def feed_words(self, words):
+        """Feed a transcript one word at a time, as a streaming recognizer would"""
+        self.reset()
+        for i in range(1, len(words) + 1):
+            self.update(' '.join(words[:i]))
+        return self.events
@@ -0,0 +1,78 @@
+import numpy as np
+
+
+class IntentVectorizer:
+    """Character n-gram model of INTENT_PATTERNS scored with one matrix product.
+
+    Every pattern becomes an L2-normalised row of n-gram counts; an intent
+    scores the best cosine similarity among its patterns, and confidences
+    are a softmax over those scores.
+    """
+
+    def __init__(self, intent_patterns, ngram_size=3, temperature=0.05):
+        self.ngram_size = ngram_size
+        self.temperature = temperature
+        self.intents = []
+        self.vocabulary = {}
+
+        rows = []
+        starts = []
+        for intent, patterns in intent_patterns.items():
+            if not patterns:
+                continue
+            self.intents.append(intent)
+            starts.append(len(rows))
+            for pattern in patterns:
+                rows.append(self._ngrams(pattern, grow=True))
+
+        self.group_starts = np.array(starts)
+        self.matrix = np.zeros((len(rows), len(self.vocabulary)), dtype=np.float32)
+        for row, counts in enumerate(rows):
+            for column, count in counts.items():
+                self.matrix[row, column] = count
+        norms = np.linalg.norm(self.matrix, axis=1, keepdims=True)
+        self.matrix /= np.where(norms == 0, 1, norms)
+
+    def _ngrams(self, text, grow=False):
+        """Map n-gram columns to counts for text, padded at word boundaries"""
+        padded = f" {' '.join(text.lower().split())} "
+        counts = {}
+        for i in range(len(padded) - self.ngram_size + 1):
+            ngram = padded[i:i + self.ngram_size]
+            column = self.vocabulary.get(ngram)
+            if column is None:
+                if not grow:
+                    continue
+                column = self.vocabulary[ngram] = len(self.vocabulary)
+            counts[column] = counts.get(column, 0) + 1
+        return counts
+
+    def encode(self, texts):
+        """Return the normalised n-gram matrix for a list of texts"""
+        vectors = np.zeros((len(texts), len(self.vocabulary)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for column, count in self._ngrams(text).items():
+                vectors[row, column] = count
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def scores(self, texts):
+        """Cosine score of every intent for every text, shape (texts, intents)"""
+        pattern_scores = self.encode(texts) @ self.matrix.T
+        return np.maximum.reduceat(pattern_scores, self.group_starts, axis=1)
+
+    def confidences(self, scores):
+        scaled = (scores - scores.max(axis=1, keepdims=True)) / self.temperature
+        weights = np.exp(scaled)
+        return weights / weights.sum(axis=1, keepdims=True)
+
+    def top_k_batch(self, texts, k=3):
+        """Return [(intent, confidence), ...] for the k best intents of each text"""
+        scores = self.scores(texts)
+        confidences = self.confidences(scores)
+        ranked = np.argsort(-confidences, axis=1, kind='stable')[:, :k]
+        return [[(self.intents[i], float(row_confidences[i])) for i in row]
+                for row, row_confidences in zip(ranked, confidences)]
+
+    def top_k(self, text, k=3):
+        return self.top_k_batch([text], k)[0]
@@ -0,0 +1,321 @@
+import math
+import operator
+import re
+
+from components.numbers import normalize_numbers
+
+# Raw tokens: numerals, operator symbols and words; anything else is skipped
+TOKEN = re.compile(r'\d+(?:\.\d+)?|\.\d+|\*\*|//|[-+*/^%!(),]|[a-z]+')
+NUMERAL = re.compile(r'\d+(?:\.\d+)?$|\.\d+$')
+
+# Spoken operators and functions, matched on whole words (longest phrase first)
+SPOKEN_OPERATORS = {
+    'plus': ['+'], 'add': ['+'], 'added to': ['+'], 'and': ['+'],
+    'minus': ['-'], 'subtract': ['-'], 'take away': ['-'], 'less': ['-'], 'negative': ['-'],
+    'times': ['*'], 'multiply': ['*'], 'multiplied by': ['*'], 'into': ['*'], 'x': ['*'],
+    'divide': ['/'], 'divided by': ['/'], 'over': ['/'],
+    'mod': ['mod'], 'modulo': ['mod'], 'modulus': ['mod'],
+    'power': ['^'], 'to the power of': ['^'], 'to the power': ['^'], 'raised to': ['^'],
+    'raised to the power of': ['^'], 'squared': ['^', '2'], 'cubed': ['^', '3'],
+    'square root of': ['sqrt'], 'square root': ['sqrt'], 'root of': ['sqrt'],
+    'cube root of': ['cbrt'], 'cube root': ['cbrt'],
+    'percent': ['%'], 'per cent': ['%'], 'percent of': ['%', '*'], 'per cent of': ['%', '*'],
+    'factorial of': ['factorial'],
+    'half': ['0.5', '*'], 'double': ['2', '*'], 'twice': ['2', '*'], 'triple': ['3', '*'],
+    'open bracket': ['('], 'close bracket': [')']
+}
+LONGEST_PHRASE = max(len(phrase.split()) for phrase in SPOKEN_OPERATORS)
+
+# "subtract 3 from 10", "divide 10 by 2": verb, first operand, connector, second operand
+VERB_FORMS = {
+    'add': (('and', 'to'), '+', False),
+    'subtract': (('from',), '-', True),  # operands are swapped
+    'multiply': (('by', 'and', 'with'), '*', False),
+    'divide': (('by',), '/', False),
+    'sum': (('and',), '+', False),
+    'difference': (('and',), '-', False),
+    'product': (('and',), '*', False)
+}
+
+FILLER_WORDS = {'what', 'whats', 's', 'is', 'equals', 'equal', 'to', 'the', 'result', 'of',
+                'calculate', 'compute', 'solve', 'find', 'please', 'tell', 'me', 'value',
+                'answer', 'how', 'much', 'a', 'an', 'between'}
+
+
+class MathSyntaxError(ValueError):
+    """The text is not an expression the engine understands"""
+
+
+class MathDomainError(ValueError):
+    """The expression is understood but has no (reasonable) value"""
+
+
+def _factorial(x):
+    if x < 0 or x != int(x):
+        raise MathDomainError("Factorial is only defined for whole numbers")
+    if x > 170:  # Prevent overflow
+        raise MathDomainError("Number too large for factorial calculation")
+    return math.factorial(int(x))
+
+
+def _divide(a, b):
+    if b == 0:
+        raise MathDomainError("Division by zero is undefined")
+    return a / b
+
+
+def _floor_divide(a, b):
+    if b == 0:
+        raise MathDomainError("Division by zero is undefined")
+    return a // b
+
+
+def _modulo(a, b):
+    if b == 0:
+        raise MathDomainError("Division by zero is undefined")
+    return a % b
+
+
+def _power(a, b):
+    # A negative number has no real fractional power: (-8)^0.5 is complex
+    if a < 0 and b != int(b):
+        raise MathDomainError("A negative number has no real fractional power")
+    # Refuse results with more than about a thousand digits; 10^-1001 is tiny, not large
+    if a != 0 and b * math.log10(abs(a)) > 1000:
+        raise MathDomainError("That number is too large")
+    return a ** b
+
+
+def _cube_root(x):
+    return math.copysign(abs(x) ** (1 / 3), x)
+
+
+def _log(x, base=10):
+    return math.log(x, base)
+
+
+# Trigonometry works in degrees, as spoken questions ("sin 30") expect
+FUNCTIONS = {
+    'sqrt': math.sqrt, 'cbrt': _cube_root, 'factorial': _factorial,
+    'sin': lambda x: math.sin(math.radians(x)),
+    'cos': lambda x: math.cos(math.radians(x)),
+    'tan': lambda x: math.tan(math.radians(x)),
+    'log': _log, 'ln': math.log, 'exp': math.exp,
+    'abs': abs, 'round': round, 'floor': math.floor, 'ceil': math.ceil
+}
+CONSTANTS = {'pi': math.pi, 'e': math.e}
+
+BINARY_OPERATORS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '/': _divide,
+    '//': _floor_divide, 'mod': _modulo, '^': _power, '**': _power
+}
+POSTFIX_OPERATORS = {'!': _factorial, '%': lambda x: x / 100}
+
+# Pratt parser binding powers
+INFIX_BP = {'+': 10, '-': 10, '*': 20, '/': 20, '//': 20, 'mod': 20, '^': 30, '**': 30}
+RIGHT_ASSOCIATIVE = {'^', '**'}
+UNARY_BP = 25  # -2^2 is -(2^2), sqrt 16 + 9 is sqrt(16) + 9
+POSTFIX_BP = 40
+
+
+def format_number(value):
+    """Round to 6 decimal places and drop a zero fraction"""
+    if isinstance(value, float):
+        value = round(value, 6)
+        if value.is_integer():
+            value = int(value)
+    return value
+
+
+def _starts_operand(token):
+    return (token is not None and (NUMERAL.match(token) is not None or token == '('
+                                   or token in FUNCTIONS or token in CONSTANTS))
+
+
+class _Parser:
+    """Pratt parser from tokens to a tree of tuples"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self, offset=0):
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def next(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def expect(self, token):
+        if self.next() != token:
+            raise MathSyntaxError(f"Expected '{token}'")
+
+    def parse(self):
+        if not self.tokens:
+            raise MathSyntaxError("No expression found")
+        node = self.expression(0)
+        if self.peek() is not None:
+            raise MathSyntaxError(f"Unexpected '{self.peek()}'")
+        return node
+
+    def expression(self, rbp):
+        node = self.prefix(self.next())
+        while True:
+            token = self.peek()
+            if token == '%' and _starts_operand(self.peek(1)):
+                # "10 % 3" is a remainder; "10 %" and "10 % * 50" are percentages
+                token = 'mod'
+            elif token in POSTFIX_OPERATORS:
+                if POSTFIX_BP <= rbp:
+                    return node
+                self.next()
+                node = ('postfix', token, node)
+                continue
+
+            lbp = INFIX_BP.get(token, 0)
+            if lbp <= rbp:
+                return node
+            self.next()
+            right_bp = lbp - 1 if token in RIGHT_ASSOCIATIVE else lbp
+            node = ('binary', token, node, self.expression(right_bp))
+
+    def prefix(self, token):
+        if token is None:
+            raise MathSyntaxError("Incomplete expression")
+        if NUMERAL.match(token):
+            return ('number', float(token) if '.' in token else int(token))
+        if token in ('-', '+'):
+            return ('negate' if token == '-' else 'plus', self.expression(UNARY_BP))
+        if token == '(':
+            node = self.expression(0)
+            self.expect(')')
+            return node
+        if token in CONSTANTS:
+            return ('number', CONSTANTS[token])
+        if token in FUNCTIONS:
+            if self.peek() == '(':
+                self.next()
+                args = [self.expression(0)]
+                while self.peek() == ',':
+                    self.next()
+                    args.append(self.expression(0))
+                self.expect(')')
+            else:
+                args = [self.expression(UNARY_BP)]
+            return ('call', token, args)
+        raise MathSyntaxError(f"Unexpected '{token}'")
+
+
+def _compile(node):
+    # Turn the parse tree into nested closures, so cached expressions
+    # are evaluated without walking the tree again
+    kind = node[0]
+    if kind == 'number':
+        value = node[1]
+        return lambda: value
+    if kind == 'negate':
+        operand = _compile(node[1])
+        return lambda: -operand()
+    if kind == 'plus':
+        return _compile(node[1])
+    if kind == 'binary':
+        func, left, right = BINARY_OPERATORS[node[1]], _compile(node[2]), _compile(node[3])
+        return lambda: func(left(), right())
+    if kind == 'postfix':
+        func, operand = POSTFIX_OPERATORS[node[1]], _compile(node[2])
+        return lambda: func(operand())
+    func, args = FUNCTIONS[node[1]], [_compile(arg) for arg in node[2]]
+    return lambda: func(*[arg() for arg in args])
+
+
+class MathEngine:
+    """Evaluates spoken or typed arithmetic locally, without eval().
+
+    Spoken operators and numbers are turned into tokens, parsed with a
+    Pratt parser (precedence, right-associative powers, postfix factorial
+    and percent, functions with or without parentheses) and compiled to
+    closures. Compiled expressions are cached by their normalized text.
+    """
+
+    CACHE_SIZE = 512
+
+    def __init__(self):
+        self._cache = {}
+
+    def tokenize(self, text):
+        """Turn spoken or typed maths into expression tokens"""
+        text = text.lower().replace('×', '*').replace('÷', '/')
+        text = re.sub(r'(?<=\d),(?=\d{3}\b)', '', text)  # 1,000 -> 1000
+        words = TOKEN.findall(normalize_numbers(text))
+        while words and words[0] in FILLER_WORDS:
+            words.pop(0)
+        return self._verb_form(words) or self._implicit_product(self._spoken_operators(words))
+
+    def _verb_form(self, words):
+        if not words or words[0] not in VERB_FORMS:
+            return None
+        connectors, symbol, swapped = VERB_FORMS[words[0]]
+        for i in range(2, len(words) - 1):
+            if words[i] in connectors:
+                first = self._implicit_product(self._spoken_operators(words[1:i]))
+                second = self._implicit_product(self._spoken_operators(words[i + 1:]))
+                if swapped:
+                    first, second = second, first
+                return ['('] + first + [')', symbol, '('] + second + [')']
+        return None
+
+    def _spoken_operators(self, words):
+        tokens = []
+        i = 0
+        while i < len(words):
+            for length in range(min(LONGEST_PHRASE, len(words) - i), 0, -1):
+                phrase = ' '.join(words[i:i + length])
+                if phrase in SPOKEN_OPERATORS:
+                    tokens.extend(SPOKEN_OPERATORS[phrase])
+                    i += length
+                    break
+            else:
+                word = words[i]
+                if word == '%' and i + 1 < len(words) and words[i + 1] == 'of':
+                    # "25% of 80" is a percentage, as "25 percent of 80" is; "of"
+                    # would otherwise be dropped and the % read as a remainder
+                    tokens.extend(SPOKEN_OPERATORS['percent of'])
+                    i += 1
+                elif word == 'factorial':
+                    # "5 factorial" is postfix; "factorial 5" is a function call
+                    after_operand = tokens and (NUMERAL.match(tokens[-1]) or tokens[-1] == ')')
+                    tokens.append('!' if after_operand else 'factorial')
+                elif word not in FILLER_WORDS:
+                    tokens.append(word)
+                i += 1
+        return tokens
+
+    def _implicit_product(self, tokens):
+        # Two bare numbers ("5 5") are taken as a product
+        if len(tokens) == 2 and all(NUMERAL.match(token) for token in tokens):
+            return [tokens[0], '*', tokens[1]]
+        return tokens
+
+    def compile(self, text):
+        """Return a cached callable computing the expression in text"""
+        key = ' '.join(text.lower().split())
+        compiled = self._cache.get(key)
+        if compiled is None:
+            compiled = _compile(_Parser(self.tokenize(key)).parse())
+            if len(self._cache) >= self.CACHE_SIZE:
+                self._cache.clear()
+            self._cache[key] = compiled
+        return compiled
+
+    def evaluate(self, text):
+        """Evaluate an expression; raises MathSyntaxError or MathDomainError"""
+        compiled = self.compile(text)
+        try:
+            return compiled()
+        except MathDomainError:
+            raise
+        except (ArithmeticError, ValueError, TypeError) as e:
+            # math domain errors, overflows, round() of a huge float...
+            raise MathDomainError(str(e))
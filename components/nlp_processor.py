@@ -1,63 +1,144 @@
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from nltk.chunk import ne_chunk
-from nltk.tag import pos_tag
-from textblob import TextBlob
-import spacy
-import difflib
-from components.config import NLTK_DOWNLOADS, SPACY_MODEL, INTENT_PATTERNS, EMOTION_PATTERNS
+import re
+import time
+from collections import Counter
+from components.config import (INTENT_PATTERNS, EMOTION_PATTERNS, NLP_STARTUP_BUDGET,
+                               SPACY_BATCH_SIZE, SPACY_N_PROCESS, BATCH_CHUNK_SIZE,
+                               FUZZY_MATCH_CUTOFF, FUZZY_PHRASE_MIN_COUNT, SENTIMENT_ENGINE,
+                               ANALYSIS_STAGES, INTENT_STAGE_PLAN, LEADING_INTENTS)
+from components.batch_analyzer import analyze_batch
+from components.nlp_resources import NLPResources
+from components.intent_index import IntentIndex
+from components.intent_vectorizer import IntentVectorizer
+from components.intent_tracker import IntentTracker
+from components.fuzzy_index import FuzzyIndex
+from components.entity_rules import EntityRuleEngine
+from components.utterance import AnalyzedUtterance
+
+# Separates the cities of "weather in pune, mumbai and delhi"
+CITY_SEPARATOR = re.compile(r'\s*(?:,|&|\band\b)\s*')
 
 
 class NLPProcessor:
     def __init__(self):
+        started = time.perf_counter()
         self.setup_nlp()
+        # Compile the entity regex tables once
+        self.entity_rules = EntityRuleEngine()
+        self.phrase_counts = Counter()
+        self.patterns_version = 0
+        self.build_pattern_indexes()
+        self.setup_time = time.perf_counter() - started
+
+        if self.setup_time > NLP_STARTUP_BUDGET:
+            print(f"NLP setup took {self.setup_time:.2f}s "
+                  f"(budget {NLP_STARTUP_BUDGET:.2f}s)")
+            print(self.resources.format_startup_report())
+
+    def build_pattern_indexes(self):
+        # Build the intent index once instead of scanning every pattern per command
+        self.intent_index = IntentIndex(INTENT_PATTERNS, leading_intents=LEADING_INTENTS)
+        # Suggestions for unknown commands: every pattern plus frequent user phrases
+        self.fuzzy_index = FuzzyIndex(
+            pattern for patterns in INTENT_PATTERNS.values() for pattern in patterns)
+        self.fuzzy_index.add_phrases(phrase for phrase, count in self.phrase_counts.items()
+                                     if count >= FUZZY_PHRASE_MIN_COUNT)
+        self._intent_vectorizer = None
+
+    def reload_patterns(self):
+        """Rebuild everything derived from INTENT_PATTERNS after it was changed"""
+        self.build_pattern_indexes()
+        # Anything cached against the old patterns is now stale
+        self.patterns_version += 1
 
     def setup_nlp(self):
-        try:
-            # Download NLTK data if not already present
-            for item in NLTK_DOWNLOADS:
-                try:
-                    nltk.data.find(f'tokenizers/{item}')
-                except LookupError:
-                    nltk.download(item, quiet=True)
-            # Initialize NLP tools
-            self.lemmatizer = WordNetLemmatizer()
-            self.stop_words = set(stopwords.words('english'))
-            # Try to load spaCy model
-            try:
-                self.nlp = spacy.load(SPACY_MODEL)
-            except OSError:
-                print(
-                    f"spaCy model not found. Install with: python -m spacy download {SPACY_MODEL}")
-                self.nlp = None
-
-        except Exception as e:
-            print(f"NLP setup warning: {e}")
-
-    def preprocess_text(self, text):
-        # Convert to lowercase
-        text = text.lower()
-
-        # Tokenize
-        tokens = word_tokenize(text)
-
+        # Models and NLTK data are loaded lazily, the first time they are needed
+        self.resources = NLPResources()
+
+    @property
+    def nlp(self):
+        return self.resources.spacy_model()
+
+    @property
+    def lemmatizer(self):
+        return self.resources.lemmatizer()
+
+    @property
+    def stop_words(self):
+        return self.resources.stop_words()
+
+    def get_startup_report(self):
+        """Time spent loading each NLP resource, in milliseconds"""
+        report = {'setup': round(self.setup_time * 1000, 1)}
+        report.update(self.resources.startup_report())
+        return report
+
+    def analyze(self, text):
+        """Start a shared analysis of text; stages are computed once, on demand"""
+        return AnalyzedUtterance(text, self)
+
+    def _as_utterance(self, text):
+        if isinstance(text, AnalyzedUtterance):
+            return text
+        return self.analyze(text)
+
+    def tokenize(self, text):
+        return self.resources.word_tokenize()(text)
+
+    def lemmatize_tokens(self, tokens):
+        stop_words = self.stop_words
+        lemmatizer = self.lemmatizer
         # Remove stopwords and lemmatize
         processed_tokens = []
         for token in tokens:
-            if token not in self.stop_words and token.isalpha():
-                lemmatized = self.lemmatizer.lemmatize(token)
+            if token not in stop_words and token.isalpha():
+                lemmatized = lemmatizer.lemmatize(token)
                 processed_tokens.append(lemmatized)
 
         return processed_tokens
 
+    def parse(self, text):
+        """Run the spaCy pipeline, or return None when no model is loaded"""
+        nlp = self.nlp
+        if nlp:
+            return nlp(text)
+        return None
+
+    def preprocess_text(self, text):
+        # Convert to lowercase, tokenize, remove stopwords and lemmatize
+        return self.lemmatize_tokens(self.tokenize(text.lower()))
+
     def extract_entities(self, text):
+        utterance = self._as_utterance(text)
+        doc = utterance.doc
+        return utterance.measure('entities', lambda: self._extract_entities(utterance.text, doc))
+
+    def extract_rule_entities(self, text):
+        """Only the rule-based entities (UI actions, directions, times...), without spaCy"""
+        utterance = self._as_utterance(text)
+        return utterance.measure('rule_entities', lambda: self._rule_entities(utterance.text))
+
+    def _rule_entities(self, text):
+        entities = self.entity_rules.apply(text, {})
+        return {k: v for k, v in entities.items() if v}
+
+    def extract_entities_batch(self, texts, batch_size=SPACY_BATCH_SIZE, n_process=SPACY_N_PROCESS):
+        """Yield the entities dict of each text, in order, running spaCy through nlp.pipe"""
+        nlp = self.nlp
+        if nlp is None:
+            for text in texts:
+                yield self._extract_entities(text, None)
+            return
+
+        docs = nlp.pipe(((text, text) for text in texts), as_tuples=True,
+                        batch_size=batch_size, n_process=n_process)
+        for doc, text in docs:
+            yield self._extract_entities(text, doc)
+
+    def _extract_entities(self, text, doc):
         entities = {}
 
-        if self.nlp:
+        if doc is not None:
             # Use spaCy for entity extraction
-            doc = self.nlp(text)
             for ent in doc.ents:
                 # Clean and normalize entity text
                 entity_text = ent.text.strip().title()
@@ -71,7 +152,8 @@ class NLPProcessor:
         else:
             # Fallback to NLTK
             try:
-                tokens = word_tokenize(text)
+                pos_tag, ne_chunk = self.resources.ne_chunker()
+                tokens = self.tokenize(text)
                 pos_tags = pos_tag(tokens)
                 chunks = ne_chunk(pos_tags)
 
@@ -92,192 +174,7 @@ class NLPProcessor:
                 # Continue with empty entities if NLTK fails
 
         # Post-processing: Add manual entity detection for common patterns
-        text_lower = text.lower()
-
-        # Detect city names from common weather patterns
-        weather_city_patterns = [
-            r'(?:tell\s+me\s+the\s+)?weather\s+(?:in|for|of)\s+([a-zA-Z\s]+)',
-            r'(?:tell\s+me\s+the\s+)?temperature\s+(?:in|for|of)\s+([a-zA-Z\s]+)',
-            r'(?:what\s+is\s+the\s+)?weather\s+(?:in|for|of)\s+([a-zA-Z\s]+)',
-            r'(?:what\s+is\s+the\s+)?temperature\s+(?:in|for|of)\s+([a-zA-Z\s]+)',
-            r'(?:in|at)\s+([a-zA-Z\s]+)\s+weather',
-            r'weather\s+in\s+([a-zA-Z\s]+)',
-            r'weather\s+for\s+([a-zA-Z\s]+)',
-            r'weather\s+of\s+([a-zA-Z\s]+)',
-            r'([a-zA-Z\s]+)\s+weather'
-        ]
-
-        for pattern in weather_city_patterns:
-            import re
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                city = match.strip().title()
-                # Filter out common non-city words
-                non_cities = ['he', 'weather', 'today', 'tell me' 'tomorrow',
-                              'now', 'current', 'is', 'what', 'how', 'the', 'and']
-                if city and city not in non_cities and len(city) > 1:
-                    if 'GPE' not in entities:
-                        entities['GPE'] = []
-                    if city not in entities['GPE']:
-                        entities['GPE'].append(city)
-
-        # Detect mathematical expressions for calculation
-        math_patterns = [
-            r'\b\d+(?:\.\d+)?\b',  # Numbers
-            r'\b(?:plus|minus|times|divide|multiply|add|subtract)\b',  # Math words
-            # Number words
-            r'\b(?:one|two|three|four|five|six|seven|eight|nine|ten)\b'
-        ]
-
-        math_found = False
-        for pattern in math_patterns:
-            if re.search(pattern, text_lower):
-                math_found = True
-                break
-
-        if math_found:
-            if 'MATH' not in entities:
-                entities['MATH'] = []
-            entities['MATH'].append('mathematical_expression')
-
-        # Detect time expressions for reminders
-        time_patterns = [
-            r'\b(?:at|in) (\d{1,2}(?::\d{2})?\s*(?:am|pm|AM|PM)?)\b',
-            r'\b(?:after|in) (\d+)\s*(?:minutes?|hours?|days?)\b',
-            r'\b(?:tomorrow|today|tonight|morning|afternoon|evening)\b'
-        ]
-
-        for pattern in time_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                if 'TIME' not in entities:
-                    entities['TIME'] = []
-                for match in matches:
-                    time_expr = match if isinstance(
-                        match, str) else ' '.join(match)
-                    if time_expr not in entities['TIME']:
-                        entities['TIME'].append(time_expr.strip())
-
-        # Enhanced UI control actions and directions detection
-        ui_action_patterns = {
-            # Tab controls
-            'switch_tab': [
-                r'\b(?:switch|change|move|go)\s+(?:to\s+)?(?:the\s+)?(?:next|previous|left|right)\s+tab\b',
-                r'\b(?:next|previous|left|right)\s+tab\b'
-            ],
-            'close_tab': [r'\bclose\s+(?:this\s+|current\s+)?tab\b'],
-            'new_tab': [r'\b(?:new|open)\s+tab\b', r'\bopen\s+(?:a\s+)?new\s+tab\b'],
-
-            # Window controls
-            'close_window': [r'\bclose\s+(?:this\s+|current\s+)?window\b'],
-            'minimize_window': [r'\bminimize\s+(?:this\s+|current\s+)?window\b'],
-            'maximize_window': [r'\bmaximize\s+(?:this\s+|current\s+)?window\b'],
-
-            # Volume controls
-            'volume_up': [
-                r'\b(?:increase|turn\s+up|raise)\s+(?:the\s+)?volume\b',
-                r'\bvolume\s+up\b'
-            ],
-            'volume_down': [
-                r'\b(?:decrease|turn\s+down|lower)\s+(?:the\s+)?volume\b',
-                r'\bvolume\s+down\b'
-            ],
-            'mute': [r'\bmute\s+(?:the\s+)?(?:volume|sound|audio)\b', r'\bmute\b'],
-
-            # Media controls
-            'pause': [
-                r'\bpause\b(?!\s+play)',  # pause but not "pause play"
-                r'\bpause\s+(?:music|video|media|audio)\b'
-            ],
-            'play': [
-                r'\bplay\b(?!\s+pause)',  # play but not "play pause"
-                r'\bplay\s+(?:music|video|media|audio)\b',
-                r'\bresume\b'
-            ],
-            'pause_play': [
-                r'\bpause\s+play\b', r'\bplay\s+pause\b',
-                r'\btoggle\s+(?:play|pause)\b'
-            ],
-            'next_track': [
-                r'\b(?:next|skip)\s+(?:track|song|music)\b',
-                r'\bskip\b(?!\s+(?:to|forward))',
-                r'\bnext\s+(?:song|track)\b'
-            ],
-            'previous_track': [
-                r'\b(?:previous|back)\s+(?:track|song|music)\b',
-                r'\bprevious\s+(?:song|track)\b',
-                r'\bback\s+(?:song|track)\b'
-            ],
-
-            # Screenshot
-            'screenshot': [
-                r'\btake\s+(?:a\s+)?screenshot\b',
-                r'\bscreenshot\b',
-                r'\bcapture\s+screen\b'
-            ],
-
-            # Text input and editing
-            'type_text': [r'\btype\s+(.+)', r'\bwrite\s+(.+)', r'\binput\s+(.+)'],
-            'copy': [r'\bcopy\b', r'\bctrl\s*c\b'],
-            'paste': [r'\bpaste\b', r'\bctrl\s*v\b'],
-            'select_all': [r'\bselect\s+all\b', r'\bctrl\s*a\b'],
-            'undo': [r'\bundo\b', r'\bctrl\s*z\b'],
-            'redo': [r'\bredo\b', r'\bctrl\s*y\b'],
-
-            # Application and navigation
-            'alt_tab': [r'\balt\s+tab\b', r'\bswitch\s+(?:app|application)\b'],
-            'refresh': [r'\brefresh\b', r'\breload\b', r'\bf5\b'],
-            'go_back': [r'\bgo\s+back\b', r'\bback\b', r'\bprevious\s+page\b'],
-            'go_forward': [r'\bgo\s+forward\b', r'\bforward\b', r'\bnext\s+page\b']
-        }
-
-        direction_patterns = {
-            'next': [r'\bnext\b', r'\bright\b'],
-            'previous': [r'\bprevious\b', r'\bprev\b', r'\bleft\b', r'\bback\b']
-        }
-
-        # Check for UI actions
-        for action, patterns in ui_action_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    if 'UI_ACTION' not in entities:
-                        entities['UI_ACTION'] = []
-                    if action not in entities['UI_ACTION']:
-                        entities['UI_ACTION'].append(action)
-
-        # Check for directions (for tab switching)
-        for direction, patterns in direction_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    if 'DIRECTION' not in entities:
-                        entities['DIRECTION'] = []
-                    if direction not in entities['DIRECTION']:
-                        entities['DIRECTION'].append(direction)
-
-        # Extract text to type for type_text action
-        type_patterns = [
-            r'\btype\s+["\'](.+?)["\']',  # "type 'hello world'"
-            r'\btype\s+(.+)',             # "type hello world"
-            r'\bwrite\s+["\'](.+?)["\']',  # "write 'hello world'"
-            r'\bwrite\s+(.+)',            # "write hello world"
-            r'\binput\s+["\'](.+?)["\']',  # "input 'hello world'"
-            r'\binput\s+(.+)'             # "input hello world"
-        ]
-
-        for pattern in type_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                if 'TEXT_TO_TYPE' not in entities:
-                    entities['TEXT_TO_TYPE'] = []
-                for match in matches:
-                    text_content = match.strip()
-                    # Remove common ending words that might be captured
-                    ending_words = ['please', 'now', 'here']
-                    for word in ending_words:
-                        if text_content.endswith(' ' + word):
-                            text_content = text_content[:-len(' ' + word)]
-                    if text_content and text_content not in entities['TEXT_TO_TYPE']:
-                        entities['TEXT_TO_TYPE'].append(text_content)
+        self.entity_rules.apply(text, entities)
 
         # Clean up empty entity lists
         entities = {k: v for k, v in entities.items() if v}
@@ -285,32 +182,54 @@ class NLPProcessor:
         return entities
 
     def analyze_sentiment(self, text):
-        blob = TextBlob(text)
-        sentiment = blob.sentiment
-
-        if sentiment.polarity > 0.1:
+        utterance = self._as_utterance(text)
+        return utterance.measure('sentiment', lambda: self._polarity_label(self.polarity(utterance)))
+
+    def analyze_sentiment_batch(self, texts):
+        """Sentiment labels for many texts, e.g. when analysing logs"""
+        lexicon = self.sentiment_lexicon
+        if lexicon is None:
+            polarities = [self._textblob_polarity(text) for text in texts]
+        else:
+            polarities = lexicon.polarity_batch(self.tokenize(text.lower()) for text in texts)
+        return [self._polarity_label(polarity) for polarity in polarities]
+
+    @property
+    def sentiment_lexicon(self):
+        """The compiled lexicon, or None when SENTIMENT_ENGINE asks for TextBlob"""
+        if SENTIMENT_ENGINE != 'lexicon':
+            return None
+        return self.resources.sentiment_lexicon()
+
+    def polarity(self, text):
+        utterance = self._as_utterance(text)
+        lexicon = self.sentiment_lexicon
+        if lexicon is None:
+            return self._textblob_polarity(utterance.text)
+        return lexicon.polarity(utterance.tokens)
+
+    def _textblob_polarity(self, text):
+        TextBlob = self.resources.textblob()
+        return TextBlob(text).sentiment.polarity
+
+    def _polarity_label(self, polarity):
+        if polarity > 0.1:
             return 'positive'
-        elif sentiment.polarity < -0.1:
+        elif polarity < -0.1:
             return 'negative'
         else:
             return 'neutral'
 
-    def classify_intent(self, text):
-        text_lower = text.lower()
-        tokens = self.preprocess_text(text)
+    def intent_scores(self, text):
+        """Keyword score of every intent for text"""
+        utterance = self._as_utterance(text)
+        tokens = utterance.lemmas
+        return utterance.measure(
+            'intent', lambda: self.intent_index.score(utterance.lowered, tokens))
 
+    def classify_intent(self, text):
         # Score each intent based on keyword matching
-        intent_scores = {}
-        for intent, patterns in INTENT_PATTERNS.items():
-            score = 0
-            for pattern in patterns:
-                if pattern in text_lower:
-                    score += 2
-                # Check for partial matches in tokens
-                for token in tokens:
-                    if difflib.SequenceMatcher(None, token, pattern).ratio() > 0.8:
-                        score += 1
-            intent_scores[intent] = score
+        intent_scores = self.intent_scores(text)
 
         # Return the intent with highest score
         if intent_scores:
@@ -320,39 +239,75 @@ class NLPProcessor:
 
         return 'unknown'
 
-    def extract_parameters(self, text, intent):
-        entities = self.extract_entities(text)
+    @property
+    def intent_vectorizer(self):
+        # Built on first use so the n-gram matrix does not slow down startup
+        if self._intent_vectorizer is None:
+            self._intent_vectorizer = IntentVectorizer(INTENT_PATTERNS)
+        return self._intent_vectorizer
+
+    def rank_intents(self, text, k=3):
+        """Return the k most likely intents as (intent, confidence) pairs"""
+        utterance = self._as_utterance(text)
+        ranked = utterance.measure(
+            'intent_ranking', lambda: self.intent_vectorizer.top_k(utterance.lowered, len(INTENT_PATTERNS)))
+        return ranked[:k]
+
+    def rank_intents_batch(self, texts, k=3):
+        """rank_intents for many texts with a single matrix product"""
+        return self.intent_vectorizer.top_k_batch([text.lower() for text in texts], k)
+
+    def track_intent(self, on_likely_intent=None):
+        """Start incremental intent detection for partial transcripts"""
+        return IntentTracker(self.intent_vectorizer, on_likely_intent)
+
+    def stage_plan(self, intent):
+        """Analysis stages the handler for intent needs"""
+        return INTENT_STAGE_PLAN.get(intent, ANALYSIS_STAGES)
+
+    def extract_parameters(self, text, intent, stages=None):
+        utterance = self._as_utterance(text)
+        text = utterance.text
+        # Only run the entity stage this intent's handler reads, unless told otherwise
+        stages = stages or self.stage_plan(intent)
+        if 'entities' in stages:
+            entities = utterance.entities
+        elif 'rules' in stages:
+            entities = utterance.rule_entities
+        else:
+            entities = {}
         params = {}
 
         if intent == 'search':
             # For search, extract the query after common search terms
             search_terms = ['search for', 'tell me about',
                             'what is', 'who is', 'find']
-            query = text.lower()
+            query = utterance.lowered
             for term in search_terms:
                 if term in query:
                     params['query'] = query.split(term, 1)[1].strip()
                     break
             if 'query' not in params:
                 # Remove common words and use remaining as query
-                tokens = self.preprocess_text(text)
+                tokens = utterance.lemmas
                 params['query'] = ' '.join(tokens)
 
         elif intent == 'open':
             # Extract website/application name
-            text_lower = text.lower().replace('open', '').strip()
+            text_lower = utterance.lowered.replace('open', '').strip()
             params['target'] = text_lower
 
         elif intent == 'weather':
             # Extract city name from weather requests
-            text_lower = text.lower()
+            text_lower = utterance.lowered
 
             # Remove common weather phrases
+            # Longest first, so "weather" cannot break up "what's the weather"
             weather_phrases = [
-                'weather', 'weather in', 'weather for', 'weather of',
-                'what is the weather', 'what\'s the weather', 'how is the weather',
-                'tell me the weather', 'get weather', 'show weather',
-                'check weather', 'temperature', 'temperature in', 'temperature of'
+                'tell me the weather', 'what is the weather', 'what\'s the weather',
+                'how is the weather', 'temperature in', 'temperature of', 'check weather',
+                'show weather', 'weather for', 'get weather', 'temperature', 'weather in',
+                'weather of', 'weather'
             ]
 
             city_text = text_lower
@@ -362,16 +317,19 @@ class NLPProcessor:
             # Remove common prepositions and articles
             remove_words = ['in', 'for', 'of', 'at', 'the',
                             'a', 'an', 'today', 'now', 'currently']
-            words = city_text.split()
-            filtered_words = [
-                word for word in words if word not in remove_words]
-
-            if filtered_words:
+            cities = []
+            for part in CITY_SEPARATOR.split(city_text):
+                filtered_words = [
+                    word for word in part.split() if word not in remove_words]
                 city = ' '.join(filtered_words).strip()
-                if city:  # Make sure we have something left
-                    params['city'] = city
-                    # Also add as location for flexibility
-                    params['location'] = city
+                if city and city not in cities:
+                    cities.append(city)
+
+            if cities:
+                params['city'] = cities[0]
+                # Also add as location for flexibility
+                params['location'] = cities[0]
+                params['cities'] = cities
 
             # Also check if entities contain location information
             if entities and 'GPE' in entities:
@@ -383,7 +341,7 @@ class NLPProcessor:
         elif intent == 'math':
             # Extract mathematical expression - improved to handle spoken math
             # Look for the entire text as potential math expression
-            math_text = text.lower()
+            math_text = utterance.lowered
 
             # Remove common calculation phrases
             calc_phrases = ['calculate', 'what is',
@@ -396,13 +354,13 @@ class NLPProcessor:
 
         elif intent == 'reminder':
             # Extract reminder text and time if present
-            reminder_text = text.lower().replace(
+            reminder_text = utterance.lowered.replace(
                 'remind me', '').replace('remember', '').strip()
             params['reminder_text'] = reminder_text
 
         elif intent == 'ui_control':
             # Extract UI control action and parameters
-            text_lower = text.lower()
+            text_lower = utterance.lowered
 
             # Extract action from entities
             if 'UI_ACTION' in entities and entities['UI_ACTION']:
@@ -458,11 +416,28 @@ class NLPProcessor:
 
         return params
 
-    def get_fuzzy_matches(self, command):
-        all_patterns = []
-        for intent_patterns in INTENT_PATTERNS.values():
-            all_patterns.extend(intent_patterns)
-
-        close_matches = difflib.get_close_matches(
-            command, all_patterns, n=1, cutoff=0.6)
-        return close_matches
+    def analyze_batch(self, source, chunk_size=BATCH_CHUNK_SIZE, processes=None,
+                      wake_word=None, report=None):
+        """Stream intent, entity and sentiment results for many utterances.
+
+        source is an iterable of utterances or a path to a log such as
+        conversation_history.json. Results come back in input order; pass a
+        BatchReport to read throughput while or after iterating.
+        """
+        return analyze_batch(self, source, chunk_size, processes, wake_word, report)
+
+    def learn_phrase(self, phrase):
+        """Count a recognised command; frequent ones become fuzzy suggestions"""
+        phrase = phrase.strip()
+        if not phrase:
+            return
+        self.phrase_counts[phrase] += 1
+        if self.phrase_counts[phrase] >= FUZZY_PHRASE_MIN_COUNT:
+            self.fuzzy_index.add(phrase)
+
+    def fuzzy_suggestions(self, command, n=3, cutoff=FUZZY_MATCH_CUTOFF):
+        """Return up to n (phrase, score) pairs closest to command, best first"""
+        return self.fuzzy_index.search(command, n, cutoff)
+
+    def get_fuzzy_matches(self, command, n=1, cutoff=FUZZY_MATCH_CUTOFF):
+        return [phrase for phrase, _ in self.fuzzy_suggestions(command, n, cutoff)]
@@ -0,0 +1,183 @@
+import json
+import threading
+import time
+import nltk
+from components.config import (DATA_DIR, NLTK_DOWNLOADS, NLP_MANIFEST_FILE,
+                               NLTK_RETRY_INTERVAL, SPACY_MODEL, SPACY_EXCLUDE)
+from components.sentiment import SentimentLexicon
+
+
+class NLPResources:
+    """Loads NLTK data, spaCy, WordNet and TextBlob the first time a code path needs them.
+
+    NLTK presence checks are cached in a small manifest, so a known resource
+    is not looked up again on the next start, and a failed download (e.g.
+    offline) is only retried after NLTK_RETRY_INTERVAL. Time spent on each
+    resource is kept for the startup report.
+    """
+
+    def __init__(self, manifest_file=NLP_MANIFEST_FILE):
+        self.manifest_file = manifest_file
+        self.manifest = self.load_manifest()
+        self.timings = {}
+        self._loaded = {}
+        self._checked = set()
+        # The prefetch and analysis pools load resources concurrently
+        self._lock = threading.RLock()
+
+    def load_manifest(self):
+        try:
+            if self.manifest_file.exists():
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Could not load NLP manifest: {e}")
+        return {}
+
+    def save_manifest(self):
+        try:
+            DATA_DIR.mkdir(exist_ok=True)
+            with open(self.manifest_file, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, indent=2)
+        except Exception as e:
+            print(f"Could not save NLP manifest: {e}")
+
+    def _record(self, name, started):
+        self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - started
+
+    def ensure_nltk(self, *names):
+        """Make sure NLTK resources are available, downloading them at most once"""
+        available = True
+        for name in names:
+            if name in self._checked:
+                if self.manifest.get(name, {}).get('status') != 'present':
+                    available = False
+                continue
+            self._checked.add(name)
+
+            entry = self.manifest.get(name, {})
+            if entry.get('status') == 'present':
+                continue
+
+            started = time.perf_counter()
+            try:
+                nltk.data.find(NLTK_DOWNLOADS[name])
+                status = 'present'
+            except LookupError:
+                if entry.get('status') == 'missing' and \
+                        time.time() - entry.get('checked', 0) < NLTK_RETRY_INTERVAL:
+                    status = 'missing'
+                else:
+                    status = 'present' if nltk.download(name, quiet=True) else 'missing'
+            self._record(f"nltk:{name}", started)
+
+            self.manifest[name] = {'status': status, 'checked': time.time()}
+            self.save_manifest()
+            if status != 'present':
+                available = False
+        return available
+
+    def mark_missing(self, name):
+        """Record a resource as missing, e.g. after it failed to load, so the
+        download is only retried after NLTK_RETRY_INTERVAL"""
+        self.manifest[name] = {'status': 'missing', 'checked': time.time()}
+        self._checked.discard(name)
+        self.save_manifest()
+
+    def _load(self, name, loader, nltk_names=()):
+        with self._lock:
+            if name not in self._loaded:
+                try:
+                    if not self.ensure_nltk(*nltk_names):
+                        raise LookupError(f"NLTK resources unavailable: {', '.join(nltk_names)}")
+                    started = time.perf_counter()
+                    try:
+                        self._loaded[name] = loader()
+                    finally:
+                        self._record(name, started)
+                except LookupError:
+                    # Missing or the manifest was stale; retry after the interval
+                    for nltk_name in nltk_names:
+                        self.mark_missing(nltk_name)
+                    raise
+            return self._loaded[name]
+
+    def word_tokenize(self):
+        def load():
+            from nltk.tokenize import word_tokenize
+            return word_tokenize
+        return self._load('tokenizer', load, ('punkt', 'punkt_tab'))
+
+    def stop_words(self):
+        def load():
+            from nltk.corpus import stopwords
+            return set(stopwords.words('english'))
+        return self._load('stopwords', load, ('stopwords',))
+
+    def lemmatizer(self):
+        def load():
+            from nltk.stem import WordNetLemmatizer
+            lemmatizer = WordNetLemmatizer()
+            # WordNet itself is read on first use; do it here so it is timed
+            lemmatizer.lemmatize('warmup')
+            return lemmatizer
+        return self._load('wordnet', load, ('wordnet',))
+
+    def ne_chunker(self):
+        """Return (pos_tag, ne_chunk) for the NLTK entity fallback"""
+        def load():
+            from nltk.chunk import ne_chunk
+            from nltk.tag import pos_tag
+            return pos_tag, ne_chunk
+        return self._load('ne_chunker', load,
+                          ('averaged_perceptron_tagger', 'maxent_ne_chunker', 'words'))
+
+    def spacy_model(self):
+        """Return the spaCy pipeline trimmed to what NER needs, or None if not installed"""
+        def load():
+            try:
+                import spacy
+            except ImportError:
+                print("spaCy is not installed. Install with: pip install spacy")
+                return None
+            try:
+                return spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+            except OSError:
+                print(
+                    f"spaCy model not found. Install with: python -m spacy download {SPACY_MODEL}")
+                return None
+            except Exception as e:
+                # A model whose NER listens to a shared tok2vec cannot be trimmed
+                print(f"Loading trimmed spaCy pipeline failed ({e}), loading full model")
+                return spacy.load(SPACY_MODEL)
+        return self._load('spacy', load)
+
+    def textblob(self):
+        def load():
+            from textblob import TextBlob
+            return TextBlob
+        return self._load('textblob', load)
+
+    def sentiment_lexicon(self):
+        """Return TextBlob's polarity lexicon compiled for token scoring, or None if unavailable"""
+        def load():
+            try:
+                return SentimentLexicon.from_textblob()
+            except ImportError:
+                print("TextBlob is not installed. Install with: pip install textblob")
+                return None
+        return self._load('sentiment_lexicon', load)
+
+    def startup_report(self):
+        """Milliseconds spent per resource so far, slowest first"""
+        return {name: round(seconds * 1000, 1)
+                for name, seconds in sorted(self.timings.items(), key=lambda item: -item[1])}
+
+    def format_startup_report(self):
+        report = self.startup_report()
+        if not report:
+            return "No NLP resources loaded yet."
+        lines = [f"NLP resources loaded ({sum(report.values()):.1f} ms total):"]
+        for name, ms in report.items():
+            lines.append(f"  {name:<32}{ms:>10.1f} ms")
+        return "\n".join(lines)
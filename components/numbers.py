@@ -0,0 +1,201 @@
+import re
+
+UNITS = {'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4,
+         'five': 5, 'six': 6, 'seven': 7, 'eight': 8, 'nine': 9}
+TEENS = {'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14,
+         'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19}
+TENS = {'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50,
+        'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90}
+SCALES = {'thousand': 10 ** 3, 'million': 10 ** 6, 'billion': 10 ** 9, 'trillion': 10 ** 12}
+# Ordinal -> cardinal word. "second" only counts inside a compound
+# ("twenty second"); on its own it is usually the unit of time.
+ORDINALS = {
+    'first': 'one', 'second': 'two', 'third': 'three', 'fourth': 'four', 'fifth': 'five',
+    'sixth': 'six', 'seventh': 'seven', 'eighth': 'eight', 'ninth': 'nine', 'tenth': 'ten',
+    'eleventh': 'eleven', 'twelfth': 'twelve', 'thirteenth': 'thirteen',
+    'fourteenth': 'fourteen', 'fifteenth': 'fifteen', 'sixteenth': 'sixteen',
+    'seventeenth': 'seventeen', 'eighteenth': 'eighteen', 'nineteenth': 'nineteen',
+    'twentieth': 'twenty', 'thirtieth': 'thirty', 'fortieth': 'forty', 'fiftieth': 'fifty',
+    'sixtieth': 'sixty', 'seventieth': 'seventy', 'eightieth': 'eighty',
+    'ninetieth': 'ninety', 'hundredth': 'hundred', 'thousandth': 'thousand',
+    'millionth': 'million'
+}
+POINT_WORDS = ('point', 'decimal')
+
+# Every cardinal number word, e.g. for regexes that only need to spot a number
+CARDINAL_WORDS = tuple(UNITS) + tuple(TEENS) + tuple(TENS) + ('hundred',) + tuple(SCALES)
+
+WORD = re.compile(r'[a-z]+|\d+(?:\.\d+)?')
+NUMERAL = re.compile(r'\d+(?:\.\d+)?$')
+# Words of one number are separated by spaces or a hyphen ("twenty-five"),
+# not by " - ", which is a minus sign
+JOINER = re.compile(r'(?:\s*|-)$')
+
+# Which kind of word may follow which, as in "two thousand and twenty four"
+FOLLOWS = {
+    'unit': (None, 'tens', 'hundred', 'scale', 'and'),
+    'teen': (None, 'hundred', 'scale', 'and'),
+    'tens': (None, 'hundred', 'scale', 'and'),
+    'hundred': ('unit', 'teen', 'tens', 'numeral'),
+    'scale': ('unit', 'teen', 'tens', 'hundred', 'numeral')
+}
+
+
+def _kind(word):
+    if word in UNITS:
+        return 'unit', UNITS[word]
+    if word in TEENS:
+        return 'teen', TEENS[word]
+    if word in TENS:
+        return 'tens', TENS[word]
+    if word == 'hundred':
+        return 'hundred', 100
+    if word in SCALES:
+        return 'scale', SCALES[word]
+    return None, None
+
+
+def _ordinal_suffix(value):
+    if 10 <= value % 100 <= 20:
+        return 'th'
+    return {1: 'st', 2: 'nd', 3: 'rd'}.get(value % 10, 'th')
+
+
+class NumberSpan:
+    """A number found in text: its position, value and whether it was an ordinal"""
+
+    def __init__(self, start, end, value, ordinal=False, spoken=True):
+        self.start = start
+        self.end = end
+        self.value = value
+        self.ordinal = ordinal
+        self.spoken = spoken  # False for a plain numeral such as "25"
+
+    def digits(self):
+        """The number written with digits ("25", "3.5", "21st")"""
+        if self.ordinal:
+            return f"{self.value}{_ordinal_suffix(self.value)}"
+        if isinstance(self.value, float) and self.value.is_integer():
+            return str(int(self.value))
+        return str(self.value)
+
+    def __repr__(self):
+        return f"NumberSpan({self.start}, {self.end}, {self.value!r}, ordinal={self.ordinal})"
+
+
+def _read_number(text, tokens, i):
+    # Read the longest number starting at tokens[i]; returns (span, next index)
+    total = current = 0
+    last = last_scale = None
+    fraction = None
+    ordinal = spoken = False
+    end = None
+    j = i
+    while j < len(tokens):
+        start, stop, word = tokens[j]
+        if j > i and not JOINER.match(text, tokens[j - 1][1], start):
+            break
+        following = tokens[j + 1][2] if j + 1 < len(tokens) else None
+
+        if NUMERAL.match(word):
+            if last is not None:
+                break
+            current = float(word) if '.' in word else int(word)
+            last = 'numeral'
+        elif word == 'a' and last is None and (following == 'hundred' or following in SCALES):
+            current = 1
+            last = 'unit'
+        elif word == 'and':
+            if last not in ('hundred', 'scale') or _kind(following)[0] not in ('unit', 'teen', 'tens'):
+                break
+            last = 'and'
+            j += 1
+            continue
+        elif word in POINT_WORDS:
+            if last == 'and' or isinstance(current, float):
+                break
+            digits = ''
+            k = j + 1
+            while k < len(tokens) and JOINER.match(text, tokens[k - 1][1], tokens[k][0]):
+                digit = tokens[k][2]
+                if digit in UNITS:
+                    digits += str(UNITS[digit])
+                elif digit.isdigit():
+                    digits += digit
+                else:
+                    break
+                k += 1
+            if not digits:
+                break
+            fraction = digits
+            spoken = True
+            end = tokens[k - 1][1]
+            j = k
+            break
+        else:
+            is_ordinal = word in ORDINALS and (word != 'second' or last == 'tens')
+            kind, value = _kind(ORDINALS[word] if is_ordinal else word)
+            if kind is None or last not in FOLLOWS[kind]:
+                break
+            if kind in ('unit', 'teen', 'tens'):
+                current += value
+            elif kind == 'hundred':
+                if current >= 100:
+                    break
+                current *= 100
+            else:
+                if last_scale is not None and value >= last_scale:
+                    break
+                total += current * value
+                current = 0
+                last_scale = value
+            last = kind
+            spoken = True
+            if is_ordinal:
+                ordinal = True
+                end = stop
+                j += 1
+                break
+        end = stop
+        j += 1
+
+    if end is None:
+        return None, i + 1
+    value = total + current
+    if fraction is not None:
+        value = float(f"{int(value)}.{fraction}")
+    elif isinstance(value, float) and value.is_integer() and spoken:
+        value = int(value)
+    return NumberSpan(tokens[i][0], end, value, ordinal, spoken), j
+
+
+def find_numbers(text):
+    """Find every number in text, spoken ("two thousand and twenty four") or written.
+
+    One left-to-right pass over the words; each number is read greedily
+    while its words still form a valid number, so "five six" is two
+    numbers and "twenty five" is one.
+    """
+    tokens = [(match.start(), match.end(), match.group())
+              for match in WORD.finditer(text.lower())]
+    spans = []
+    i = 0
+    while i < len(tokens):
+        span, i = _read_number(text, tokens, i)
+        if span is not None:
+            spans.append(span)
+    return spans
+
+
+def normalize_numbers(text):
+    """Rewrite spoken numbers with digits ("in twenty five minutes" -> "in 25 minutes")"""
+    parts = []
+    position = 0
+    for span in find_numbers(text):
+        if not span.spoken:
+            continue
+        parts.append(text[position:span.start])
+        parts.append(span.digits())
+        position = span.end
+    parts.append(text[position:])
+    return ''.join(parts)
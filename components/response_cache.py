@@ -0,0 +1,152 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from components.config import RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, RESPONSE_CACHE_MAX_ENTRIES
+from components.disk_cache import DiskCache
+
+
+class ResponseCache:
+    """Two-tier cache for slow, deterministic-enough calls such as LLM prompts.
+
+    Responses are kept in an in-memory LRU of memory_size entries and in
+    the disk cache for ttl seconds (at most max_entries on disk). Keys are
+    hashes of everything that shapes the response. Identical requests made
+    while one is in flight wait for it instead of making their own call.
+    None responses (failures) are not cached.
+    """
+
+    def __init__(self, namespace, disk_cache=None, memory_size=RESPONSE_CACHE_SIZE,
+                 ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_MAX_ENTRIES):
+        self.namespace = namespace
+        self.disk_cache = disk_cache if disk_cache is not None else DiskCache()
+        self.memory_size = memory_size
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory = OrderedDict()  # key -> (expires_at, value), least recently used first
+        self.in_flight = {}
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.bypassed = 0
+        self._writes = 0
+
+    @staticmethod
+    def key(*parts):
+        """Stable hash of JSON-serialisable parts"""
+        data = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def get_or_compute(self, key, compute, use_cache=True):
+        """Return the cached response for key, or compute and cache it"""
+        if not use_cache:
+            with self._lock:
+                self.bypassed += 1
+            return compute()
+
+        leader = False
+        with self._lock:
+            value = self._from_memory(key)
+            if value is not None:
+                return value
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+            else:
+                future = Future()
+                self.in_flight[key] = future
+                leader = True
+        if not leader:
+            return future.result()
+
+        try:
+            value = self.disk_cache.get(self.namespace, key)
+            if value is not None:
+                with self._lock:
+                    self.disk_hits += 1
+            else:
+                with self._lock:
+                    self.misses += 1
+                value = compute()
+                if value is not None:
+                    self._store_on_disk(key, value)
+            if value is not None:
+                self._remember(key, value)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self.in_flight[key]
+
+    def get(self, key):
+        """Return the cached response for key, or None"""
+        with self._lock:
+            value = self._from_memory(key)
+        if value is not None:
+            return value
+        value = self.disk_cache.get(self.namespace, key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        """Cache a response computed outside get_or_compute, e.g. a streamed one"""
+        if value is not None:
+            self._store_on_disk(key, value)
+            self._remember(key, value)
+
+    def _from_memory(self, key):
+        # Called with the lock held
+        if key not in self.memory:
+            return None
+        expires_at, value = self.memory[key]
+        if expires_at <= time.monotonic():
+            del self.memory[key]
+            return None
+        self.memory_hits += 1
+        self.memory.move_to_end(key)
+        return value
+
+    def _remember(self, key, value):
+        with self._lock:
+            self.memory[key] = (time.monotonic() + self.ttl, value)
+            self.memory.move_to_end(key)
+            if len(self.memory) > self.memory_size:
+                self.memory.popitem(last=False)
+
+    def _store_on_disk(self, key, value):
+        self.disk_cache.set(self.namespace, key, value, self.ttl)
+        self._writes += 1
+        # Trimming scans the namespace, so it is done every few dozen writes
+        if self._writes % 32 == 0:
+            self.disk_cache.purge_expired()
+            self.disk_cache.trim(self.namespace, self.max_entries)
+
+    def clear(self):
+        with self._lock:
+            self.memory.clear()
+        self.disk_cache.clear(self.namespace)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_entries': len(self.memory),
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'bypassed': self.bypassed,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+            }
@@ -0,0 +1,104 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class Scheduler:
+    """Runs callbacks at wall-clock times (time.time() seconds) on one thread.
+
+    Deadlines are kept in a min-heap and the thread sleeps on a condition
+    variable until the earliest one is due or an earlier one is added, so
+    nothing polls. schedule() is O(log n); cancel() marks the entry dead,
+    dead entries are dropped as they reach the top of the heap, and the
+    heap is rebuilt once they outnumber the live ones. Callbacks run on the
+    scheduler thread one at a time, so they should not block for long.
+    """
+
+    MAX_WAIT = 60.0  # Re-check the clock at least this often, in case it is changed
+
+    def __init__(self, name="scheduler"):
+        self.name = name
+        self._heap = []  # [when, sequence, key, callback]; callback None when cancelled
+        self._entries = {}  # key -> live heap entry
+        self._sequence = itertools.count()  # Keeps equal deadlines in FIFO order
+        self._dead = 0
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = True
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def schedule(self, key, when, callback):
+        """Run callback() at time when, replacing anything already scheduled under key"""
+        with self._condition:
+            if not self._running:
+                return False
+            self._discard(key)
+            entry = [when, next(self._sequence), key, callback]
+            self._entries[key] = entry
+            heapq.heappush(self._heap, entry)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            elif self._heap[0] is entry:
+                # New earliest deadline: wake the thread to shorten its wait
+                self._condition.notify()
+            return True
+
+    def cancel(self, key):
+        """Stop a scheduled callback from running; False if it was not scheduled"""
+        with self._condition:
+            return self._discard(key)
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        entry[-1] = None
+        self._dead += 1
+        if self._dead > len(self._entries):
+            self._heap = [entry for entry in self._heap if entry[-1] is not None]
+            heapq.heapify(self._heap)
+            self._dead = 0
+        return True
+
+    def _next_due(self):
+        # Wait until the earliest live entry is due; None once shut down
+        while self._running:
+            while self._heap and self._heap[0][-1] is None:
+                heapq.heappop(self._heap)
+                self._dead -= 1
+            if not self._heap:
+                self._condition.wait()
+                continue
+            delay = self._heap[0][0] - time.time()
+            if delay <= 0:
+                entry = heapq.heappop(self._heap)
+                del self._entries[entry[2]]
+                return entry
+            self._condition.wait(min(delay, self.MAX_WAIT))
+        return None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                entry = self._next_due()
+            if entry is None:
+                return
+            try:
+                entry[-1]()
+            except Exception as e:
+                print(f"Scheduled job {entry[2]} failed: {e}")
+
+    def shutdown(self, wait=True):
+        """Stop the thread; callbacks that have not run yet are dropped"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if wait and self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
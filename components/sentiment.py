@@ -0,0 +1,96 @@
+NEGATIONS = frozenset(('no', 'not', "n't", 'never'))
+
+
+class SentimentLexicon:
+    """TextBlob's polarity lexicon compiled into one flat dict.
+
+    polarity() runs TextBlob's (pattern's) scoring rules - modifiers such as
+    "very", negations, "!" and emoticons - over tokens the NLP pipeline has
+    already produced, instead of building and tokenizing a TextBlob per
+    command. Only polarity is kept; subjectivity is never used.
+    """
+
+    def __init__(self, entries, emoticons=None):
+        # word -> (polarity, intensity, is_modifier)
+        self.entries = entries
+        self.emoticons = emoticons or {}
+
+    @classmethod
+    def from_textblob(cls):
+        """Compile the lexicon TextBlob ships with (en-sentiment.xml)"""
+        from textblob.en import sentiment
+        from textblob._text import EMOTICONS, PUNCTUATION
+
+        # TextBlob loads it lazily; do not load it twice if TextBlob already did
+        if not dict.__len__(sentiment):
+            sentiment.load()
+        entries = {}
+        for word, senses in dict.items(sentiment):
+            polarity, _, intensity = senses[None]
+            entries[word] = (polarity, intensity, 'RB' in senses)
+
+        # TextBlob only looks up short non-alphabetic tokens ("xd" is a word)
+        emoticons = {}
+        for (_, polarity), faces in EMOTICONS.items():
+            for face in faces:
+                face = face.lower()
+                if not face.isalpha() and len(face) <= 5 and face not in PUNCTUATION:
+                    emoticons.setdefault(face, polarity)
+        return cls(entries, emoticons)
+
+    def assessments(self, tokens):
+        """Return [polarity, intensity, negated] for every scored word in tokens"""
+        entries = self.entries
+        assessed = []
+        modifier = None  # Preceding adverb, e.g. "very good"
+        negation = None  # Preceding negation, e.g. "not good"
+        for word in tokens:
+            entry = entries.get(word)
+            if entry is not None:
+                polarity, intensity, is_modifier = entry
+                if modifier is None:
+                    assessed.append([polarity, intensity, False])
+                else:
+                    last = assessed[-1]
+                    last[0] = max(-1.0, min(polarity * last[1], 1.0))
+                    last[1] = intensity
+                if negation is not None:
+                    last = assessed[-1]
+                    last[1] = 1.0 / last[1]
+                    last[2] = True
+                modifier = word if is_modifier else None
+                negation = word if word in NEGATIONS else None
+                continue
+
+            if word in NEGATIONS:
+                negation = word
+            # Keep a negation across small words ("not a good")
+            elif negation and len(word.strip("'")) > 1:
+                negation = None
+            # "really not good"
+            if negation is not None and modifier is not None and modifier.endswith('ly'):
+                assessed[-1][2] = True
+                negation = None
+            # Keep a modifier across small words ("really is a good")
+            elif modifier and len(word) > 2:
+                modifier = None
+
+            if word == '!' and assessed:
+                assessed[-1][0] = max(-1.0, min(assessed[-1][0] * 1.25, 1.0))
+            elif word == '(!)':
+                assessed.append([0.0, 1.0, False])
+            elif word in self.emoticons:
+                assessed.append([self.emoticons[word], 1.0, False])
+        return assessed
+
+    def polarity(self, tokens):
+        """Polarity of lowercased tokens between -1.0 and 1.0, as TextBlob computes it"""
+        assessed = self.assessments(tokens)
+        if not assessed:
+            return 0.0
+        # "not good" is slightly bad, "not bad" slightly good
+        return sum(polarity * -0.5 if negated else polarity
+                   for polarity, _, negated in assessed) / len(assessed)
+
+    def polarity_batch(self, token_lists):
+        return [self.polarity(tokens) for tokens in token_lists]
@@ -0,0 +1,80 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+
+def _answer(name, future, answers):
+    # Settle each finished lookup once, so a failure is reported only once
+    if future not in answers:
+        answer = None
+        if not future.cancelled():
+            error = future.exception()
+            if error is not None:
+                print(f"Lookup '{name}' failed: {error}")
+            else:
+                answer = future.result()
+        answers[future] = answer
+    return answers[future]
+
+
+def _pick(futures, answers, final):
+    # The first candidate with an answer wins, but only once every better
+    # one has failed; before the deadline a pending better one is waited for
+    for name, future in futures:
+        if future is None or not future.done():
+            if final:
+                continue
+            return None
+        answer = _answer(name, future, answers)
+        if answer is not None:
+            return name, answer
+    return None, None
+
+
+def _failed(futures, answers, index):
+    # Every candidate before index has finished without an answer
+    return all(future is not None and future.done() and _answer(name, future, answers) is None
+               for name, future in futures[:index])
+
+
+def race(pool, candidates, deadline):
+    """Run several lookups at once and return the best answer in time.
+
+    candidates are (name, func) or (name, func, delay) tuples in order of
+    preference; func returns its answer, or None (or raises) when it has
+    none. A candidate with a delay is a hedge: it only starts once delay
+    seconds have passed or every better candidate has failed. Returns the
+    (name, answer) of the most preferred candidate that answered, waiting
+    at most deadline seconds for better ones, or (None, None). Lookups
+    still queued are cancelled; running ones finish in the background and
+    their results are dropped.
+    """
+    start = time.monotonic()
+    end = start + deadline
+    delays = [candidate[2] if len(candidate) > 2 else 0 for candidate in candidates]
+    futures = [(name, None) for name, *_ in candidates]
+    answers = {}
+    try:
+        while True:
+            now = time.monotonic()
+            for i, (name, func, *_) in enumerate(candidates):
+                if futures[i][1] is None and (now - start >= delays[i] or _failed(futures, answers, i)):
+                    futures[i] = (name, pool.submit(func))
+
+            choice = _pick(futures, answers, final=False)
+            if choice is not None:
+                return choice
+            remaining = end - now
+            if remaining <= 0:
+                return _pick(futures, answers, final=True)
+            # Wake for the next finished lookup, or when a hedge is due
+            timeout = min([remaining] + [start + delays[i] - now for i, (_, future)
+                                         in enumerate(futures) if future is None])
+            pending = [future for _, future in futures if future is not None and not future.done()]
+            if pending:
+                wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            else:
+                time.sleep(timeout)
+    finally:
+        for _, future in futures:
+            if future is not None:
+                future.cancel()
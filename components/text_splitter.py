@@ -0,0 +1,96 @@
+import re
+
+# A sentence ends at . ! or ? (plus closing quotes/brackets) followed by
+# whitespace and a capital, digit or opening quote. Initials ("J. R. R.",
+# "U.S.") and a few common abbreviations do not end a sentence.
+SENTENCE_END = re.compile(r'(?<=[.!?])["\')\]]*\s+(?=["\'(\[]?[A-Z0-9])')
+ABBREVIATIONS = ('mr.', 'mrs.', 'ms.', 'dr.', 'prof.', 'st.', 'jr.', 'sr.', 'vs.', 'etc.',
+                 'e.g.', 'i.e.', 'no.', 'approx.', 'c.', 'ca.')
+INITIAL = re.compile(r'(?:^|[\s.])[A-Z]\.$')
+
+
+def _ends_sentence(text):
+    last_word = text.rsplit(None, 1)[-1].lower() if text.strip() else ''
+    return last_word not in ABBREVIATIONS and not INITIAL.search(text)
+
+
+def _sentence_ends(text):
+    # Offsets just past each sentence end (and the whitespace after it)
+    start = 0
+    for match in SENTENCE_END.finditer(text):
+        # Closing quotes/brackets belong to the sentence they close
+        candidate = text[start:match.end()].rstrip()
+        if candidate and _ends_sentence(candidate.rstrip('"\')]')):
+            yield match.end()
+            start = match.end()
+
+
+def split_sentences(text):
+    """Split text into sentences"""
+    sentences = []
+    start = 0
+    for end in _sentence_ends(text):
+        sentences.append(text[start:end].strip())
+        start = end
+    rest = text[start:].strip()
+    if rest:
+        sentences.append(rest)
+    return sentences
+
+
+def stream_sentences(chunks):
+    """Yield each sentence from a stream of text chunks as soon as it is complete.
+
+    A sentence counts as complete once the next one has started, so the
+    last sentence is yielded when the stream ends.
+    """
+    buffer = ''
+    for chunk in chunks:
+        buffer += chunk
+        start = 0
+        for end in _sentence_ends(buffer):
+            yield buffer[start:end].strip()
+            start = end
+        buffer = buffer[start:]
+    if buffer.strip():
+        yield buffer.strip()
+
+
+class SentenceStream:
+    """A response spoken sentence by sentence as it is generated.
+
+    Iterating yields the prefix, then each sentence (or the fallback if
+    there are none), and records what was yielded in text. Functions given
+    to when_done are called with the whole text once the stream ends.
+    """
+
+    def __init__(self, sentences, fallback=''):
+        self.sentences = sentences
+        self.fallback = fallback
+        self.prefix = ''
+        self.spoken = []
+        self.callbacks = []
+
+    def _sentences(self):
+        if self.prefix.strip():
+            yield self.prefix.strip()
+        empty = True
+        for sentence in self.sentences:
+            empty = False
+            yield sentence
+        if empty and self.fallback:
+            yield self.fallback
+
+    def __iter__(self):
+        for sentence in self._sentences():
+            self.spoken.append(sentence)
+            yield sentence
+        for callback in self.callbacks:
+            callback(self.text)
+
+    @property
+    def text(self):
+        return ' '.join(self.spoken)
+
+    def when_done(self, callback):
+        self.callbacks.append(callback)
@@ -0,0 +1,66 @@
+import time
+
+
+class AnalyzedUtterance:
+    """Analysis of one command, shared by every stage of the pipeline.
+
+    Each stage (tokens, lemmas, spaCy doc, entities, sentiment, intent...)
+    runs at most once, on first access, and its duration is recorded in
+    `timings` so slow stages can be spotted per command.
+    """
+
+    def __init__(self, text, nlp_processor):
+        self.text = text
+        self.lowered = text.lower()
+        self.nlp_processor = nlp_processor
+        self.timings = {}
+        self._results = {}
+
+    def measure(self, stage, compute):
+        """Run compute once for this stage, remember its result and duration"""
+        if stage not in self._results:
+            start = time.perf_counter()
+            self._results[stage] = compute()
+            self.timings[stage] = time.perf_counter() - start
+        return self._results[stage]
+
+    def prime(self, stage, result):
+        """Provide a stage result computed elsewhere, e.g. by the command cache"""
+        self._results[stage] = result
+
+    def has(self, stage):
+        return stage in self._results
+
+    @property
+    def tokens(self):
+        return self.measure('tokens', lambda: self.nlp_processor.tokenize(self.lowered))
+
+    @property
+    def lemmas(self):
+        tokens = self.tokens
+        return self.measure('lemmas', lambda: self.nlp_processor.lemmatize_tokens(tokens))
+
+    @property
+    def doc(self):
+        return self.measure('doc', lambda: self.nlp_processor.parse(self.text))
+
+    @property
+    def entities(self):
+        return self.nlp_processor.extract_entities(self)
+
+    @property
+    def rule_entities(self):
+        return self.nlp_processor.extract_rule_entities(self)
+
+    @property
+    def sentiment(self):
+        return self.nlp_processor.analyze_sentiment(self)
+
+    @property
+    def total_time(self):
+        return sum(self.timings.values())
+
+    def timing_report(self):
+        """Stage durations in milliseconds, slowest first"""
+        return {stage: round(seconds * 1000, 3)
+                for stage, seconds in sorted(self.timings.items(), key=lambda item: -item[1])}
@@ -0,0 +1,68 @@
+import wikipedia
+from components.config import WIKI_CACHE_TTL, WIKI_DISAMBIGUATION_TRIES
+from components.text_splitter import split_sentences
+
+
+class WikiCache:
+    """Wikipedia page introductions, fetched once and kept as sentences.
+
+    Queries map to the title Wikipedia resolves them to, and extracts are
+    stored under that title, so different wordings of the same topic share
+    one entry. Both live in the disk cache for WIKI_CACHE_TTL seconds.
+    """
+
+    def __init__(self, disk_cache, ttl=WIKI_CACHE_TTL):
+        self.disk_cache = disk_cache
+        self.ttl = ttl
+
+    def cached(self, query):
+        """Return (title, sentences) if the query's page is cached, else None"""
+        title = self.disk_cache.get('wiki_title', query)
+        if title is None:
+            return None
+        sentences = self.disk_cache.get('wiki', title)
+        if sentences is None:
+            return None
+        return title, sentences
+
+    def lookup(self, query):
+        """Return (title, sentences) for the page a query resolves to.
+
+        An ambiguous query resolves to the first of its options that has a
+        page, or raises its DisambiguationError if none of the first few do.
+        Raises the other wikipedia exceptions (PageError...) when no page is
+        found.
+        """
+        title = self.disk_cache.get('wiki_title', query)
+        if title is not None:
+            sentences = self.disk_cache.get('wiki', title)
+            if sentences is not None:
+                return title, sentences
+            page = wikipedia.page(title, auto_suggest=False)
+        else:
+            try:
+                page = wikipedia.page(query)
+            except wikipedia.exceptions.DisambiguationError as e:
+                # If there are multiple results, pick the first one
+                page = self._first_page(e)
+            title = page.title
+            self.disk_cache.set('wiki_title', query, title, self.ttl)
+
+        sentences = self.disk_cache.get('wiki', title)
+        if sentences is None:
+            sentences = split_sentences(page.summary)
+            self.disk_cache.set('wiki', title, sentences, self.ttl)
+        return title, sentences
+
+    def _first_page(self, ambiguous):
+        for option in ambiguous.options[:WIKI_DISAMBIGUATION_TRIES]:
+            try:
+                return wikipedia.page(option)
+            except (wikipedia.exceptions.PageError, wikipedia.exceptions.DisambiguationError):
+                continue
+        raise ambiguous
+
+    def sentences(self, query, start, count):
+        """Return (title, sentences[start:start + count]) for a query"""
+        title, sentences = self.lookup(query)
+        return title, sentences[start:start + count]
@@ -0,0 +1,104 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Statements are kept as constants so each pooled connection prepares them
+# once and reuses them from its statement cache
+CREATE_TABLE = '''CREATE TABLE IF NOT EXISTS reminders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    time TEXT NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    is_active INTEGER DEFAULT 1
+)'''
+# Active reminders are always read in time order. The index also holds the
+# text (and, as every index does, the id), so listing them never reads the
+# table; the earlier index on (is_active, time) alone cost a lookup per row
+CREATE_INDEX = ("CREATE INDEX IF NOT EXISTS idx_reminders_active_time_text "
+                "ON reminders (is_active, time, text)")
+DROP_OLD_INDEX = "DROP INDEX IF EXISTS idx_reminders_active_time"
+INSERT = "INSERT INTO reminders (text, time) VALUES (?, ?)"
+DELETE = "DELETE FROM reminders WHERE id = ?"
+SELECT_ACTIVE = "SELECT id, text, time FROM reminders WHERE is_active = 1 ORDER BY time"
+
+
+class ReminderStore:
+    """SQLite storage for reminders over a small pool of open connections.
+
+    The database runs in WAL mode with synchronous=NORMAL, so reads do not
+    block the write of a firing reminder and a commit does not wait for a
+    full sync. Bulk inserts and deletes run in a single transaction.
+    """
+
+    POOL_SIZE = 4
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._idle = queue.LifoQueue(maxsize=self.POOL_SIZE)
+        self._connections = []
+        self._lock = threading.Lock()
+        self.closed = False
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.execute(CREATE_TABLE)
+                conn.execute(DROP_OLD_INDEX)
+                conn.execute(CREATE_INDEX)
+
+    def _connect(self):
+        # Pooled connections move between threads, one at a time
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        if self.closed:
+            raise sqlite3.ProgrammingError("Reminder store is closed")
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                with self._lock:
+                    self._connections.remove(conn)
+                conn.close()
+
+    def add(self, text, time_str):
+        """Insert a reminder and return its id"""
+        with self._connection() as conn, conn:
+            return conn.execute(INSERT, (text, time_str)).lastrowid
+
+    def add_many(self, reminders):
+        """Insert (text, time) pairs in one transaction and return their ids"""
+        with self._connection() as conn, conn:
+            return [conn.execute(INSERT, reminder).lastrowid for reminder in reminders]
+
+    def remove(self, reminder_id):
+        with self._connection() as conn, conn:
+            conn.execute(DELETE, (reminder_id,))
+
+    def remove_many(self, reminder_ids):
+        """Delete several reminders in one transaction"""
+        with self._connection() as conn, conn:
+            conn.executemany(DELETE, [(reminder_id,) for reminder_id in reminder_ids])
+
+    def active(self):
+        """(id, text, time) of every active reminder, soonest first"""
+        with self._connection() as conn:
+            return conn.execute(SELECT_ACTIVE).fetchall()
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
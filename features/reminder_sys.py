@@ -1,8 +1,9 @@
-import sqlite3
-import threading
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from dateparser import parse
+from components.numbers import normalize_numbers
+from components.scheduler import Scheduler
+from features.reminder_store import ReminderStore
+from features.reminder_time import ReminderTimeParser
 import atexit
 import logging
 
@@ -13,11 +14,21 @@ logger = logging.getLogger(__name__)
 
 
 class ReminderSystem:
+    TRIGGER_WORKERS = 4  # Reminders that can be announced at the same time
+
     def __init__(self, db_path="nexus_ai_data/reminders.db"):
         self.db_path = db_path
-        self.active_reminders = {}  # Store active reminder threads
+        self.active_reminders = {}  # Text and time of each scheduled reminder
+        # One thread fires every reminder, instead of a polling thread each
+        self.scheduler = Scheduler(name="reminders")
+        # The callback beeps and speaks; it runs here so the scheduler thread
+        # only keeps time and later reminders are not held up behind it
+        self.trigger_pool = ThreadPoolExecutor(max_workers=self.TRIGGER_WORKERS,
+                                               thread_name_prefix="reminder")
         self.running = True
         self.reminder_callback = None  # Callback function for when reminder triggers
+        # Common phrases are parsed directly; the rest go to dateparser
+        self.time_parser = ReminderTimeParser()
         self.init_db()
 
         # Register cleanup function
@@ -31,19 +42,9 @@ class ReminderSystem:
         self.reminder_callback = callback_function
 
     def init_db(self):
-        """Initialize the database with reminders table"""
+        """Open the reminder database, creating the table and indexes if needed"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            c.execute('''CREATE TABLE IF NOT EXISTS reminders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                text TEXT NOT NULL,
-                time TEXT NOT NULL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                is_active INTEGER DEFAULT 1
-            )''')
-            conn.commit()
-            conn.close()
+            self.store = ReminderStore(self.db_path)
             logger.info("Database initialized successfully")
         except Exception as e:
             logger.error(f"Database initialization failed: {e}")
@@ -51,8 +52,8 @@ class ReminderSystem:
     def add_reminder(self, reminder_text, time_str):
         """Add a new reminder"""
         try:
-            # Parse the time string
-            reminder_time = parse(time_str)
+            # Parse the time string, relative to now
+            reminder_time = self.time_parser.parse(time_str)
             if not reminder_time:
                 return False, "Sorry, I couldn't understand the reminder time. Please try again with a clearer time format."
 
@@ -61,13 +62,7 @@ class ReminderSystem:
                 return False, "The reminder time is in the past. Please set a future time."
 
             # Store in database
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            c.execute("INSERT INTO reminders (text, time) VALUES (?, ?)",
-                      (reminder_text, reminder_time.isoformat()))
-            conn.commit()
-            reminder_id = c.lastrowid
-            conn.close()
+            reminder_id = self.store.add(reminder_text, reminder_time.isoformat())
 
             # Schedule the reminder
             self.schedule_reminder(reminder_id, reminder_text, reminder_time)
@@ -88,10 +83,6 @@ class ReminderSystem:
         """Schedule a reminder to trigger at the specified time"""
         def reminder_job():
             try:
-                # Wait until the reminder time
-                while datetime.now() < remind_time and self.running:
-                    time.sleep(1)
-
                 if self.running:
                     # Trigger the reminder
                     reminder_message = f"🔔 Reminder: {text}"
@@ -108,31 +99,22 @@ class ReminderSystem:
                     self.remove_reminder(reminder_id)
 
                     # Remove from active reminders
-                    if reminder_id in self.active_reminders:
-                        del self.active_reminders[reminder_id]
+                    self.active_reminders.pop(reminder_id, None)
 
             except Exception as e:
                 logger.error(f"Error in reminder job {reminder_id}: {e}")
 
-        # Start the reminder thread
-        reminder_thread = threading.Thread(target=reminder_job, daemon=True)
-        reminder_thread.start()
-
-        # Store the thread reference
         self.active_reminders[reminder_id] = {
-            'thread': reminder_thread,
             'text': text,
             'time': remind_time
         }
+        self.scheduler.schedule(reminder_id, remind_time.timestamp(),
+                                lambda: self.trigger_pool.submit(reminder_job))
 
     def remove_reminder(self, reminder_id):
         """Remove a reminder from the database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            c.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
-            conn.commit()
-            conn.close()
+            self.store.remove(reminder_id)
             logger.info(f"Reminder {reminder_id} removed from database")
         except Exception as e:
             logger.error(f"Error removing reminder {reminder_id}: {e}")
@@ -140,9 +122,9 @@ class ReminderSystem:
     def cancel_reminder(self, reminder_id):
         """Cancel an active reminder"""
         try:
-            # Remove from active reminders
-            if reminder_id in self.active_reminders:
-                del self.active_reminders[reminder_id]
+            # Unschedule it and remove from active reminders
+            self.scheduler.cancel(reminder_id)
+            self.active_reminders.pop(reminder_id, None)
 
             # Remove from database
             self.remove_reminder(reminder_id)
@@ -155,11 +137,7 @@ class ReminderSystem:
     def list_reminders(self):
         """List all active reminders"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            c.execute("SELECT id, text, time FROM reminders ORDER BY time")
-            rows = c.fetchall()
-            conn.close()
+            rows = self.store.active()
 
             if not rows:
                 return "You have no active reminders."
@@ -181,11 +159,7 @@ class ReminderSystem:
     def load_all_reminders(self):
         """Load and schedule all reminders from database on startup"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            c.execute("SELECT id, text, time FROM reminders")
-            rows = c.fetchall()
-            conn.close()
+            rows = self.store.active()
 
             current_time = datetime.now()
             expired_reminders = []
@@ -200,13 +174,12 @@ class ReminderSystem:
                 else:
                     # Schedule the reminder
                     self.schedule_reminder(reminder_id, text, remind_time)
-                    logger.info(
+                    logger.debug(
                         f"Loaded reminder {reminder_id}: {text} at {remind_time}")
 
-            # Clean up expired reminders
-            for reminder_id in expired_reminders:
-                self.remove_reminder(reminder_id)
-                logger.info(f"Removed expired reminder {reminder_id}")
+            # Clean up expired reminders in one transaction
+            if expired_reminders:
+                self.store.remove_many(expired_reminders)
 
             if rows:
                 active_count = len(rows) - len(expired_reminders)
@@ -224,7 +197,8 @@ class ReminderSystem:
             # Extract reminder text and time
             parts = command_text.split(' to ', 1)
             if len(parts) == 2:
-                time_and_text = parts[1]
+                # Spoken numbers as digits: "in twenty five minutes" -> "in 25 minutes"
+                time_and_text = normalize_numbers(parts[1])
                 # Try to find time patterns
                 time_parts = time_and_text.split(' that ', 1)
                 if len(time_parts) == 2:
@@ -236,9 +210,15 @@ class ReminderSystem:
                     # Look for common time indicators
                     time_indicators = ['at', 'on', 'in', 'tomorrow', 'today', 'monday',
                                        'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+                    # A bare number only starts the time before a unit ("5 pm"),
+                    # so "buy 2 apples at 5pm" keeps the 2 in the reminder text
+                    time_units = ['am', 'pm', 'a.m.', 'p.m.', "o'clock", 'minute', 'minutes',
+                                  'hour', 'hours', 'day', 'days', 'week', 'weeks']
                     time_start = -1
                     for i, word in enumerate(words):
-                        if word.lower() in time_indicators or ':' in word or word.isdigit():
+                        is_time_number = word.isdigit() and (
+                            i == len(words) - 1 or words[i + 1].lower() in time_units)
+                        if word.lower() in time_indicators or ':' in word or is_time_number:
                             time_start = i
                             break
 
@@ -260,7 +240,7 @@ class ReminderSystem:
 
         elif command_lower.startswith('cancel reminder'):
             try:
-                reminder_id = int(command_lower.split()[-1])
+                reminder_id = int(normalize_numbers(command_lower).split()[-1])
                 return self.cancel_reminder(reminder_id)
             except:
                 return False, "Please specify the reminder ID to cancel (e.g., 'cancel reminder 1')"
@@ -272,3 +252,7 @@ class ReminderSystem:
         """Clean up resources when shutting down"""
         logger.info("Shutting down reminder system...")
         self.running = False
+        self.scheduler.shutdown(wait=False)
+        self.trigger_pool.shutdown(wait=False, cancel_futures=True)
+        if hasattr(self, 'store'):
+            self.store.close()
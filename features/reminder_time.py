@@ -0,0 +1,171 @@
+import re
+from datetime import datetime, timedelta
+from dateparser import parse
+from components.numbers import normalize_numbers
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+DAY = r'today|tomorrow|tonight|(?:(?:on|next|this)\s+)?(?:' + '|'.join(WEEKDAYS) + r')'
+CLOCK = (r"(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<meridiem>[ap]\.?\s?m\.?|o'?clock)?"
+         r"|(?P<named>noon|midnight)")
+# "at 5pm", "tomorrow at 9", "at 17:30 on friday", "monday 3 pm"
+CLOCK_PHRASE = re.compile(
+    rf'(?:(?P<day>{DAY})\s+)?(?:at\s+)?(?:{CLOCK})(?:\s+(?:on\s+)?(?P<day_after>{DAY}))?$')
+# "tomorrow", "on friday"
+DAY_PHRASE = re.compile(rf'(?P<day>{DAY})$')
+# "in 10 minutes", "in an hour and 30 minutes", "in half an hour"
+DURATION_PHRASE = re.compile(r'(?:in|after)\s+(?P<terms>.+)$')
+DURATION_TERM = re.compile(
+    r'\s*(?:and\s+|,\s*)?(?P<amount>\d+(?:\.\d+)?|an?|half\s+an?)\s*'
+    r'(?P<unit>sec(?:ond)?|min(?:ute)?|h(?:ou)?r|day|week)s?\b')
+UNIT_SECONDS = {'sec': 1, 'second': 1, 'min': 60, 'minute': 60, 'hr': 3600, 'hour': 3600,
+                'day': 86400, 'week': 604800}
+
+
+def _duration(terms):
+    # Total seconds of "1 hour and 30 minutes", or None unless every word is used
+    seconds = 0
+    position = 0
+    while position < len(terms):
+        match = DURATION_TERM.match(terms, position)
+        if not match:
+            return None
+        amount = match.group('amount')
+        if amount.startswith('half'):
+            amount = 0.5
+        elif amount in ('a', 'an'):
+            amount = 1
+        seconds += float(amount) * UNIT_SECONDS[match.group('unit')]
+        position = match.end()
+    return seconds
+
+
+def _day_offset(day, reference):
+    # (days after the reference date, whether the day named a weekday)
+    if day is None or day in ('today', 'tonight'):
+        return 0, False
+    if day == 'tomorrow':
+        return 1, False
+    weekday = WEEKDAYS.index(day.split()[-1])
+    return (weekday - reference.weekday()) % 7, True
+
+
+def _clock_resolver(match):
+    day = match.group('day') or match.group('day_after')
+    named = match.group('named')
+    hour = 12 if named == 'noon' else 0 if named else int(match.group('hour'))
+    minute = int(match.group('minute') or 0)
+    meridiem = re.sub(r'[^apm]', '', match.group('meridiem') or '')
+    if meridiem in ('am', 'pm'):
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem == 'pm' else 0)
+    elif hour > 23 or minute > 59:
+        return None
+    # A bare hour ("at 5") is the next time the clock shows it, unless a
+    # day is named. "tonight at 9" is in the evening, "tonight at 12" is
+    # midnight and "tonight at 2" the early hours after it
+    bare_hour = not named and not meridiem and match.group('minute') is None
+    if day == 'tonight' and not named and not meridiem:
+        tonight = timedelta(hours=24 if hour <= 4 else 12 if hour <= 12 else 0)
+    else:
+        tonight = timedelta(0)
+
+    def resolve(reference):
+        offset, weekday = _day_offset(day, reference)
+        date = reference + timedelta(days=offset)
+        result = date.replace(hour=hour, minute=minute, second=0, microsecond=0) + tonight
+        if weekday and result <= reference:
+            result += timedelta(days=7)
+        elif named and day in (None, 'tonight') and result <= reference:
+            # "at noon" after noon and "at midnight" are the next ones
+            result += timedelta(days=1)
+        elif day is None and bare_hour and hour <= 12:
+            while result <= reference:
+                result += timedelta(hours=12)
+        return result
+    return resolve
+
+
+def _day_resolver(match):
+    day = match.group('day')
+    if day == 'tonight':
+        return None
+
+    def resolve(reference):
+        offset, weekday = _day_offset(day, reference)
+        # Same time of day, as "tomorrow" is; a weekday is always ahead
+        return reference + timedelta(days=offset or (7 if weekday else 0))
+    return resolve
+
+
+def _duration_resolver(match):
+    seconds = _duration(match.group('terms'))
+    if seconds is None:
+        return None
+    delta = timedelta(seconds=seconds)
+    return lambda reference: reference + delta
+
+
+class ReminderTimeParser:
+    """Turns reminder time phrases into datetimes, mostly without dateparser.
+
+    Common phrases ("at 5pm", "in 10 minutes", "tomorrow at 9", "on
+    friday") are matched by a few compiled patterns; anything else goes to
+    dateparser. Each phrase is compiled once into a function of the
+    reference time, so repeated phrases cost a dict lookup whatever the
+    current time. dateparser answers depend on the reference time to the
+    second and are not memoized; without a reference, dateparser is called
+    without settings so it reuses its default parser (a settings dict per
+    call makes it build a new one, many times slower).
+    """
+
+    CACHE_SIZE = 1024
+    GRAMMAR = ((DURATION_PHRASE, _duration_resolver),
+               (CLOCK_PHRASE, _clock_resolver),
+               (DAY_PHRASE, _day_resolver))
+
+    def __init__(self):
+        self._resolvers = {}  # phrase -> function of the reference time, or None
+        self.fast_hits = 0
+        self.fallbacks = 0
+
+    @staticmethod
+    def normalize(phrase):
+        return ' '.join(normalize_numbers(phrase.lower()).split())
+
+    def _compile(self, phrase):
+        for pattern, make_resolver in self.GRAMMAR:
+            match = pattern.match(phrase)
+            if match:
+                return make_resolver(match)
+        return None
+
+    def parse(self, phrase, reference=None):
+        """The datetime phrase refers to, relative to reference (default now); None if not understood"""
+        relative_to_now = reference is None
+        reference = reference or datetime.now()
+        # Keyed on the phrase as given, so a repeat skips normalizing too
+        if phrase in self._resolvers:
+            resolver = self._resolvers[phrase]
+        else:
+            resolver = self._compile(self.normalize(phrase))
+            if len(self._resolvers) >= self.CACHE_SIZE:
+                self._resolvers.clear()
+            self._resolvers[phrase] = resolver
+
+        if resolver is not None:
+            self.fast_hits += 1
+            return resolver(reference)
+
+        self.fallbacks += 1
+        if relative_to_now:
+            return parse(self.normalize(phrase))
+        return parse(self.normalize(phrase), settings={'RELATIVE_BASE': reference})
+
+    def stats(self):
+        total = self.fast_hits + self.fallbacks
+        return {
+            'fast_hits': self.fast_hits,
+            'fallbacks': self.fallbacks,
+            'fast_rate': self.fast_hits / total if total else 0.0
+        }
@@ -1,11 +1,17 @@
 import google.generativeai as genai
 import os
+import time
 from dotenv import load_dotenv
+from components.response_cache import ResponseCache
+from components.text_splitter import stream_sentences
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 class GeminiSummarizer:
-    def __init__(self, model_name='gemini-2.5-flash', temperature=0.4, top_p=1.0, top_k=40):
+    WARM_INTERVAL = 60  # Seconds a warmed-up connection is assumed to stay open
+
+    def __init__(self, model_name='gemini-2.5-flash', temperature=0.4, top_p=1.0, top_k=40,
+                 disk_cache=None):
         # Setup API key
         genai.configure(api_key=GEMINI_API_KEY)
 
@@ -19,26 +25,84 @@ class GeminiSummarizer:
             top_k=top_k
         )
 
-    def calculate(self, expr):
+        # Responses to identical prompts are reused; the key covers everything
+        # besides the prompt that shapes a response
+        self.cache_settings = {'model': model_name, 'temperature': temperature,
+                               'top_p': top_p, 'top_k': top_k}
+        self.cache = ResponseCache('gemini', disk_cache)
+        self._warmed_at = None
+
+    def warm_up(self):
+        """Open the connection to the API ahead of a request that is likely to come"""
+        now = time.monotonic()
+        if self._warmed_at is not None and now - self._warmed_at < self.WARM_INTERVAL:
+            return
+        self._warmed_at = now
+        try:
+            # Token counting is free and sets up the client and its connection
+            self.model.count_tokens("warm up")
+        except Exception as e:
+            print(f"Summarizer warm-up failed: {e}")
+
+    def calculate(self, expr, use_cache=True):
         # Create the final prompt with instruction
         final_prompt = (
             f"Solve this maths expression and give directly the answer and if the expression is inccorect just say incorect expresson dont give explaination:\n\n{expr}\n\n"
         )
-        response = self.generate_response(final_prompt)
+        response = self.generate_response(final_prompt, use_cache)
         if response:
             return f"The answer is {response}"
         else:
             return "Sorry, I am unable to solve this problem. Check your math problem."
     
-    def summarize(self, prompt):
+    def summary_prompt(self, prompt):
         # Create the final prompt with instruction
-        final_prompt = (
-            f"Summarize this in 2-3 lines, clear and meaningful:\n\n{prompt}\n\n"
-        )
-        return self.generate_response(final_prompt)
+        return f"Summarize this in 2-3 lines, clear and meaningful:\n\n{prompt}\n\n"
+
+    def summarize(self, prompt, use_cache=True):
+        return self.generate_response(self.summary_prompt(prompt), use_cache)
+
+    def summarize_stream(self, prompt, use_cache=True):
+        """Like summarize, but yields each sentence as soon as it is generated"""
+        return stream_sentences(self.stream_response(self.summary_prompt(prompt), use_cache))
+
+    def generate_response(self, prompt, use_cache=True):
+        key = self.cache.key(self.cache_settings, prompt)
+        return self.cache.get_or_compute(key, lambda: self._generate(prompt), use_cache)
 
-        
-    def generate_response(self, prompt):
+    def stream_response(self, prompt, use_cache=True):
+        """Yield the response text in chunks as the model generates it"""
+        key = self.cache.key(self.cache_settings, prompt)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks = []
+        try:
+            response = self.model.generate_content(
+                prompt,
+                generation_config=self.generation_config,
+                stream=True
+            )
+            for chunk in response:
+                text = self._response_text(chunk)
+                if text:
+                    chunks.append(text)
+                    yield text
+        except Exception as e:
+            print(f"Error streaming summary: {e}")
+            return
+
+        # Only complete responses are cached
+        if use_cache and chunks:
+            self.cache.put(key, "".join(chunks).strip())
+
+    def get_cache_stats(self):
+        return self.cache.stats()
+
+    def _generate(self, prompt):
         try:
             # Generate response
             response = self.model.generate_content(
@@ -46,14 +110,15 @@ class GeminiSummarizer:
                 generation_config=self.generation_config
             )
 
-            # Safely extract text
-            if response.candidates and response.candidates[0].content.parts:
-                text_output = "".join(
-                    part.text for part in response.candidates[0].content.parts)
-                return text_output.strip()
-            else:
-                return None
+            text_output = self._response_text(response)
+            return text_output.strip() if text_output else None
 
         except Exception as e:
             print(f"Error generating summary: {e}")
             return None
+
+    def _response_text(self, response):
+        # Safely extract text (of a whole response or of one streamed chunk)
+        if response.candidates and response.candidates[0].content.parts:
+            return "".join(part.text for part in response.candidates[0].content.parts)
+        return None